@@ -1,3 +1,46 @@
-from mealieapi.client import MealieClient
+import importlib
+import typing as t
+
+if t.TYPE_CHECKING:
+    from mealieapi.backup import BackupArchive, diff_backups
+    from mealieapi.client import MealieClient
+    from mealieapi.cluster import MealieCluster
+    from mealieapi.events import EventBus, WebhookReceiver
+    from mealieapi.index import RecipeIndex
+    from mealieapi.journal import MutationJournal
+    from mealieapi.lanes import LaneScheduler
+    from mealieapi.media import MediaCache
+    from mealieapi.snapshot import GroupSnapshot
+    from mealieapi.timeouts import deadline
 
 __version__ = "0.0.0"
+
+# Public names and the submodules they live in, submodules are only imported when one of their names is used.
+_LAZY_ATTRIBUTES = {
+    "MealieClient": "mealieapi.client",
+    "MealieCluster": "mealieapi.cluster",
+    "BackupArchive": "mealieapi.backup",
+    "diff_backups": "mealieapi.backup",
+    "EventBus": "mealieapi.events",
+    "WebhookReceiver": "mealieapi.events",
+    "LaneScheduler": "mealieapi.lanes",
+    "RecipeIndex": "mealieapi.index",
+    "MutationJournal": "mealieapi.journal",
+    "MediaCache": "mealieapi.media",
+    "GroupSnapshot": "mealieapi.snapshot",
+    "deadline": "mealieapi.timeouts",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> t.Any:
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
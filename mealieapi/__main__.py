@@ -0,0 +1,3 @@
+from mealieapi.cli import main
+
+main()
@@ -2,8 +2,7 @@ from __future__ import annotations
 
 import typing as t
 
-import aiohttp
-
+from mealieapi.const import AUTHORIZATION
 from mealieapi.model import InteractiveModel
 
 
@@ -32,4 +31,4 @@ class Auth(InteractiveModel):
 
     @property
     def header(self):
-        return {aiohttp.hdrs.AUTHORIZATION: f"Bearer {self.access_token}"}
+        return {AUTHORIZATION: f"Bearer {self.access_token}"}
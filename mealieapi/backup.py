@@ -1,6 +1,32 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import typing as t
 from datetime import datetime
+from zipfile import ZipFile, ZipInfo
+
+from mealieapi.model import BaseModel, InteractiveModel
+
+if t.TYPE_CHECKING:
+    from mealieapi.client import MealieClient
+    from mealieapi.recipes import Recipe
 
-from mealieapi.model import InteractiveModel
+# Top level folders of a Mealie backup, every folder but these two holds a single list.
+RECIPES = "recipes"
+IMAGES = "images"
+SECTIONS = (
+    RECIPES,
+    IMAGES,
+    "users",
+    "groups",
+    "settings",
+    "themes",
+    "pages",
+    "notifications",
+)
 
 
 class Backup(InteractiveModel):
@@ -10,5 +36,207 @@ class Backup(InteractiveModel):
     async def download(self) -> bytes:
         return await self._client.download_backup(self.name)
 
+    async def download_to(self, destination: str | os.PathLike) -> "BackupArchive":
+        return await self._client.download_backup_to(self.name, destination)
+
     async def delete(self) -> None:
         await self._client.delete_backup(self.name)
+
+
+class BackupArchive:
+    """
+    Reads a Mealie backup zip without extracting it.
+
+    Only the central directory of the zip is read when the archive is opened,
+    members are decompressed and parsed when they are asked for.
+    """
+
+    def __init__(
+        self,
+        file: str | os.PathLike | t.IO[bytes] | bytes,
+        client: "MealieClient | None" = None,
+    ) -> None:
+        if isinstance(file, bytes):
+            file = io.BytesIO(file)
+        self._zip = ZipFile(file)
+        self._client = client
+        self._recipes: dict[str, ZipInfo] = {}
+        self._images: dict[str, dict[str, ZipInfo]] = {}
+        self._sections: dict[str, ZipInfo] = {}
+        self._lists: dict[str, list[dict[str, t.Any]]] = {}
+        self._index()
+
+    def _index(self) -> None:
+        for info in self._zip.infolist():
+            if info.is_dir():
+                continue
+            parts = info.filename.split("/")
+            if parts[0] not in SECTIONS and len(parts) > 2 and parts[1] in SECTIONS:
+                parts = parts[1:]  # The archive was made with a root folder.
+            section = parts[0]
+            if section == RECIPES and parts[-1].endswith(".json"):
+                slug = parts[-1][: -len(".json")]
+                if len(parts) == 2 or (len(parts) == 3 and parts[1] == slug):
+                    self._recipes[slug] = info
+            elif section == IMAGES and len(parts) >= 3:
+                self._images.setdefault(parts[1], {})["/".join(parts[2:])] = info
+            elif section in SECTIONS and len(parts) == 2 and parts[1].endswith(".json"):
+                self._sections[section] = info
+
+    def __enter__(self) -> "BackupArchive":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def _load(self, info: ZipInfo) -> t.Any:
+        with self._zip.open(info) as file:
+            return json.load(file)
+
+    # Recipes
+    def recipe_slugs(self) -> list[str]:
+        return list(self._recipes)
+
+    def recipe_info(self, slug: str) -> ZipInfo:
+        """The zip entry of a recipe, its CRC changes whenever the recipe does."""
+        return self._recipes[slug]
+
+    def __contains__(self, slug: object) -> bool:
+        return slug in self._recipes
+
+    def __len__(self) -> int:
+        return len(self._recipes)
+
+    def recipe_json(self, slug: str) -> dict[str, t.Any]:
+        return self._load(self._recipes[slug])
+
+    def iter_recipes_json(self) -> t.Iterator[tuple[str, dict[str, t.Any]]]:
+        """Yields the recipes one at a time, so only one of them is in memory at once."""
+        for slug, info in self._recipes.items():
+            yield slug, self._load(info)
+
+    def recipe(self, slug: str) -> "Recipe":
+        """Loads a recipe as a model, this requires the archive to be opened with a client."""
+        if self._client is None:
+            raise ValueError("Loading recipe models requires a client")
+        return self._client.process_recipe_json(self.recipe_json(slug))
+
+    # Images
+    def image_names(self, slug: str) -> list[str]:
+        return list(self._images.get(slug, {}))
+
+    def open_image(self, slug: str, name: str = "original.webp") -> t.IO[bytes]:
+        return self._zip.open(self._images[slug][name])
+
+    def image(self, slug: str, name: str = "original.webp") -> bytes:
+        with self.open_image(slug, name) as file:
+            return file.read()
+
+    # Users, Groups and the other sections
+    def sections(self) -> list[str]:
+        return list(self._sections)
+
+    def section_json(self, section: str) -> list[dict[str, t.Any]]:
+        if section not in self._lists:
+            info = self._sections.get(section)
+            self._lists[section] = [] if info is None else self._load(info)
+        return self._lists[section]
+
+    def users_json(self) -> list[dict[str, t.Any]]:
+        return self.section_json("users")
+
+    def groups_json(self) -> list[dict[str, t.Any]]:
+        return self.section_json("groups")
+
+
+class SectionDiff(BaseModel):
+    added: list[str] = []
+    removed: list[str] = []
+    modified: list[str] = []
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+
+class BackupDiff(BaseModel):
+    recipes: SectionDiff
+    users: SectionDiff
+    groups: SectionDiff
+
+    @property
+    def changed(self) -> bool:
+        return self.recipes.changed or self.users.changed or self.groups.changed
+
+
+def record_digest(record: t.Any) -> str:
+    """Hashes a JSON record independently of its key order and formatting."""
+    encoded = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _record_key(record: dict[str, t.Any], fields: tuple[str, ...]) -> str:
+    for field in fields:
+        if record.get(field) is not None:
+            return str(record[field])
+    return record_digest(record)
+
+
+def _diff_records(
+    old: list[dict[str, t.Any]], new: list[dict[str, t.Any]], fields: tuple[str, ...]
+) -> SectionDiff:
+    old_digests = {_record_key(record, fields): record_digest(record) for record in old}
+    diff = SectionDiff()
+    for record in new:
+        key = _record_key(record, fields)
+        digest = old_digests.pop(key, None)
+        if digest is None:
+            diff.added.append(key)
+        elif digest != record_digest(record):
+            diff.modified.append(key)
+    diff.removed.extend(old_digests)
+    return diff
+
+
+def _diff_recipes(old: BackupArchive, new: BackupArchive) -> SectionDiff:
+    diff = SectionDiff()
+    for slug in new.recipe_slugs():
+        if slug not in old:
+            diff.added.append(slug)
+            continue
+        old_info, new_info = old.recipe_info(slug), new.recipe_info(slug)
+        if (old_info.CRC, old_info.file_size) == (new_info.CRC, new_info.file_size):
+            continue  # Byte for byte identical, no need to parse either side.
+        if record_digest(old.recipe_json(slug)) != record_digest(new.recipe_json(slug)):
+            diff.modified.append(slug)
+    diff.removed.extend(slug for slug in old.recipe_slugs() if slug not in new)
+    return diff
+
+
+def diff_backups(
+    old: BackupArchive | str | os.PathLike, new: BackupArchive | str | os.PathLike
+) -> BackupDiff:
+    """
+    Reports the recipes, users and groups that were added, removed or modified between two backups.
+    Recipes are compared one at a time, so memory use grows with the number of recipes rather than their size.
+    """
+    old_archive = old if isinstance(old, BackupArchive) else BackupArchive(old)
+    new_archive = new if isinstance(new, BackupArchive) else BackupArchive(new)
+    try:
+        return BackupDiff(
+            recipes=_diff_recipes(old_archive, new_archive),
+            users=_diff_records(
+                old_archive.users_json(), new_archive.users_json(), ("id", "username")
+            ),
+            groups=_diff_records(
+                old_archive.groups_json(), new_archive.groups_json(), ("id", "name")
+            ),
+        )
+    finally:
+        if old_archive is not old:
+            old_archive.close()
+        if new_archive is not new:
+            new_archive.close()
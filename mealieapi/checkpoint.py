@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import os
+import typing as t
+
+from mealieapi.jsonl import JSONLinesLog
+
+
+class Checkpoint:
+    """
+    Remembers which items of a long running job are done in an append only file of JSON lines,
+    so the job can skip them when it is restarted after a crash.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self._log = JSONLinesLog(path)
+        self.path = self._log.path
+        self._done: dict[str, str | None] = dict(self._log.load())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def get(self, key: str) -> str | None:
+        """The value a key was marked with."""
+        return self._done.get(key)
+
+    def items(self) -> t.ItemsView[str, str | None]:
+        return self._done.items()
+
+    def mark(self, key: str, value: str | None = None) -> None:
+        """Marks a key as done, optionally remembering a value like the id of what it created."""
+        if key in self._done:
+            return
+        self._log.append([key, value])
+        self._done[key] = value
+
+    def close(self) -> None:
+        self._log.close()
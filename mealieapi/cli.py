@@ -0,0 +1,253 @@
+"""
+Command line tool to export a Mealie instance to JSON Lines and import it again.
+
+    python -m mealieapi --url https://mealie.example.com --token <API_KEY> export recipes.jsonl --users
+    python -m mealieapi --url https://mealie.example.com --token <API_KEY> import recipes.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import typing as t
+
+from mealieapi.checkpoint import Checkpoint
+from mealieapi.client import MealieClient
+from mealieapi.lanes import BULK
+from mealieapi.recipes import Recipe
+
+_LOGGER = logging.getLogger(__name__)
+
+RECIPE = "recipe"
+USER = "user"
+GROUP = "group"
+MEALPLAN = "mealplan"
+
+
+class Progress:
+    """Prints a single, regularly updated progress line to stderr."""
+
+    def __init__(
+        self,
+        action: str,
+        total: int | None = None,
+        stream: t.TextIO | None = None,
+        interval: float = 0.5,
+    ) -> None:
+        self.action = action
+        self.total = total
+        self.stream = stream if stream is not None else sys.stderr
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self._started = time.monotonic()
+        self._rendered = 0.0
+
+    def advance(self, failed: bool = False, skipped: bool = False) -> None:
+        if failed:
+            self.failed += 1
+        elif skipped:
+            self.skipped += 1
+        else:
+            self.done += 1
+        if time.monotonic() - self._rendered >= self.interval:
+            self.render()
+
+    def render(self, final: bool = False) -> None:
+        self._rendered = time.monotonic()
+        rate = self.done / max(self._rendered - self._started, 1e-9)
+        count = f"{self.done}" if self.total is None else f"{self.done}/{self.total}"
+        line = f"\r{self.action} {count} ({rate:.1f}/s, {self.failed} failed, {self.skipped} skipped)"
+        self.stream.write(line + ("\n" if final else ""))
+        self.stream.flush()
+
+
+def _write(file: t.TextIO, kind: str, data: t.Any) -> None:
+    file.write(json.dumps({"type": kind, "data": data}, default=str) + "\n")
+
+
+async def export(
+    client: MealieClient,
+    output: t.TextIO,
+    concurrency: int = 16,
+    users: bool = False,
+    groups: bool = False,
+    mealplans: bool = False,
+    progress: Progress | None = None,
+) -> Progress:
+    """Writes every recipe, and optionally users, groups and meal plans, to a JSON Lines file."""
+    progress = progress if progress is not None else Progress("Exported")
+    slugs: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+
+    async def worker() -> None:
+        while (slug := await slugs.get()) is not None:
+            try:
+                with client.lane(BULK):
+                    recipe = await client.get_recipe(slug)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.warning("Failed to export %r", slug, exc_info=True)
+                progress.advance(failed=True)
+                continue
+            _write(output, RECIPE, recipe.dict())
+            progress.advance()
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        async for summary in client.iter_recipes():
+            await slugs.put(summary.slug)
+        for _ in workers:
+            await slugs.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    if users:
+        for user in await client.get_all_users():
+            _write(output, USER, user.dict())
+            progress.advance()
+    if groups:
+        for group in await client.get_groups():
+            _write(output, GROUP, group.dict())
+            progress.advance()
+    if mealplans:
+        for mealplan in await client.get_mealplans_all():
+            _write(output, MEALPLAN, mealplan.dict())
+            progress.advance()
+    progress.render(final=True)
+    return progress
+
+
+def _recipe_from_record(client: MealieClient, data: dict[str, t.Any]) -> Recipe:
+    data = dict(data)
+    data.pop("slug", None)
+    # Comments belong to users and can't be created along with the recipe.
+    data.pop("comments", None)
+    return Recipe(_client=client, **data)
+
+
+async def import_(
+    client: MealieClient,
+    input: t.TextIO,
+    checkpoint: Checkpoint,
+    concurrency: int = 8,
+    progress: Progress | None = None,
+) -> Progress:
+    """
+    Creates the recipes of a JSON Lines export, records that are in the checkpoint are skipped.
+    Other record types are skipped as they can't be recreated from an export.
+    """
+    progress = progress if progress is not None else Progress("Imported")
+    records: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 4)
+
+    async def worker() -> None:
+        while (record := await records.get()) is not None:
+            key, recipe = record
+            try:
+                with client.lane(BULK):
+                    await client.create_recipe_slug(recipe)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.warning("Failed to import %r", key, exc_info=True)
+                progress.advance(failed=True)
+                continue
+            checkpoint.mark(key)
+            progress.advance()
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        for number, line in enumerate(input, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("type") != RECIPE:
+                progress.advance(skipped=True)
+                continue
+            recipe = _recipe_from_record(client, record["data"])
+            key = f"{RECIPE}:{recipe.slug or number}"
+            if key in checkpoint:
+                progress.advance(skipped=True)
+                continue
+            await records.put((key, recipe))
+        for _ in workers:
+            await records.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    progress.render(final=True)
+    return progress
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m mealieapi", description=__doc__)
+    parser.add_argument("--url", default=os.environ.get("MEALIE_URL"))
+    parser.add_argument("--token", default=os.environ.get("MEALIE_TOKEN"))
+    parser.add_argument("--username", default=os.environ.get("MEALIE_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("MEALIE_PASSWORD"))
+    parser.add_argument("--verbose", "-v", action="store_true")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Export recipes to JSON Lines")
+    export_parser.add_argument("output", help="File to write, - for stdout")
+    export_parser.add_argument("--concurrency", type=int, default=16)
+    export_parser.add_argument("--users", action="store_true")
+    export_parser.add_argument("--groups", action="store_true")
+    export_parser.add_argument("--mealplans", action="store_true")
+
+    import_parser = commands.add_parser("import", help="Import recipes from JSON Lines")
+    import_parser.add_argument("input", help="File to read")
+    import_parser.add_argument("--concurrency", type=int, default=8)
+    import_parser.add_argument(
+        "--checkpoint", help="Progress file, defaults to <input>.checkpoint"
+    )
+    return parser
+
+
+async def run(args: argparse.Namespace) -> int:
+    if not args.url:
+        raise SystemExit("A Mealie URL is required, use --url or MEALIE_URL")
+    client = MealieClient(args.url)
+    if args.token:
+        client.authorize(args.token)
+    elif args.username and args.password:
+        await client.login(args.username, args.password)
+    else:
+        raise SystemExit("Use --token, or --username and --password to authenticate")
+
+    if args.command == "export":
+        if args.output == "-":
+            progress = await export(
+                client,
+                sys.stdout,
+                args.concurrency,
+                args.users,
+                args.groups,
+                args.mealplans,
+            )
+        else:
+            with open(args.output, "w", encoding="utf-8") as output:
+                progress = await export(
+                    client,
+                    output,
+                    args.concurrency,
+                    args.users,
+                    args.groups,
+                    args.mealplans,
+                )
+    else:
+        with open(args.input, encoding="utf-8") as input, Checkpoint(
+            args.checkpoint or f"{args.input}.checkpoint"
+        ) as checkpoint:
+            progress = await import_(client, input, checkpoint, args.concurrency)
+    return 1 if progress.failed else 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = make_parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    sys.exit(asyncio.run(run(args)))
@@ -1,15 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
 import io
+import os
+import pathlib
 import posixpath
+import tempfile
 import typing as t
 from datetime import datetime
 from zipfile import ZipFile
 
 from mealieapi.auth import Token
-from mealieapi.backup import Backup
+from mealieapi.backup import Backup, BackupArchive, BackupDiff, diff_backups
 from mealieapi.const import YEAR_MONTH_DAY, YEAR_MONTH_DAY_HOUR_MINUTE_SECOND
+from mealieapi.errors import BadRequestError, MutationQueued, UnauthenticatedError
+from mealieapi.events import (
+    RECIPE_CREATED,
+    RECIPE_DELETED,
+    RECIPE_UPDATED,
+    EventBus,
+    FavoriteEvent,
+    RecipeEvent,
+)
+from mealieapi.identity import IdentityMap
+from mealieapi.importer import BulkURLImporter, URLImportReport
+from mealieapi.journal import MutationJournal, offline_errors
 from mealieapi.meals import Ingredient, Meal, MealPlan, MealPlanDay, ShoppingList
+from mealieapi.media import ImagePrefetcher, MediaCache
 from mealieapi.misc import AppVersion, DebugInfo, DebugStatistics, DebugVersion, File
-from mealieapi.raw import RawClient
+from mealieapi.model import InteractiveModel
+from mealieapi.raw import RawClient, decode_json
 from mealieapi.recipes import (
     Recipe,
     RecipeAsset,
@@ -19,10 +41,128 @@ from mealieapi.recipes import (
     RecipeNutrition,
     RecipeTag,
 )
+from mealieapi.shopping import ShoppingListBuilder
+from mealieapi.snapshot import GroupSnapshot, load_group_snapshot
+from mealieapi.uploads import UploadIndex, hash_file, multipart
 from mealieapi.users import Group, User, UserSignup
 
+if t.TYPE_CHECKING:
+    import concurrent.futures
+
+    import aiohttp
+
+M = t.TypeVar("M", bound=InteractiveModel)
+
+
+@functools.lru_cache(maxsize=None)
+def _worker_client() -> MealieClient:
+    client = MealieClient("")
+    client.identity_map = None
+    return client
+
+
+def _parse_in_worker(body: bytes, process: str, many: bool) -> t.Any:
+    """Decodes a response and builds its models in a worker, returning them detached."""
+    result = _worker_client()._build(process, decode_json(body), many)
+    for model in result if many else [result]:
+        model.detach()
+    return result
+
 
 class MealieClient(RawClient):
+    media_cache: MediaCache | None = None
+    identity_map: IdentityMap | None = None
+    # Responses of at least parse_threshold bytes are decoded and parsed in the executor.
+    parse_executor: concurrent.futures.Executor | None = None
+    parse_threshold: int = 256 * 1024
+    # Queues the writes made while the server is unreachable, see MutationJournal.
+    journal: MutationJournal | None = None
+    # Skips uploading images and assets that are the same as the last ones uploaded.
+    upload_index: UploadIndex | None = None
+
+    def __init__(self, url: str, session: aiohttp.ClientSession | None = None) -> None:
+        super().__init__(url, session)
+        self.events = EventBus()
+        self.events.subscribe(self._invalidate_media, RecipeEvent)
+
+    def _invalidate_media(self, event: RecipeEvent) -> None:
+        if self.media_cache is not None and event.action in (
+            RECIPE_UPDATED,
+            RECIPE_DELETED,
+        ):
+            self.media_cache.invalidate(event.slug)
+        if self.identity_map is not None and event.action == RECIPE_DELETED:
+            self.identity_map.discard(Recipe, event.slug)
+        if self.upload_index is not None and event.action in (
+            RECIPE_CREATED,
+            RECIPE_DELETED,
+        ):
+            self.upload_index.forget(event.slug)
+
+    def _identify(self, model: M) -> M:
+        """Returns the canonical instance of the model if an :code:`identity_map` is set."""
+        if self.identity_map is None:
+            return model
+        return self.identity_map.resolve(model)
+
+    async def _mutate(
+        self,
+        label: str,
+        path: str,
+        method: str,
+        json: t.Any = None,
+        resource: str | None = None,
+        key: str | None = None,
+        base_version: str | None = None,
+    ) -> t.Any:
+        """
+        Sends a write, with a :code:`journal` it is queued instead when the server is unreachable
+        or earlier writes are still queued, raising :code:`MutationQueued`.
+        """
+        if self.journal is None:
+            return await self.request(path, method=method, json=json)
+        queue = functools.partial(
+            self.journal.append,
+            label,
+            method,
+            path,
+            resource or path,
+            json,
+            key=key,
+            base_version=base_version,
+        )
+        if len(self.journal):
+            raise MutationQueued(queue())
+        try:
+            return await self.request(path, method=method, json=json)
+        except offline_errors() as err:
+            raise MutationQueued(queue()) from err
+
+    def _build(self, process: str, data: t.Any, many: bool) -> t.Any:
+        method = getattr(self, process)
+        return [method(item) for item in data] if many else method(data)
+
+    async def _request_models(
+        self, path: str, process: str, many: bool = False, **kwargs
+    ) -> t.Any:
+        """
+        Requests JSON and builds models from it with the :code:`process` method.
+        With a :code:`parse_executor`, large responses are decoded and parsed in it
+        and the models re-attached to the client, so that the event loop stays responsive.
+        A :code:`ProcessPoolExecutor` avoids the GIL, models are pickled without their client.
+        """
+        if self.parse_executor is None:
+            return self._build(process, await self.request(path, **kwargs), many)
+        body = await self.request(path, decode=False, **kwargs)
+        if len(body) < self.parse_threshold:
+            return self._build(process, decode_json(body), many)
+        result = await asyncio.get_running_loop().run_in_executor(
+            self.parse_executor, _parse_in_worker, body, process, many
+        )
+        if many:
+            return [self._identify(model.attach(self)) for model in result]
+        return self._identify(result.attach(self))
+
     # App About
     async def get_app_info(self) -> AppVersion:
         data = await self.request("app/about", use_auth=False)
@@ -74,14 +214,16 @@ class MealieClient(RawClient):
             data["tokens"] = [
                 self.process_token_json(token_data) for token_data in data["tokens"]
             ]
-        return User(_client=self, **data)
+        return self._identify(User(_client=self, **data))
 
     async def get_user_image(self, user_id: int) -> bytes:
         return await self.request(f"users/{user_id}/image", use_auth=False)
 
     async def update_user_image(self, user_id: int, file: io.BytesIO) -> bytes:
         return await self.request(
-            f"users/{user_id}/image", json=dict(profile_image=file)  # type: ignore[arg-type]
+            f"users/{user_id}/image",
+            method="POST",
+            data=multipart({}, {"profile_image": ("profile_image", file)}),
         )
 
     async def get_user(self, user_id: int) -> User:
@@ -113,14 +255,29 @@ class MealieClient(RawClient):
         return user.favorite_recipes
 
     async def add_favorite(self, user_id: int, recipe_slug: str) -> None:
-        await self.request(f"users/{user_id}/favorites/{recipe_slug}", method="POST")
+        path = f"users/{user_id}/favorites/{recipe_slug}"
+        await self._mutate(
+            "add_favorite", path, "POST", resource=f"users/{user_id}", key=path
+        )
+        await self.events.publish(
+            FavoriteEvent(user_id=str(user_id), slug=recipe_slug, added=True)
+        )
 
-    async def remove_favorite(self, user_id: int, recipe_slug: str):
-        await self.request(f"users/{user_id}/{recipe_slug}", method="DELETE")
+    async def remove_favorite(self, user_id: int, recipe_slug: str) -> None:
+        path = f"users/{user_id}/favorites/{recipe_slug}"
+        await self._mutate(
+            "remove_favorite", path, "DELETE", resource=f"users/{user_id}", key=path
+        )
+        await self.events.publish(
+            FavoriteEvent(user_id=str(user_id), slug=recipe_slug, added=False)
+        )
 
     async def get_all_users(self) -> list[User]:
-        data = await self.request("users")
-        return [self.process_user_json(user) for user in data]
+        return await self._request_models("users", "process_user_json", many=True)
+
+    async def iter_users(self) -> t.AsyncIterator[User]:
+        async for data in self.stream_json("users"):
+            yield self.process_user_json(data)
 
     async def create_user(self, user: User) -> User:
         data = await self.request("users", method="POST", json=user.dict())
@@ -129,11 +286,10 @@ class MealieClient(RawClient):
     # Groups
     def process_group_json(self, data: dict[str, t.Any]) -> Group:
         data["users"] = [self.process_user_json(info) for info in data["users"]]
-        return Group(_client=self, **data)
+        return self._identify(Group(_client=self, **data))
 
     async def get_groups(self) -> list[Group]:
-        data = await self.request("groups")
-        return [self.process_group_json(group) for group in data]
+        return await self._request_models("groups", "process_group_json", many=True)
 
     async def create_group(self, group: Group) -> Group:
         data = await self.request("groups", method="POST", json=group.dict())
@@ -155,20 +311,43 @@ class MealieClient(RawClient):
         data = await self.request("groups/self")
         return self.process_group_json(data)
 
+    async def get_group_snapshot(
+        self, favorites: bool = True, shopping_lists: bool = True
+    ) -> GroupSnapshot:
+        """
+        Loads the current group with its users, their favorites, its meal plans and shopping lists
+        concurrently, linked so that every entity is one instance, see :code:`GroupSnapshot`.
+        """
+        return await load_group_snapshot(self, favorites, shopping_lists)
+
     # Query All Recipes
+    def process_recipe_summary_json(self, data: dict[str, t.Any]) -> Recipe:
+        return self._identify(Recipe(_client=self, **data))
+
     async def get_recipes(self, start=0, limit=9999) -> list[Recipe]:
-        data = await self.request(
-            "recipes/summary", params={"start": start, "limit": limit}
+        return await self._request_models(
+            "recipes/summary",
+            "process_recipe_summary_json",
+            many=True,
+            params={"start": start, "limit": limit},
         )
-        return [Recipe(_client=self, **data) for data in data]
+
+    async def iter_recipes(self, start=0, limit=9999) -> t.AsyncIterator[Recipe]:
+        """Like :code:`get_recipes` but yields each recipe as soon as it is received."""
+        async for data in self.stream_json(
+            "recipes/summary", params={"start": start, "limit": limit}
+        ):
+            yield self.process_recipe_summary_json(data)
 
     async def get_untagged_recipes(self) -> list[Recipe]:
-        data = await self.request("recipes/summary/untagged")
-        return [Recipe(_client=self, **recipe) for recipe in data]
+        return await self._request_models(
+            "recipes/summary/untagged", "process_recipe_summary_json", many=True
+        )
 
     async def get_uncategorized_recipes(self) -> list[Recipe]:
-        data = await self.request("recipes/summary/uncategorized")
-        return [Recipe(_client=self, **recipe) for recipe in data]
+        return await self._request_models(
+            "recipes/summary/uncategorized", "process_recipe_summary_json", many=True
+        )
 
     # Recipe Methods
     def process_comment_json(self, data: dict[str, t.Any]) -> RecipeComment:
@@ -185,78 +364,175 @@ class MealieClient(RawClient):
         data["org_url"] = data.get("org_u_r_l")
         if "org_u_r_l" in data:
             del data["org_u_r_l"]
-        if data["comments"]:
+        if data.get("comments"):
             data["comments"] = [
                 self.process_comment_json(comment) for comment in data["comments"]
             ]
-        if data["date_added"]:
+        if data.get("date_added"):
             data["date_added"] = datetime.strptime(data["date_added"], YEAR_MONTH_DAY)
-        if data["date_updated"]:
+        if data.get("date_updated"):
             data["date_updated"] = datetime.strptime(
                 data["date_updated"], YEAR_MONTH_DAY_HOUR_MINUTE_SECOND
             )
-        del data["slug"]
-        return Recipe(_client=self, **data)
+        return self._identify(Recipe(_client=self, **data))
 
     async def get_recipe(self, recipe_slug: str) -> Recipe:
-        data = await self.request(f"recipes/{recipe_slug}")
-        return self.process_recipe_json(data)
+        return await self._request_models(
+            f"recipes/{recipe_slug}", "process_recipe_json"
+        )
 
     async def delete_recipe(self, recipe_slug: str) -> Recipe:
         data = await self.request(f"recipes/{recipe_slug}", method="DELETE")
-        return self.process_recipe_json(data)
+        recipe = self.process_recipe_json(data)
+        await self.events.publish(
+            RecipeEvent(action=RECIPE_DELETED, slug=recipe_slug, recipe=recipe)
+        )
+        return recipe
 
     async def update_recipe(self, recipe: Recipe) -> Recipe:
-        data = await self.request(
-            f"recipes/{recipe.slug}", method="PUT", json=recipe.dict()
+        path = f"recipes/{recipe.slug}"
+        data = recipe.dict()
+        data = await self._mutate(
+            "update_recipe",
+            path,
+            "PUT",
+            data,
+            key=path,
+            base_version=data["date_updated"],
         )
-        return self.process_recipe_json(data)
+        updated = self.process_recipe_json(data)
+        await self.events.publish(
+            RecipeEvent(action=RECIPE_UPDATED, slug=recipe.slug, recipe=updated)
+        )
+        return updated
 
     async def get_recipe_zip(self, recipe_slug: str) -> ZipFile:
         data = await self.request(f"recipes/{recipe_slug}/zip", use_auth=False)
         return ZipFile(io.BytesIO(data))
 
-    async def create_recipe(self, recipe: Recipe) -> Recipe:
-        slug = await self.request("recipes/create", json=recipe.dict(), method="POST")
-        return await self.get_recipe(slug)
+    async def create_recipe(
+        self, recipe: Recipe, timeout: float | None = None
+    ) -> Recipe:
+        with self.deadline(timeout):
+            return await self._get_created_recipe(await self._post_recipe(recipe))
 
-    async def create_recipe_from_url(self, url: str) -> Recipe:
-        slug = await self.request(
-            "recipes/create-url", method="POST", json=dict(url=url)
+    async def _get_created_recipe(self, slug: str) -> Recipe:
+        recipe = await self.get_recipe(slug)
+        await self.events.publish(
+            RecipeEvent(action=RECIPE_CREATED, slug=slug, recipe=recipe)
         )
-        return await self.get_recipe(slug)
+        return recipe
+
+    async def _post_recipe(self, recipe: Recipe) -> str:
+        return await self.request("recipes/create", json=recipe.dict(), method="POST")
 
-    async def create_recipe_from_zip(self, file: io.BytesIO):
-        slug = await self.request(
-            "recipes/create-from-zip", method="POST", json={"archive": file}  # type: ignore[arg-type]
+    async def create_recipe_slug(self, recipe: Recipe) -> str:
+        """Creates a recipe without fetching it back, returning its slug."""
+        slug = await self._post_recipe(recipe)
+        await self.events.publish(RecipeEvent(action=RECIPE_CREATED, slug=slug))
+        return slug
+
+    async def create_recipe_from_url(
+        self, url: str, timeout: float | None = None
+    ) -> Recipe:
+        with self.deadline(timeout):
+            return await self._get_created_recipe(await self._scrape_recipe(url))
+
+    async def _scrape_recipe(self, url: str) -> str:
+        return await self.request(
+            "recipes/create-url", method="POST", json=dict(url=url)
         )
-        return await self.get_recipe(slug)
+
+    async def create_recipe_slug_from_url(self, url: str) -> str:
+        """Has Mealie scrape a recipe without fetching it back, returning its slug."""
+        slug = await self._scrape_recipe(url)
+        await self.events.publish(RecipeEvent(action=RECIPE_CREATED, slug=slug))
+        return slug
+
+    async def import_recipe_urls(
+        self,
+        urls: t.Iterable[str],
+        checkpoint: str | os.PathLike | None = None,
+        concurrency: int = 8,
+        per_host: int = 1,
+        host_delay: float = 1.0,
+    ) -> URLImportReport:
+        """
+        Scrapes many recipe URLs concurrently, see :code:`BulkURLImporter`.
+        The recipes are not fetched back, use :code:`BulkURLImporter.fetch` for that.
+        """
+        importer = BulkURLImporter(self, checkpoint, concurrency, per_host, host_delay)
+        try:
+            return await importer.run(urls)
+        finally:
+            importer.close()
+
+    async def create_recipe_from_zip(
+        self, file: io.BytesIO, timeout: float | None = None
+    ) -> Recipe:
+        with self.deadline(timeout):
+            slug = await self.request(
+                "recipes/create-from-zip",
+                method="POST",
+                data=multipart({}, {"archive": ("recipe.zip", file)}),
+            )
+            return await self.get_recipe(slug)
 
     # Recipe Images
+    def _unchanged_upload(self, digest: str | None, *key: str) -> bool:
+        if self.upload_index is None or digest is None:
+            return False
+        return self.upload_index.unchanged(digest, *key)
+
+    def _uploaded(self, recipe_slug: str, digest: str | None, *key: str) -> None:
+        if self.upload_index is not None and digest is not None:
+            self.upload_index.record(digest, *key)
+        if self.media_cache is not None:
+            self.media_cache.invalidate(recipe_slug)
+
     async def update_recipe_image(
         self, recipe_slug: str, file: io.BytesIO, extension: str
-    ) -> RecipeImage:
+    ) -> RecipeImage | None:
+        """Uploads the image, with an :code:`upload_index` returns None if it was uploaded already."""
+        digest = await hash_file(file) if self.upload_index is not None else None
+        if self._unchanged_upload(digest, "image", recipe_slug):
+            return None
         data = await self.request(
             f"recipes/{recipe_slug}/image",
-            json={"image": file, "extension": extension},  # type: ignore[arg-type]
             method="PUT",
+            data=multipart(
+                {"extension": extension}, {"image": (f"image.{extension}", file)}
+            ),
         )
-        return RecipeImage(self, recipe_slug, **data)
+        self._uploaded(recipe_slug, digest, "image", recipe_slug)
+        return RecipeImage(self, recipe_slug=recipe_slug, **data)
 
     async def update_recipe_image_from_url(self, recipe_slug: str, url: str) -> None:
+        digest = f"url:{url}"
+        if self._unchanged_upload(digest, "image", recipe_slug):
+            return
         await self.request(
             f"recipes/{recipe_slug}/image", method="POST", json=dict(url=url)
         )
+        self._uploaded(recipe_slug, digest, "image", recipe_slug)
 
     async def upload_recipe_asset(
         self, recipe_slug: str, name: str, icon: str, extension: str, file: io.BytesIO
-    ) -> RecipeAsset:
+    ) -> RecipeAsset | None:
+        """Uploads the asset, with an :code:`upload_index` returns None if it was uploaded already."""
+        digest = await hash_file(file) if self.upload_index is not None else None
+        if self._unchanged_upload(digest, "asset", recipe_slug, name):
+            return None
         data = await self.request(
             f"recipes/{recipe_slug}/assets",
-            json=dict(name=name, icon=icon, extension=extension, file=file),  # type: ignore[arg-type]
             method="POST",
+            data=multipart(
+                dict(name=name, icon=icon, extension=extension),
+                {"file": (f"{name}.{extension}", file)},
+            ),
         )
-        return RecipeAsset(self, recipe_slug, **data)
+        self._uploaded(recipe_slug, digest, "asset", recipe_slug, name)
+        return RecipeAsset(self, recipe_slug=recipe_slug, **data)
 
     # Recipe Tags
     def process_tag_json(self, data: dict[str, t.Any]) -> RecipeTag:
@@ -266,11 +542,16 @@ class MealieClient(RawClient):
             ]
         if data.get("slug"):
             del data["slug"]
-        return RecipeTag(self, **data)
+        return self._identify(RecipeTag(self, **data))
 
     async def get_tags(self) -> list[RecipeTag]:
-        tags = await self.request("tags", use_auth=False)
-        return [self.process_tag_json(data) for data in tags]
+        return await self._request_models(
+            "tags", "process_tag_json", many=True, use_auth=False
+        )
+
+    async def iter_tags(self) -> t.AsyncIterator[RecipeTag]:
+        async for data in self.stream_json("tags", use_auth=False):
+            yield self.process_tag_json(data)
 
     async def create_tag(self, name: str) -> RecipeTag:
         data = await self.request("tags", method="POST", json=dict(name=name))
@@ -301,11 +582,16 @@ class MealieClient(RawClient):
             ]
         if data.get("slug"):
             del data["slug"]
-        return RecipeCategory(self, **data)
+        return self._identify(RecipeCategory(self, **data))
 
     async def get_categories(self) -> list[RecipeCategory]:
-        categories = await self.request("categories", use_auth=False)
-        return [self.process_category_json(data) for data in categories]
+        return await self._request_models(
+            "categories", "process_category_json", many=True, use_auth=False
+        )
+
+    async def iter_categories(self) -> t.AsyncIterator[RecipeCategory]:
+        async for data in self.stream_json("categories", use_auth=False):
+            yield self.process_category_json(data)
 
     async def create_category(self, name: str) -> RecipeCategory:
         data = await self.request("categories", method="POST", json=dict(name=name))
@@ -334,30 +620,43 @@ class MealieClient(RawClient):
     async def create_recipe_comment(
         self, recipe_slug: str, comment: RecipeComment
     ) -> RecipeComment:
-        data = await self.request(
-            f"recipes/{recipe_slug}/comments", method="POST", json=comment.dict()  # type: ignore[arg-type]
+        data = await self._mutate(
+            "create_recipe_comment",
+            f"recipes/{recipe_slug}/comments",
+            "POST",
+            comment.dict(),
+            resource=f"recipes/{recipe_slug}",
         )
         return self.process_comment_json(data)  # type: ignore[arg-type]
 
     async def update_recipe_comment(
         self, recipe_slug: str, comment_id: int, comment: RecipeComment
     ) -> RecipeComment:
-        data = await self.request(
-            f"recipes/{recipe_slug}/comments/{comment_id}",
-            method="PUT",
-            json=comment.dict(),  # type: ignore[arg-type]
+        path = f"recipes/{recipe_slug}/comments/{comment_id}"
+        data = await self._mutate(
+            "update_recipe_comment",
+            path,
+            "PUT",
+            comment.dict(),
+            resource=f"recipes/{recipe_slug}",
+            key=path,
         )
         return self.process_comment_json(data)  # type: ignore[arg-type]
 
     async def delete_recipe_comment(self, recipe_slug: str, comment_id: int):
-        await self.request(
-            f"recipes/{recipe_slug}/comments/{comment_id}", method="DELETE"
+        path = f"recipes/{recipe_slug}/comments/{comment_id}"
+        await self._mutate(
+            "delete_recipe_comment",
+            path,
+            "DELETE",
+            resource=f"recipes/{recipe_slug}",
+            key=path,
         )
 
     # Shopping List
     def process_shopping_list_json(self, data: dict[str, t.Any]) -> ShoppingList:
         data["items"] = [Ingredient(self, **item) for item in data["items"]]
-        return ShoppingList(self, **data)
+        return self._identify(ShoppingList(self, **data))
 
     async def create_shopping_list(self, shopping_list: ShoppingList) -> ShoppingList:
         data = await self.request(
@@ -366,7 +665,7 @@ class MealieClient(RawClient):
         return self.process_shopping_list_json(data)  # type: ignore[arg-type]
 
     async def get_shopping_list(self, id: int) -> ShoppingList:
-        data = await self.request(f"shoppings-list/{id}")
+        data = await self.request(f"shopping-lists/{id}")
         return self.process_shopping_list_json(data)  # type: ignore[arg-type]
 
     async def update_shopping_list(
@@ -391,64 +690,166 @@ class MealieClient(RawClient):
 
     def process_mealplan_json(self, data: dict[str, t.Any]) -> MealPlan:
         data["end_date"] = datetime.strptime(data["end_date"], YEAR_MONTH_DAY)
-        data["start_date"] = datetime.strptime(data["end_date"], YEAR_MONTH_DAY)
+        data["start_date"] = datetime.strptime(data["start_date"], YEAR_MONTH_DAY)
         data["plan_days"] = [
             self.process_mealplanday_json(day) for day in data["plan_days"]
         ]
-        return MealPlan(self, **data)
+        return self._identify(MealPlan(self, **data))
 
     async def get_mealplans_all(self) -> list[MealPlan]:
-        data = await self.request("meal-plans/all")
-        return [self.process_mealplan_json(mealplan) for mealplan in data]  # type: ignore[arg-type]
+        return await self._request_models(
+            "meal-plans/all", "process_mealplan_json", many=True
+        )
+
+    async def iter_mealplans_all(self) -> t.AsyncIterator[MealPlan]:
+        async for data in self.stream_json("meal-plans/all"):
+            yield self.process_mealplan_json(data)
 
     async def get_mealplan_this_week(self) -> MealPlan:
         data = await self.request("meal-plans/this-week")
         return self.process_mealplan_json(data)  # type: ignore[arg-type]
 
-    async def get_todays_meal(self) -> Recipe:
-        data = await self.request("meal-plans/today")
-        return await self.get_recipe(data.decode())  # type: ignore[arg-type]
+    async def get_todays_meal(self, timeout: float | None = None) -> Recipe:
+        with self.deadline(timeout):
+            data = await self.request("meal-plans/today")
+            return await self.get_recipe(data.decode())  # type: ignore[arg-type]
 
     async def get_mealplan(self, id: int) -> MealPlan:
         data = await self.request(f"meal-plans/{id}")
         return self.process_mealplan_json(data)  # type: ignore[arg-type]
 
     async def update_mealplan(self, id: int, mealplan: MealPlan) -> MealPlan:
-        data = await self.request(
-            f"meal-plans/{id}", method="PUT", json=mealplan.dict()
+        path = f"meal-plans/{id}"
+        data = await self._mutate(
+            "update_mealplan", path, "PUT", mealplan.dict(), key=path
         )
         return self.process_mealplan_json(data)  # type: ignore[arg-type]
 
     async def create_mealplan(self, mealplan: MealPlan) -> MealPlan:
-        data = await self.request("meal-plans", method="POST", json=mealplan.dict())
+        data = await self._mutate(
+            "create_mealplan", "meal-plans", "POST", mealplan.dict()
+        )
         return self.process_mealplan_json(data)  # type: ignore[arg-type]
 
     async def delete_mealplan(self, id: int) -> None:
-        await self.request(f"meal-plans/{id}", method="DELETE")
+        path = f"meal-plans/{id}"
+        await self._mutate("delete_mealplan", path, "DELETE", key=path)
 
     async def get_todays_meal_image(self) -> bytes:
         return await self.request("meal-plans/today/image")  # type: ignore[arg-type]
 
     async def get_mealplan_shopping_list(self, id: int) -> ShoppingList:
-        data = await self.request(f"meal-plans/{id}")
+        data = await self.request(f"meal-plans/{id}/shopping-list")
         return self.process_shopping_list_json(data)  # type: ignore[arg-type]
 
+    async def build_shopping_list(
+        self,
+        mealplans: t.Iterable[MealPlan],
+        name: str,
+        group: str | None = None,
+        concurrency: int = 16,
+    ) -> ShoppingList:
+        """
+        Adds up the ingredients of every recipe in the meal plans into a new shopping list.
+        The list is not saved, call :code:`create` on it to do so.
+        """
+        return await ShoppingListBuilder(self, concurrency).build(
+            mealplans, name, group
+        )
+
     # Site Media
-    async def get_asset(self, recipe_slug: str, file_name: str) -> bytes:
-        return await self.request(f"media/recipes/{recipe_slug}/assets/{file_name}", use_auth=False)  # type: ignore[arg-type]
+    async def _get_media(
+        self, recipe_slug: str, variant: str, path: str, version: str | None
+    ) -> bytes:
+        if self.media_cache is not None:
+            content = self.media_cache.get(recipe_slug, variant, version)
+            if content is not None:
+                return content
+        content = await self.request(path, use_auth=False)
+        if self.media_cache is not None:
+            self.media_cache.put(recipe_slug, variant, content, version)
+        return content
+
+    async def get_asset(
+        self, recipe_slug: str, file_name: str, version: str | None = None
+    ) -> bytes:
+        return await self._get_media(
+            recipe_slug,
+            f"assets/{file_name}",
+            f"media/recipes/{recipe_slug}/assets/{file_name}",
+            version,
+        )
 
-    async def get_image(self, recipe_slug: str, type="original") -> bytes:
+    async def get_image(
+        self, recipe_slug: str, type="original", version: str | None = None
+    ) -> bytes:
         """
         Gets the image for the recipe.
         Valid types are :code:`original`, :code:`min-original`, and :code:`tiny-original`
+        If a :code:`media_cache` is set, a cached image is only reused if its version matches.
+        """
+        return await self._get_media(
+            recipe_slug,
+            type,
+            f"media/recipes/{recipe_slug}/images/{type}.webp",
+            version,
+        )
+
+    async def prefetch_images(
+        self,
+        recipes: t.Iterable[Recipe],
+        variants: t.Iterable[str] = ("tiny-original",),
+        concurrency: int = 8,
+    ) -> list[tuple[str, str]]:
+        """
+        Concurrently downloads the images of the recipes into the :code:`media_cache`,
+        smallest variants first. Returns the (slug, variant) pairs that failed.
         """
-        return await self.request(f"media/recipes/{recipe_slug}/images/{type}.webp", use_auth=False)  # type: ignore[arg-type]
+        async with ImagePrefetcher(self, concurrency) as prefetcher:
+            prefetcher.add(recipes, variants)
+            await prefetcher.wait()
+        return prefetcher.failed
 
     # Debug
     async def get_log_file(self) -> File:
         data = await self.request("debug/log")
         return File(_client=self, file_token=str(data.get("file_token")))  # type: ignore[arg-type]
 
+    async def tail_log(
+        self, offset: int = 0, interval: float = 5.0, follow: bool = True
+    ) -> t.AsyncIterator[str]:
+        """
+        Yields the lines of the Mealie log from byte :code:`offset` on, and with :code:`follow`
+        the lines appended to it afterwards, checking every :code:`interval` seconds.
+        Only the new bytes are downloaded each time, with Range requests.
+        """
+        token = (await self.get_log_file()).file_token
+        fresh_token = True
+        pending = b""
+        while True:
+            try:
+                start, data = await self.read_range(
+                    "utils/download", offset, params=dict(token=token), use_auth=False
+                )
+            except (UnauthenticatedError, BadRequestError):
+                if fresh_token:
+                    raise
+                # The file token expired.
+                token = (await self.get_log_file()).file_token
+                fresh_token = True
+                continue
+            fresh_token = False
+            if start != offset:
+                # The log was rotated, so it is read from the start of the new one.
+                pending = b""
+            offset = start + len(data)
+            *lines, pending = (pending + data).split(b"\n")
+            for line in lines:
+                yield line.decode(errors="replace")
+            if not follow:
+                return
+            await asyncio.sleep(interval)
+
     async def get_debug(self) -> DebugInfo:
         data = await self.request("debug")
         return DebugInfo(**data)  # type: ignore[arg-type]
@@ -468,6 +869,27 @@ class MealieClient(RawClient):
         )
         return content  # type: ignore[arg-type]
 
+    async def download_file_to(
+        self,
+        file_token: str,
+        destination: str | os.PathLike,
+        resume: bool = False,
+        retries: int = 0,
+    ) -> pathlib.Path:
+        """
+        Streams a file to disk, with :code:`resume` a partially downloaded file is continued,
+        a dropped connection is resumed up to :code:`retries` times.
+        """
+        await self.download(
+            "utils/download",
+            destination,
+            params=dict(token=file_token),
+            use_auth=False,
+            resume=resume,
+            retries=retries,
+        )
+        return pathlib.Path(destination)
+
     # Backup Endpoints
     async def get_available_backups(self) -> list[Backup]:
         data = await self.request("backups/available")
@@ -508,9 +930,58 @@ class MealieClient(RawClient):
             _client=self, name=posixpath.split(data.get("export_path", ""))[1]
         )
 
-    async def download_backup(self, file_name: str) -> bytes:
-        data = await self.request(f"backups/{file_name}/download")
-        return await File(_client=self, file_token=data.get("fileToken", "")).download()
+    async def download_backup(
+        self, file_name: str, timeout: float | None = None
+    ) -> bytes:
+        with self.deadline(timeout):
+            data = await self.request(f"backups/{file_name}/download")
+            return await File(
+                _client=self, file_token=data.get("file_token", "")
+            ).download()
+
+    async def download_backup_to(
+        self,
+        file_name: str,
+        destination: str | os.PathLike,
+        timeout: float | None = None,
+        resume: bool = False,
+        retries: int = 3,
+    ) -> BackupArchive:
+        """
+        Streams a backup to disk and opens it without extracting it. A dropped connection
+        is resumed where it stopped, and with :code:`resume` so is an earlier partial download.
+        """
+        with self.deadline(timeout):
+            data = await self.request(f"backups/{file_name}/download")
+            path = await self.download_file_to(
+                data.get("file_token", ""), destination, resume, retries
+            )
+        return BackupArchive(path, client=self)
+
+    async def diff_backups(
+        self, old_file_name: str, new_file_name: str, timeout: float | None = None
+    ) -> BackupDiff:
+        """Downloads two backups to a temporary directory and diffs them."""
+        with self.deadline(timeout), tempfile.TemporaryDirectory() as directory:
+            # Both downloads finish before anything is cleaned up, even if one of them fails.
+            results = await asyncio.gather(
+                self.download_backup_to(
+                    old_file_name, os.path.join(directory, "old.zip")
+                ),
+                self.download_backup_to(
+                    new_file_name, os.path.join(directory, "new.zip")
+                ),
+                return_exceptions=True,
+            )
+            with contextlib.ExitStack() as stack:
+                for result in results:
+                    if isinstance(result, BackupArchive):
+                        stack.enter_context(result)
+                for result in results:
+                    if isinstance(result, BaseException):
+                        raise result
+                old, new = t.cast("list[BackupArchive]", results)
+                return diff_backups(old, new)
 
     async def delete_backup(self, file_name: str) -> None:
         await self.request(f"backups/{file_name}/download")
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+from dataclasses import dataclass
+
+import aiohttp
+
+from mealieapi.backup import Backup
+from mealieapi.client import MealieClient
+from mealieapi.limits import RateLimiter
+from mealieapi.misc import DebugStatistics
+from mealieapi.recipes import Recipe
+
+_LOGGER = logging.getLogger(__name__)
+
+T = t.TypeVar("T")
+
+
+class _Default:
+    def __repr__(self) -> str:
+        return "DEFAULT"
+
+
+# Stands for the timeout of the cluster, so that passing None can turn the timeout off.
+DEFAULT: t.Any = _Default()
+
+
+# A generic NamedTuple needs Python 3.11.
+@dataclass(frozen=True)
+class InstanceResult(t.Generic[T]):
+    name: str
+    value: T | None = None
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class MealieCluster:
+    """
+    Manages clients for many Mealie instances that share one connection pool,
+    one concurrency limit and optionally one request rate limit.
+
+        async with MealieCluster(concurrency=32) as cluster:
+            cluster.add_instance("tenant-a", "https://a.example.com", token="...")
+            await cluster.login("tenant-b", "https://b.example.com", "user", "pass")
+            results = await cluster.get_debug_statistics()
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 32,
+        rate: float | None = None,
+        limit_per_host: int = 0,
+        timeout: float | None = 30.0,
+    ) -> None:
+        self.clients: dict[str, MealieClient] = {}
+        self.concurrency = concurrency
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.rate_limiter = RateLimiter(rate) if rate is not None else None
+        self.session: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self) -> "MealieCluster":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.concurrency, limit_per_host=self.limit_per_host
+                )
+            )
+            for client in self.clients.values():
+                client.session = self.session
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+            for client in self.clients.values():
+                client.session = None
+
+    def __getitem__(self, name: str) -> MealieClient:
+        return self.clients[name]
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def add_instance(
+        self, name: str, url: str, token: str | None = None
+    ) -> MealieClient:
+        """Adds an instance, authorizing it with an API token if one is given."""
+        client = MealieClient(url, session=self.session)
+        client.semaphore = self.semaphore
+        client.rate_limiter = self.rate_limiter
+        if token is not None:
+            client.authorize(token)
+        self.clients[name] = client
+        return client
+
+    async def login(
+        self, name: str, url: str, username: str, password: str
+    ) -> MealieClient:
+        """Adds an instance, authorizing it with the login credentials of a user."""
+        client = self.add_instance(name, url)
+        try:
+            await client.login(username, password)
+        except BaseException:
+            self.remove_instance(name)
+            raise
+        return client
+
+    def remove_instance(self, name: str) -> None:
+        del self.clients[name]
+
+    async def _call(
+        self,
+        name: str,
+        call: t.Callable[[MealieClient], t.Awaitable[T]],
+        timeout: float | None,
+    ) -> InstanceResult[T]:
+        try:
+            value = await asyncio.wait_for(call(self.clients[name]), timeout)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Call to %s failed", name, exc_info=True)
+            return InstanceResult(name, error=err)
+        return InstanceResult(name, value)
+
+    async def gather(
+        self,
+        call: t.Callable[[MealieClient], t.Awaitable[T]],
+        names: t.Iterable[str] | None = None,
+        timeout: float | None = DEFAULT,
+    ) -> dict[str, InstanceResult[T]]:
+        """
+        Runs a call against every instance (or the named ones) concurrently.
+        A failure or timeout of one instance is returned in its result instead of being raised.
+        The timeout defaults to the cluster's, None waits for every instance however long it takes.
+        """
+        names = list(self.clients if names is None else names)
+        timeout = self.timeout if timeout is DEFAULT else timeout
+        results = await asyncio.gather(
+            *(self._call(name, call, timeout) for name in names)
+        )
+        return {result.name: result for result in results}
+
+    async def get_debug_statistics(
+        self, **kwargs
+    ) -> dict[str, InstanceResult[DebugStatistics]]:
+        return await self.gather(lambda client: client.get_debug_statistics(), **kwargs)
+
+    async def get_recipes(
+        self, start=0, limit=9999, **kwargs
+    ) -> dict[str, InstanceResult[list[Recipe]]]:
+        return await self.gather(
+            lambda client: client.get_recipes(start, limit), **kwargs
+        )
+
+    async def create_backup(
+        self,
+        name: str,
+        names: t.Iterable[str] | None = None,
+        timeout: float | None = DEFAULT,
+        **options,
+    ) -> dict[str, InstanceResult[Backup]]:
+        return await self.gather(
+            lambda client: client.create_backup(name, **options),
+            names=names,
+            timeout=timeout,
+        )
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import functools
+import gzip
+import importlib.util
+import json
+import typing as t
+
+if t.TYPE_CHECKING:
+    import aiohttp
+
+# Statuses a server answers a compressed body it can't decode with, Mealie answers 422.
+# The server applied nothing, so the body is resent uncompressed to tell which it was.
+REJECTED_STATUSES = frozenset({400, 415, 422})
+
+
+@functools.lru_cache(maxsize=None)
+def accept_encoding() -> str:
+    """The encodings aiohttp can decode, brotli only if a brotli package is installed."""
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        encodings.append("br")
+    return ", ".join(encodings)
+
+
+def encode_json(data: t.Any) -> bytes:
+    return json.dumps(data).encode()
+
+
+def gzip_body(body: bytes, threshold: int | None) -> bytes | None:
+    """Returns the gzipped body if it is at least :code:`threshold` bytes and compressing it pays off."""
+    if threshold is None or len(body) < threshold:
+        return None
+    compressed = gzip.compress(body, compresslevel=6)
+    return compressed if len(compressed) < len(body) else None
+
+
+def wire_size(response: aiohttp.ClientResponse, size: int) -> int:
+    """The size of a read response body as it was on the wire, before aiohttp decoded it."""
+    raw_size = getattr(response.content, "total_raw_bytes", None)
+    if raw_size is not None:
+        return raw_size
+    if response.content_length is not None:
+        return response.content_length
+    return size
+
+
+class TransferStatistics:
+    """Counts the bytes a client sent and received, both as sent over the wire and decoded."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.compressed_requests = 0
+        self.bytes_sent = 0
+        self.bytes_sent_on_wire = 0
+        self.bytes_received = 0
+        self.bytes_received_on_wire = 0
+
+    def record_sent(self, size: int, wire: int) -> None:
+        self.requests += 1
+        if wire != size:
+            self.compressed_requests += 1
+        self.bytes_sent += size
+        self.bytes_sent_on_wire += wire
+
+    def record_received(self, size: int, wire: int) -> None:
+        self.bytes_received += size
+        self.bytes_received_on_wire += wire
+
+    @property
+    def bytes_saved(self) -> int:
+        sent = self.bytes_sent - self.bytes_sent_on_wire
+        return sent + self.bytes_received - self.bytes_received_on_wire
+
+    def __repr__(self) -> str:
+        return (
+            f"<TransferStatistics requests={self.requests}"
+            f" sent={self.bytes_sent_on_wire}/{self.bytes_sent}"
+            f" received={self.bytes_received_on_wire}/{self.bytes_received}>"
+        )
@@ -2,3 +2,16 @@
 
 YEAR_MONTH_DAY = "%Y-%m-%d"
 YEAR_MONTH_DAY_HOUR_MINUTE_SECOND = "%Y-%m-%dT%H:%M:%S.%f"
+
+# HTTP header names, so that aiohttp is only imported once a request is made.
+ACCEPT = "Accept"
+ACCEPT_ENCODING = "Accept-Encoding"
+AUTHORIZATION = "Authorization"
+CONTENT_ENCODING = "Content-Encoding"
+CONTENT_RANGE = "Content-Range"
+CONTENT_TYPE = "Content-Type"
+ETAG = "ETag"
+IF_RANGE = "If-Range"
+LAST_MODIFIED = "Last-Modified"
+RANGE = "Range"
+USER_AGENT = "User-Agent"
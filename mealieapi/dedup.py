@@ -0,0 +1,266 @@
+"""
+Finds near-duplicate recipes by the MinHash similarity of their ingredients and instructions,
+using locality sensitive hashing so that not every pair of recipes has to be compared.
+Signatures are computed with NumPy if it is installed (:code:`pip install mealieapi[numpy]`),
+and in pure Python otherwise.
+
+    clusters = await find_duplicate_recipes(client, threshold=0.8)
+    await tag_duplicates(client, clusters)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import random
+import re
+import typing as t
+import zlib
+from collections import defaultdict
+
+from mealieapi.model import BaseModel
+
+# numpy is optional, install the numpy extra for the vectorized minhashing.
+np: t.Any
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if t.TYPE_CHECKING:
+    from mealieapi.client import MealieClient
+    from mealieapi.recipes import Recipe
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MASK_32 = (1 << 32) - 1
+_MASK_64 = (1 << 64) - 1
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(text: str) -> list[str]:
+    """The lower case words of the text, without punctuation."""
+    return _WORD.findall(text.lower())
+
+
+def recipe_text(recipe: "Recipe") -> str:
+    lines = list(recipe.recipe_ingredient or [])
+    for step in recipe.recipe_instructions or []:
+        lines.append(step.get("text", "") if isinstance(step, dict) else str(step))
+    return "\n".join(lines)
+
+
+def shingles(text: str, size: int = 3) -> set[int]:
+    """The hashes of the runs of :code:`size` consecutive words of the text."""
+    words = normalize_text(text)
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    hashes = set()
+    for start in range(len(words) - size + 1):
+        end = start + size
+        hashes.add(zlib.crc32(" ".join(words[start:end]).encode()))
+    return hashes
+
+
+class MinHasher:
+    """Computes MinHash signatures with :code:`num_perm` universal hash functions."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1) -> None:
+        generator = random.Random(seed)
+        self.num_perm = num_perm
+        self.a = [generator.randrange(1, _MERSENNE_PRIME) for _ in range(num_perm)]
+        self.b = [generator.randrange(0, _MERSENNE_PRIME) for _ in range(num_perm)]
+        if np is not None:
+            self._a = np.array(self.a, dtype=np.uint64)
+            self._b = np.array(self.b, dtype=np.uint64)
+
+    def signature(self, hashes: t.Collection[int]) -> tuple[int, ...]:
+        if not hashes:
+            return (_MASK_32,) * self.num_perm
+        if np is not None:
+            values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+            # uint64 arithmetic wraps around like the masking of the pure Python version.
+            permuted = (values[:, None] * self._a + self._b) % np.uint64(
+                _MERSENNE_PRIME
+            )
+            return tuple((permuted & np.uint64(_MASK_32)).min(axis=0).tolist())
+        return tuple(
+            min(
+                ((a * value + b) & _MASK_64) % _MERSENNE_PRIME & _MASK_32
+                for value in hashes
+            )
+            for a, b in zip(self.a, self.b)
+        )
+
+
+def similarity(first: t.Sequence[int], second: t.Sequence[int]) -> float:
+    """The Jaccard similarity estimated from two signatures."""
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+def lsh_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """
+    The number of bands and rows per band, whose LSH similarity threshold
+    :code:`(1 / bands) ** (1 / rows)` is closest to :code:`threshold`.
+    """
+    options = [
+        (num_perm // rows, rows)
+        for rows in range(1, num_perm + 1)
+        if num_perm % rows == 0
+    ]
+    return min(
+        options, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - threshold)
+    )
+
+
+class DuplicateCluster(BaseModel):
+    slugs: list[str]
+    similarity: float
+
+    @property
+    def keep(self) -> str:
+        """The recipe to keep, the first one in the order the recipes were given."""
+        return self.slugs[0]
+
+    @property
+    def duplicates(self) -> list[str]:
+        return self.slugs[1:]
+
+
+def find_duplicates(
+    recipes: t.Iterable["Recipe"],
+    threshold: float = 0.8,
+    num_perm: int = 128,
+    shingle_size: int = 3,
+) -> list[DuplicateCluster]:
+    """
+    Groups the recipes whose estimated similarity is at least :code:`threshold`.
+    Only the pairs sharing an LSH bucket are compared, so this takes roughly linear time.
+    """
+    hasher = MinHasher(num_perm)
+    bands, rows = lsh_bands(num_perm, threshold)
+    slugs: list[str] = []
+    signatures: list[tuple[int, ...]] = []
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = defaultdict(list)
+    for recipe in recipes:
+        hashes = shingles(recipe_text(recipe), shingle_size)
+        if not hashes:
+            continue
+        number = len(slugs)
+        slugs.append(recipe.slug)
+        signature = hasher.signature(hashes)
+        signatures.append(signature)
+        for band in range(bands):
+            start = band * rows
+            end = start + rows
+            buckets[band, signature[start:end]].append(number)
+
+    parents = list(range(len(slugs)))
+
+    def root(number: int) -> int:
+        while parents[number] != number:
+            parents[number] = parents[parents[number]]
+            number = parents[number]
+        return number
+
+    edges: dict[tuple[int, int], float] = {}
+    for members in buckets.values():
+        for first, second in itertools.combinations(members, 2):
+            if (first, second) in edges:
+                continue
+            edges[first, second] = score = similarity(
+                signatures[first], signatures[second]
+            )
+            if score >= threshold:
+                parents[root(second)] = root(first)
+
+    clusters: dict[int, list[int]] = defaultdict(list)
+    for number in range(len(slugs)):
+        clusters[root(number)].append(number)
+    lowest: dict[int, float] = {}
+    for (first, second), score in edges.items():
+        if score >= threshold:
+            cluster = root(first)
+            lowest[cluster] = min(score, lowest.get(cluster, 1.0))
+    return [
+        DuplicateCluster(
+            slugs=[slugs[number] for number in members],
+            similarity=lowest[cluster],
+        )
+        for cluster, members in clusters.items()
+        if len(members) > 1
+    ]
+
+
+async def _fetch_all(
+    client: "MealieClient", slugs: t.Iterable[str], concurrency: int
+) -> list["Recipe"]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(slug: str) -> "Recipe":
+        async with semaphore:
+            return await client.get_recipe(slug)
+
+    return await asyncio.gather(*(fetch(slug) for slug in slugs))
+
+
+async def find_duplicate_recipes(
+    client: "MealieClient", threshold: float = 0.8, concurrency: int = 16
+) -> list[DuplicateCluster]:
+    """Fetches every recipe and finds the near-duplicates, keeping the oldest recipe of each cluster."""
+    summaries = [recipe async for recipe in client.iter_recipes()]
+    summaries.sort(key=lambda recipe: (recipe.date_added is None, recipe.date_added))
+    recipes = await _fetch_all(
+        client, (recipe.slug for recipe in summaries), concurrency
+    )
+    return find_duplicates(recipes, threshold)
+
+
+async def tag_duplicates(
+    client: "MealieClient",
+    clusters: t.Iterable[DuplicateCluster],
+    tag: str = "Duplicate",
+    concurrency: int = 8,
+) -> None:
+    """Tags the duplicates of each cluster, leaving the recipes to keep as they are."""
+    slugs = [slug for cluster in clusters for slug in cluster.duplicates]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def add_tag(recipe: "Recipe") -> None:
+        if tag not in (recipe.tags or []):
+            recipe.tags = [*(recipe.tags or []), tag]
+            async with semaphore:
+                await client.update_recipe(recipe)
+
+    recipes = await _fetch_all(client, slugs, concurrency)
+    await asyncio.gather(*(add_tag(recipe) for recipe in recipes))
+
+
+def _merged(*values: list[str] | None) -> list[str]:
+    return list(dict.fromkeys(item for value in values for item in value or []))
+
+
+async def merge_duplicates(
+    client: "MealieClient", clusters: t.Iterable[DuplicateCluster], concurrency: int = 8
+) -> list["Recipe"]:
+    """
+    Merges the tags and categories of the duplicates of each cluster into the recipe to keep,
+    then deletes the duplicates. Returns the kept recipes.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def merge(cluster: DuplicateCluster) -> "Recipe":
+        async with semaphore:
+            kept, *duplicates = [
+                await client.get_recipe(slug) for slug in cluster.slugs
+            ]
+            kept.tags = _merged(kept.tags, *(recipe.tags for recipe in duplicates))
+            kept.recipe_category = _merged(
+                kept.recipe_category,
+                *(recipe.recipe_category for recipe in duplicates),
+            )
+            kept = await client.update_recipe(kept)
+            for duplicate in duplicates:
+                await client.delete_recipe(duplicate.slug)
+            return kept
+
+    return await asyncio.gather(*(merge(cluster) for cluster in clusters))
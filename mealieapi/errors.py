@@ -1,3 +1,12 @@
+from __future__ import annotations
+
+import asyncio
+import typing as t
+
+if t.TYPE_CHECKING:
+    from mealieapi.journal import JournalEntry
+
+
 class MealieError(Exception):
     pass
 
@@ -16,3 +25,15 @@ class ParameterMissingError(MealieError):
 
 class InternalServerError(MealieError):
     pass
+
+
+class DeadlineExceeded(MealieError, asyncio.TimeoutError):
+    pass
+
+
+class MutationQueued(MealieError):
+    """The server was unreachable, the write was queued in the client's journal."""
+
+    def __init__(self, entry: JournalEntry) -> None:
+        super().__init__(f"Queued {entry.label} {entry.method} {entry.path}")
+        self.entry = entry
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import hmac
+import json
+import logging
+import typing as t
+from datetime import datetime
+
+from pydantic import Field
+
+from mealieapi.misc import camel_to_snake_case
+from mealieapi.model import NO_COPY, BaseModel
+from mealieapi.recipes import Recipe
+
+if t.TYPE_CHECKING:
+    from aiohttp import web
+
+    from mealieapi.client import MealieClient
+
+_LOGGER = logging.getLogger(__name__)
+
+RECIPE_CREATED = "created"
+RECIPE_UPDATED = "updated"
+RECIPE_DELETED = "deleted"
+RECIPE_WEBHOOK = "webhook"
+
+E = t.TypeVar("E", bound="Event")
+Callback = t.Callable[[t.Any], t.Union[t.Awaitable[None], None]]
+
+
+class Event(BaseModel):
+    received: datetime = Field(default_factory=datetime.now)
+
+
+class WebhookEvent(Event):
+    """A webhook sent by Mealie, Mealie sends the recipe of the day to the webhooks of a group."""
+
+    group: str | None = None
+    payload: t.Any = None
+
+
+class RecipeEvent(Event):
+    action: str
+    slug: str
+    recipe: Recipe | None = None
+
+    class Config:
+        copy_on_model_validation = NO_COPY
+
+
+class FavoriteEvent(Event):
+    user_id: str
+    slug: str
+    added: bool
+
+
+class EventBus:
+    """
+    Delivers events to the callbacks subscribed to their type.
+
+        client.events.subscribe(on_recipe, RecipeEvent)
+        async for event in client.events.listen(RecipeEvent):
+            ...
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: list[tuple[type[Event], Callback]] = []
+
+    def subscribe(
+        self, callback: Callback, event_type: type[Event] = Event
+    ) -> t.Callable[[], None]:
+        """Calls :code:`callback` with every published event of the type, returns a function that unsubscribes it."""
+        subscriber = (event_type, callback)
+        self._subscribers.append(subscriber)
+
+        def unsubscribe() -> None:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+        return unsubscribe
+
+    async def publish(self, event: Event) -> None:
+        awaitables = []
+        for event_type, callback in list(self._subscribers):
+            if not isinstance(event, event_type):
+                continue
+            try:
+                result = callback(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Event subscriber %r failed", callback)
+                continue
+            if asyncio.iscoroutine(result) or isinstance(result, asyncio.Future):
+                awaitables.append(result)
+        for outcome in await asyncio.gather(*awaitables, return_exceptions=True):
+            if isinstance(outcome, Exception):
+                _LOGGER.error("Event subscriber failed", exc_info=outcome)
+
+    async def listen(self, event_type: type[E] = Event) -> t.AsyncIterator[E]:  # type: ignore[assignment]
+        queue: asyncio.Queue = asyncio.Queue()
+        unsubscribe = self.subscribe(queue.put_nowait, event_type)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            unsubscribe()
+
+
+class WebhookReceiver:
+    """
+    An aiohttp handler for Mealie group webhooks that publishes them on the event bus of a client.
+    Point the webhook URLs of a group at :code:`http://<host>:<port>/mealie/webhook?group=<name>`,
+    adding :code:`&token=<secret>` if the receiver was given a secret.
+    """
+
+    def __init__(
+        self,
+        client: "MealieClient",
+        path: str = "/mealie/webhook",
+        secret: str | None = None,
+    ) -> None:
+        self._client = client
+        self.path = path
+        self.secret = secret
+        self._runner: web.AppRunner | None = None
+
+    def add_routes(self, app: web.Application) -> None:
+        """Adds the receiver to an existing aiohttp application."""
+        app.router.add_post(self.path, self.handle)
+
+    def make_app(self) -> web.Application:
+        from aiohttp import web  # pylint: disable=import-outside-toplevel
+
+        app = web.Application()
+        self.add_routes(app)
+        return app
+
+    async def start(self, host: str = "0.0.0.0", port: int = 8080) -> None:
+        from aiohttp import web  # pylint: disable=import-outside-toplevel
+
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        from aiohttp import web  # pylint: disable=import-outside-toplevel
+
+        if self.secret is not None and not hmac.compare_digest(
+            request.query.get("token", "").encode(), self.secret.encode()
+        ):
+            return web.Response(status=401)
+        try:
+            payload = json.loads(await request.read() or b"null")
+            if isinstance(payload, str):
+                # Mealie posts the recipe json encoded as a json string.
+                payload = json.loads(payload)
+        except ValueError:
+            return web.Response(status=400, text="Expected a JSON body")
+        if isinstance(payload, (dict, list)):
+            payload = camel_to_snake_case(payload)
+        await self._client.events.publish(
+            WebhookEvent(group=request.query.get("group"), payload=payload)
+        )
+        if isinstance(payload, dict) and payload.get("slug"):
+            await self._client.events.publish(
+                RecipeEvent(
+                    action=RECIPE_WEBHOOK,
+                    slug=payload["slug"],
+                    recipe=self._parse_recipe(payload),
+                )
+            )
+        return web.Response(status=204)
+
+    def _parse_recipe(self, data: dict[str, t.Any]) -> Recipe | None:
+        try:
+            return self._client.process_recipe_json(dict(data))
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.debug("Could not parse the webhook recipe", exc_info=True)
+            return None
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import time
+import typing as t
+
+T = t.TypeVar("T")
+
+# Methods that can be sent twice without changing anything on the server.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+class HedgePolicy:
+    """
+    Sends a second, identical request when the first one hasn't been answered within
+    the :code:`percentile` latency of recent requests, the first response wins and the other
+    request is cancelled. At most a :code:`max_rate` fraction of requests are hedged,
+    so hedging only marginally adds to the load of the server.
+
+        client.hedge_policy = HedgePolicy(percentile=0.95, max_rate=0.05)
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_rate: float = 0.05,
+        min_delay: float = 0.01,
+        window: int = 200,
+        min_samples: int = 20,
+    ) -> None:
+        if not 0 < percentile < 1:
+            raise ValueError("The percentile has to be between 0 and 1")
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.latencies: collections.deque[float] = collections.deque(maxlen=window)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._budget = 0.0
+
+    def delay(self) -> float | None:
+        """Seconds to wait for a response before hedging, None while there are too few samples."""
+        if len(self.latencies) < self.min_samples:
+            return None
+        latencies = sorted(self.latencies)
+        index = min(int(len(latencies) * self.percentile), len(latencies) - 1)
+        return max(latencies[index], self.min_delay)
+
+    def _take_hedge(self) -> bool:
+        if self._budget < 1:
+            return False
+        self._budget -= 1
+        return True
+
+    async def _timed(
+        self, call: t.Callable[[], t.Awaitable[T]], primary: bool = False
+    ) -> T:
+        started = time.monotonic()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            if primary:
+                # A primary that lost to its hedge took at least this long, leaving it out
+                # would bias the percentile low and make hedges fire too early.
+                self.latencies.append(time.monotonic() - started)
+            raise
+        self.latencies.append(time.monotonic() - started)
+        return result
+
+    async def run(self, call: t.Callable[[], t.Awaitable[T]]) -> T:
+        """Awaits :code:`call()`, calling it a second time if the first call is slow."""
+        self.requests += 1
+        self._budget = min(self._budget + self.max_rate, 1.0)
+        delay = self.delay()
+        first = asyncio.ensure_future(self._timed(call, primary=True))
+        tasks = [first]
+        try:
+            if delay is None:
+                return await first
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not self._take_hedge():
+                return await first
+            self.hedged += 1
+            tasks.append(asyncio.ensure_future(self._timed(call)))
+            pending = set(tasks)
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise t.cast(BaseException, error)
+        finally:
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+            for task in tasks:
+                if not task.cancelled():
+                    task.exception()
+
+    def __repr__(self) -> str:
+        return (
+            f"<HedgePolicy requests={self.requests} hedged={self.hedged}"
+            f" hedge_wins={self.hedge_wins} delay={self.delay()}>"
+        )
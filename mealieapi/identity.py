@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import typing as t
+from collections import OrderedDict
+
+from mealieapi.model import InteractiveModel
+
+M = t.TypeVar("M", bound=InteractiveModel)
+
+
+def merge_model(target: InteractiveModel, source: InteractiveModel) -> None:
+    """Copies the fields that were set on :code:`source` onto :code:`target`."""
+    for field in source.__fields_set__:
+        setattr(target, field, getattr(source, field))
+    for name in source.__private_attributes__:
+        if name != "_client" and getattr(source, name, None) is not None:
+            setattr(target, name, getattr(source, name))
+
+
+class IdentityMap:
+    """
+    Keeps one canonical instance of every entity a client has seen, so that a recipe
+    appearing in tags, categories, favorites and groups is only one :code:`Recipe` object.
+    Data parsed later is merged into the canonical instance, a summary never erases fields
+    that a full fetch filled in because only the fields a response contained are merged.
+
+    The map holds strong references, :code:`max_size` bounds how many entities it keeps.
+    """
+
+    def __init__(self, max_size: int | None = None) -> None:
+        self.max_size = max_size
+        self._entities: OrderedDict[tuple[str, t.Hashable], InteractiveModel] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def key(model: InteractiveModel) -> tuple[str, t.Hashable] | None:
+        identity = model.identity()
+        if identity is None:
+            return None
+        return type(model).__name__, identity
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def get(self, kind: type[M], identity: t.Hashable) -> M | None:
+        return self._entities.get((kind.__name__, identity))  # type: ignore[return-value]
+
+    def resolve(self, model: M) -> M:
+        """Returns the canonical instance for the entity, after merging the model into it."""
+        key = self.key(model)
+        if key is None:
+            return model
+        canonical = self._entities.get(key)
+        if canonical is None:
+            self._entities[key] = model
+            canonical = model
+        elif canonical is not model:
+            merge_model(canonical, model)
+            self._entities.move_to_end(key)
+        if self.max_size is not None and len(self._entities) > self.max_size:
+            self._entities.popitem(last=False)
+        return canonical  # type: ignore[return-value]
+
+    def link(self, model: M) -> M:
+        """
+        Resolves the model and every model nested in it, replacing nested models by their
+        canonical instances so that the whole graph holds one instance per entity.
+        """
+        return self._link(model, {})
+
+    def _link(self, model: M, seen: dict[int, InteractiveModel]) -> M:
+        if id(model) in seen:
+            return seen[id(model)]  # type: ignore[return-value]
+        canonical = self.resolve(model)
+        seen[id(model)] = seen[id(canonical)] = canonical
+        for name, value in canonical.__dict__.items():
+            canonical.__dict__[name] = self._link_value(value, seen)
+        return canonical
+
+    def _link_value(self, value: t.Any, seen: dict[int, InteractiveModel]) -> t.Any:
+        if isinstance(value, InteractiveModel):
+            return self._link(value, seen)
+        if isinstance(value, list):
+            return [self._link_value(item, seen) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self._link_value(item, seen) for item in value)
+        if isinstance(value, dict):
+            return {key: self._link_value(item, seen) for key, item in value.items()}
+        return value
+
+    def discard(self, kind: type[InteractiveModel], identity: t.Hashable) -> None:
+        self._entities.pop((kind.__name__, identity), None)
+
+    def clear(self) -> None:
+        self._entities.clear()
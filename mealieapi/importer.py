@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+import typing as t
+from collections import defaultdict
+from urllib.parse import urlsplit, urlunsplit
+
+from mealieapi.checkpoint import Checkpoint
+from mealieapi.lanes import BULK
+from mealieapi.model import BaseModel
+
+if t.TYPE_CHECKING:
+    from mealieapi.client import MealieClient
+    from mealieapi.recipes import Recipe
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes a URL so that trivially different spellings of it are only imported once.
+    It is only a key, what is imported is the URL as it was given.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, parts.query, "")
+    )
+
+
+class URLImportReport(BaseModel):
+    created: dict[str, str] = {}
+    failed: dict[str, str] = {}
+    skipped: list[str] = []
+
+
+class _HostLimiter:
+    def __init__(self, concurrency: int, delay: float) -> None:
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.delay = delay
+        self.next_start = 0.0
+
+    async def __aenter__(self) -> None:
+        await self.semaphore.acquire()
+        try:
+            wait = self.next_start - time.monotonic()
+            self.next_start = max(self.next_start, time.monotonic()) + self.delay
+            if wait > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            # Cancelled while waiting for the start, __aexit__ won't release the slot.
+            self.semaphore.release()
+            raise
+
+    async def __aexit__(self, *args) -> None:
+        self.semaphore.release()
+
+
+class BulkURLImporter:
+    """
+    Has Mealie scrape many recipe URLs with bounded concurrency,
+    limiting the requests per recipe website and starting them at least
+    :code:`host_delay` seconds apart. Finished URLs are recorded in a checkpoint,
+    so an interrupted import resumes where it stopped.
+
+        importer = BulkURLImporter(client, "import.checkpoint")
+        report = await importer.run(urls)
+        recipes = await importer.fetch(report.created.values())
+    """
+
+    def __init__(
+        self,
+        client: "MealieClient",
+        checkpoint: Checkpoint | str | os.PathLike | None = None,
+        concurrency: int = 8,
+        per_host: int = 1,
+        host_delay: float = 1.0,
+    ) -> None:
+        self._client = client
+        if checkpoint is not None and not isinstance(checkpoint, Checkpoint):
+            checkpoint = Checkpoint(checkpoint)
+        self.checkpoint = checkpoint
+        self.concurrency = concurrency
+        self._hosts: dict[str, _HostLimiter] = defaultdict(
+            lambda: _HostLimiter(per_host, host_delay)
+        )
+
+    @staticmethod
+    def _interleave(urls: t.Iterable[str]) -> list[str]:
+        """Orders URLs round robin by host, so workers don't all wait on one website."""
+        by_host: dict[str, list[str]] = defaultdict(list)
+        for url in urls:
+            by_host[urlsplit(url).netloc].append(url)
+        return [
+            url
+            for urls_of_round in itertools.zip_longest(*by_host.values())
+            for url in urls_of_round
+            if url is not None
+        ]
+
+    async def _import(self, key: str, url: str, report: URLImportReport) -> None:
+        async with self._hosts[urlsplit(key).netloc]:
+            try:
+                with self._client.lane(BULK):
+                    slug = await self._client.create_recipe_slug_from_url(url)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.warning("Failed to import %s: %r", url, err)
+                report.failed[url] = repr(err)
+                return
+        report.created[url] = slug
+        if self.checkpoint is not None:
+            self.checkpoint.mark(key, slug)
+
+    async def run(self, urls: t.Iterable[str]) -> URLImportReport:
+        report = URLImportReport()
+        # The first spelling of each URL is the one imported, by its normalized key.
+        pending: dict[str, str] = {}
+        seen: set[str] = set()
+        for url in (url.strip() for url in urls):
+            key = normalize_url(url)
+            if not url or key in seen:
+                continue
+            seen.add(key)
+            if self.checkpoint is not None and key in self.checkpoint:
+                report.skipped.append(url)
+            else:
+                pending[key] = url
+        queue: asyncio.Queue = asyncio.Queue()
+        for key in self._interleave(pending):
+            queue.put_nowait((key, pending[key]))
+
+        async def worker() -> None:
+            while not queue.empty():
+                key, url = queue.get_nowait()
+                await self._import(key, url, report)
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(self.concurrency, queue.qsize())))
+        )
+        return report
+
+    def imported_slugs(self) -> list[str]:
+        """The slugs of every recipe created so far, including by earlier runs."""
+        if self.checkpoint is None:
+            return []
+        return [slug for _, slug in self.checkpoint.items() if slug]
+
+    async def fetch(
+        self, slugs: t.Iterable[str], concurrency: int | None = None
+    ) -> list["Recipe"]:
+        """Fetches the created recipes in one batched pass, skipping ones that fail."""
+        semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def fetch_one(slug: str) -> "Recipe | None":
+            async with semaphore:
+                try:
+                    return await self._client.get_recipe(slug)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.warning("Failed to get %r", slug, exc_info=True)
+                    return None
+
+        recipes = await asyncio.gather(
+            *(fetch_one(slug) for slug in dict.fromkeys(slugs))
+        )
+        return [recipe for recipe in recipes if recipe is not None]
+
+    def close(self) -> None:
+        if self.checkpoint is not None:
+            self.checkpoint.close()
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+from collections import defaultdict
+
+from mealieapi.events import RECIPE_DELETED, FavoriteEvent, RecipeEvent
+from mealieapi.recipes import Recipe, to_slug
+
+if t.TYPE_CHECKING:
+    from mealieapi.client import MealieClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _keys(names: t.Iterable[str] | None) -> set[str]:
+    return {to_slug(name) for name in names or ()}
+
+
+class RecipeIndex:
+    """
+    In-memory indexes of recipe summaries by tag, category, rating and user favorites,
+    answering set queries without requests. Attached to a client it is kept up to date
+    with the recipes and favorites the client creates, updates and deletes. Recipes created
+    without being fetched back, by :code:`create_recipe_slug` and the bulk importer, are only
+    recorded in :code:`stale` and indexed by the next :code:`refresh`, in one batched pass.
+    Tags and categories are matched by slug, so :code:`"Main Dish"` and :code:`"main-dish"` are equal.
+
+        index = await RecipeIndex.build(client, favorites=True)
+        slugs = index.query(tags=["dinner"], categories=["pasta"], exclude_tags=["spicy"])
+        recipes = index.recipes(slugs)
+    """
+
+    def __init__(self) -> None:
+        self.summaries: dict[str, Recipe] = {}
+        self.by_tag: dict[str, set[str]] = defaultdict(set)
+        self.by_category: dict[str, set[str]] = defaultdict(set)
+        self.by_rating: dict[int | None, set[str]] = defaultdict(set)
+        self.favorites: dict[str, set[str]] = defaultdict(set)
+        # Slugs of created recipes that weren't fetched yet.
+        self.stale: set[str] = set()
+        self._unsubscribers: list[t.Callable[[], None]] = []
+
+    @classmethod
+    async def build(
+        cls, client: "MealieClient", favorites: bool = False, attach: bool = True
+    ) -> "RecipeIndex":
+        """Indexes every recipe summary, and the favorites of every user if :code:`favorites`."""
+        index = cls()
+        if attach:
+            # Subscribe first, so that changes made while building aren't missed.
+            index.attach(client)
+        async for recipe in client.iter_recipes():
+            index.add(recipe)
+        if favorites:
+            users = await client.get_all_users()
+            for user, recipes in zip(
+                users,
+                await asyncio.gather(*(client.get_favorites(user.id) for user in users)),  # type: ignore[arg-type]
+            ):
+                index.set_favorites(user.id, (recipe.slug for recipe in recipes or ()))
+        return index
+
+    def attach(self, client: "MealieClient") -> None:
+        self._unsubscribers += [
+            client.events.subscribe(self._on_recipe, RecipeEvent),
+            client.events.subscribe(self._on_favorite, FavoriteEvent),
+        ]
+
+    def detach(self) -> None:
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers.clear()
+
+    def _on_recipe(self, event: RecipeEvent) -> None:
+        if event.action == RECIPE_DELETED:
+            self.remove(event.slug)
+        elif event.recipe is None:
+            self.stale.add(event.slug)
+        else:
+            if event.recipe.slug != event.slug:
+                # Renaming a recipe changes its slug.
+                self.rename(event.slug, event.recipe.slug)
+            self.add(event.recipe)
+
+    async def refresh(self, client: "MealieClient", concurrency: int = 8) -> None:
+        """Fetches and indexes the stale recipes, the ones that fail to load stay stale."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(slug: str) -> None:
+            async with semaphore:
+                try:
+                    recipe = await client.get_recipe(slug)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.warning("Failed to get %r", slug, exc_info=True)
+                    return
+            # It may have been deleted meanwhile.
+            if slug in self.stale:
+                self.add(recipe)
+
+        await asyncio.gather(*(fetch(slug) for slug in list(self.stale)))
+
+    def _on_favorite(self, event: FavoriteEvent) -> None:
+        if event.added:
+            self.favorites[event.user_id].add(event.slug)
+        else:
+            self.favorites[event.user_id].discard(event.slug)
+
+    def __len__(self) -> int:
+        return len(self.summaries)
+
+    def __contains__(self, slug: object) -> bool:
+        return slug in self.summaries
+
+    def add(self, recipe: Recipe) -> None:
+        """Indexes the recipe, replacing what was indexed for its slug before."""
+        self.remove(recipe.slug, keep_favorites=True)
+        slug = recipe.slug
+        self.stale.discard(slug)
+        self.summaries[slug] = recipe
+        for tag in _keys(recipe.tags):
+            self.by_tag[tag].add(slug)
+        for category in _keys(recipe.recipe_category):
+            self.by_category[category].add(slug)
+        self.by_rating[recipe.rating].add(slug)
+
+    def remove(self, slug: str, keep_favorites: bool = False) -> None:
+        self.stale.discard(slug)
+        recipe = self.summaries.pop(slug, None)
+        if recipe is not None:
+            for tag in _keys(recipe.tags):
+                self.by_tag[tag].discard(slug)
+            for category in _keys(recipe.recipe_category):
+                self.by_category[category].discard(slug)
+            self.by_rating[recipe.rating].discard(slug)
+        if not keep_favorites:
+            for slugs in self.favorites.values():
+                slugs.discard(slug)
+
+    def rename(self, old_slug: str, new_slug: str) -> None:
+        """Removes the recipe of the old slug, moving its favorites to the new slug."""
+        self.remove(old_slug, keep_favorites=True)
+        for slugs in self.favorites.values():
+            if old_slug in slugs:
+                slugs.discard(old_slug)
+                slugs.add(new_slug)
+
+    def set_favorites(self, user_id: int | str, slugs: t.Iterable[str]) -> None:
+        self.favorites[str(user_id)] = set(slugs)
+
+    def untagged(self) -> set[str]:
+        return {slug for slug, recipe in self.summaries.items() if not recipe.tags}
+
+    def uncategorized(self) -> set[str]:
+        return {
+            slug
+            for slug, recipe in self.summaries.items()
+            if not recipe.recipe_category
+        }
+
+    def query(
+        self,
+        tags: t.Iterable[str] = (),
+        categories: t.Iterable[str] = (),
+        exclude_tags: t.Iterable[str] = (),
+        exclude_categories: t.Iterable[str] = (),
+        min_rating: int | None = None,
+        favorite_of: int | str | None = None,
+    ) -> set[str]:
+        """The slugs of the recipes having all the tags and categories and none of the excluded ones."""
+        required = [self.by_tag.get(tag, set()) for tag in _keys(tags)]
+        required += [self.by_category.get(c, set()) for c in _keys(categories)]
+        if favorite_of is not None:
+            required.append(self.favorites.get(str(favorite_of), set()))
+        if min_rating is not None:
+            required.append(
+                set().union(
+                    *(
+                        slugs
+                        for rating, slugs in self.by_rating.items()
+                        if rating is not None and rating >= min_rating
+                    )
+                )
+            )
+        # Intersecting the smallest sets first keeps the intermediate results small.
+        required.sort(key=len)
+        result = set(required[0]) if required else set(self.summaries)
+        for slugs in required[1:]:
+            result &= slugs
+        for tag in _keys(exclude_tags):
+            result -= self.by_tag.get(tag, set())
+        for category in _keys(exclude_categories):
+            result -= self.by_category.get(category, set())
+        return result
+
+    def recipes(self, slugs: t.Iterable[str]) -> list[Recipe]:
+        """The indexed summaries of the recipes, sorted by slug."""
+        return [self.summaries[slug] for slug in sorted(slugs) if slug in self]
@@ -0,0 +1,227 @@
+"""
+An append-only journal of the writes a client couldn't send because the server was unreachable.
+
+    client.journal = MutationJournal("mealie-journal.jsonl")
+    try:
+        await client.update_recipe(recipe)
+    except MutationQueued:
+        ...  # The update is written to the journal, it is sent by replay.
+    report = await client.journal.replay(client)
+    for entry in report.conflicts:
+        print("Changed on the server meanwhile:", entry.label, entry.path)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import typing as t
+from collections import defaultdict
+
+from mealieapi.jsonl import JSONLinesLog
+from mealieapi.model import BaseModel
+
+if t.TYPE_CHECKING:
+    from mealieapi.client import MealieClient
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def offline_errors() -> tuple[type[BaseException], ...]:
+    """
+    Errors meaning the request surely didn't reach the server, the connection couldn't be made.
+    After a timeout or a dropped connection the server may have applied the write, queueing
+    it could apply a create twice, so those errors, and DeadlineExceeded, are raised instead.
+    """
+    import aiohttp  # pylint: disable=import-outside-toplevel
+
+    return (aiohttp.ClientConnectorError,)
+
+
+APPLIED = "applied"
+SUPERSEDED = "superseded"
+CONFLICT = "conflict"
+FAILED = "failed"
+
+
+class JournalEntry(BaseModel):
+    seq: int
+    label: str
+    method: str
+    path: str
+    json_data: t.Any = None
+    # Entries of the same resource are replayed one after another, in order.
+    resource: str
+    # A later entry with the same key replaces this one, None if it can't be replaced.
+    key: str | None = None
+    # The updated date of the recipe the write was based on, to detect conflicting edits.
+    base_version: str | None = None
+
+
+class ReplayReport(BaseModel):
+    applied: list[JournalEntry] = []
+    conflicts: list[JournalEntry] = []
+    failed: list[JournalEntry] = []
+    errors: dict[int, str] = {}
+    # Entries that are still queued because the server became unreachable again.
+    remaining: list[JournalEntry] = []
+
+    @property
+    def ok(self) -> bool:
+        return not (self.conflicts or self.failed or self.remaining)
+
+
+class MutationJournal:
+    """
+    Queues writes in a file of JSON lines while the server is unreachable: a line per queued
+    write and a line per write that was sent, replaced or dropped, so it survives restarts.
+    Once anything is queued the later writes are queued too, so they aren't sent out of order.
+    Successive updates of the same entity are coalesced into the last one.
+    """
+
+    def __init__(self, path: str | os.PathLike, fsync: bool = True) -> None:
+        self._log = JSONLinesLog(path, fsync)
+        self.path = self._log.path
+        self.fsync = fsync
+        self._pending: dict[int, JournalEntry] = {}
+        self._seq = 0
+        for record in self._log.load():
+            self._load(record)
+
+    def _load(self, record: dict[str, t.Any]) -> None:
+        if "done" in record:
+            self._pending.pop(record["done"], None)
+            self._seq = max(self._seq, record["done"])
+        else:
+            entry = JournalEntry(**record)
+            self._pending[entry.seq] = entry
+            self._seq = max(self._seq, entry.seq)
+
+    def _write(self, record: dict[str, t.Any]) -> None:
+        self._log.append(record)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __enter__(self) -> "MutationJournal":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> list[JournalEntry]:
+        """The queued writes, in the order they were made."""
+        return list(self._pending.values())
+
+    def append(
+        self,
+        label: str,
+        method: str,
+        path: str,
+        resource: str,
+        json_data: t.Any = None,
+        key: str | None = None,
+        base_version: str | None = None,
+    ) -> JournalEntry:
+        """Queues a write, replacing the queued write with the same key."""
+        replaced = next(
+            (entry for entry in self._pending.values() if key and entry.key == key),
+            None,
+        )
+        if replaced is not None:
+            # The replaced write was based on what the server had, so is this one.
+            base_version = replaced.base_version
+        self._seq += 1
+        entry = JournalEntry(
+            seq=self._seq,
+            label=label,
+            method=method,
+            path=path,
+            json_data=json_data,
+            resource=resource,
+            key=key,
+            base_version=base_version,
+        )
+        self._write(entry.dict())
+        self._pending[entry.seq] = entry
+        if replaced is not None:
+            self._finish(replaced, SUPERSEDED)
+        return entry
+
+    def _finish(self, entry: JournalEntry, status: str) -> None:
+        self._write({"done": entry.seq, "status": status})
+        self._pending.pop(entry.seq, None)
+
+    async def _conflicts(self, client: "MealieClient", entry: JournalEntry) -> bool:
+        if entry.base_version is None:
+            return False
+        current = await client.get_recipe(entry.resource.split("/", 1)[1])
+        return current.dict()["date_updated"] != entry.base_version
+
+    async def replay(
+        self, client: "MealieClient", concurrency: int = 4, force: bool = False
+    ) -> ReplayReport:
+        """
+        Sends the queued writes, the writes of different resources concurrently. Updates of recipes
+        that were changed on the server since are reported as conflicts and dropped instead of
+        overwriting the changes, unless :code:`force`. Stops sending once the server is unreachable.
+        """
+        report = ReplayReport()
+        by_resource: dict[str, list[JournalEntry]] = defaultdict(list)
+        for entry in self.pending:
+            by_resource[entry.resource].append(entry)
+        semaphore = asyncio.Semaphore(concurrency)
+        offline = False
+
+        async def send(entries: list[JournalEntry]) -> None:
+            nonlocal offline
+            async with semaphore:
+                for number, entry in enumerate(entries):
+                    if offline:
+                        report.remaining += entries[number:]
+                        return
+                    try:
+                        if not force and await self._conflicts(client, entry):
+                            self._finish(entry, CONFLICT)
+                            report.conflicts.append(entry)
+                            continue
+                        await client.request(
+                            entry.path, method=entry.method, json=entry.json_data
+                        )
+                    except offline_errors():
+                        offline = True
+                        report.remaining += entries[number:]
+                        return
+                    except Exception as err:  # pylint: disable=broad-except
+                        _LOGGER.warning(
+                            "Failed to replay %r", entry.label, exc_info=True
+                        )
+                        self._finish(entry, FAILED)
+                        report.failed.append(entry)
+                        report.errors[entry.seq] = repr(err)
+                        continue
+                    self._finish(entry, APPLIED)
+                    report.applied.append(entry)
+
+        await asyncio.gather(*(send(entries) for entries in by_resource.values()))
+        for entries in (
+            report.applied,
+            report.conflicts,
+            report.failed,
+            report.remaining,
+        ):
+            entries.sort(key=lambda entry: entry.seq)
+        if not self._pending:
+            self.compact()
+        return report
+
+    def compact(self) -> None:
+        """Rewrites the file with only the queued writes."""
+        self._log.rewrite(entry.dict() for entry in self._pending.values())
+
+    def close(self) -> None:
+        self._log.close()
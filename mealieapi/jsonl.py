@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import typing as t
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class JSONLinesLog:
+    """
+    An append only file with a JSON record per line, for state that has to survive crashes.
+
+    A crash can leave a partially written last line. Loading cuts it off, so that the next
+    append starts on a line of its own instead of being merged into the fragment.
+    """
+
+    def __init__(self, path: str | os.PathLike, fsync: bool = False) -> None:
+        self.path = pathlib.Path(path)
+        self.fsync = fsync
+        # The number of lines in the file, to tell when it is worth compacting.
+        self.lines = 0
+        self._file: t.TextIO | None = None
+
+    def load(self) -> list[t.Any]:
+        """The records in the file, lines that aren't valid JSON are skipped."""
+        self.close()
+        try:
+            with open(self.path, "rb+") as file:
+                data = file.read()
+                end = data.rfind(b"\n") + 1
+                if end < len(data):
+                    file.truncate(end)
+        except FileNotFoundError:
+            self.lines = 0
+            return []
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                _LOGGER.warning("Skipping a corrupt line of %s", self.path)
+        self.lines = len(records)
+        return records
+
+    def append(self, record: t.Any, flush: bool = True) -> None:
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record) + "\n")
+        self.lines += 1
+        if flush:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def rewrite(self, records: t.Iterable[t.Any]) -> None:
+        """Atomically replaces the file with only the records."""
+        self.close()
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        lines = 0
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+                lines += 1
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+        self.lines = lines
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
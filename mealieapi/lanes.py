@@ -0,0 +1,135 @@
+"""
+Priority lanes for requests, so that bulk jobs don't starve interactive calls of a shared client.
+
+    client.scheduler = LaneScheduler(concurrency=8)
+    with client.lane(BULK):
+        await export(client, output)
+    recipe = await client.request("recipes/pasta", lane=INTERACTIVE)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import contextvars
+import typing as t
+
+INTERACTIVE = "interactive"
+DEFAULT = "default"
+BULK = "bulk"
+
+DEFAULT_WEIGHTS = {INTERACTIVE: 8.0, DEFAULT: 4.0, BULK: 1.0}
+
+_LANE: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "mealieapi_lane", default=DEFAULT
+)
+
+
+def current_lane() -> str:
+    return _LANE.get()
+
+
+@contextlib.contextmanager
+def lane(name: str | None) -> t.Iterator[str]:
+    """Sends the requests of the block, and of tasks it starts, in the lane, None keeps the current lane."""
+    token = _LANE.set(_LANE.get() if name is None else name)
+    try:
+        yield _LANE.get()
+    finally:
+        _LANE.reset(token)
+
+
+class LaneScheduler:
+    """
+    Hands out :code:`concurrency` request slots to the lanes in proportion to their weights,
+    using stride scheduling so that a busy lane can't starve the others. A lane can be limited
+    to fewer slots, by default the bulk lane always leaves one slot for the other lanes.
+    Keep :code:`concurrency` at or below the connection limit of the session,
+    so that the lanes share the connection pool the same way.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        weights: dict[str, float] | None = None,
+        limits: dict[str, int] | None = None,
+    ) -> None:
+        self.concurrency = concurrency
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        if limits is None:
+            limits = {BULK: max(1, concurrency - 1)}
+        self.limits = limits
+        self.in_flight: dict[str, int] = collections.defaultdict(int)
+        self._active = 0
+        self._waiters: dict[str, collections.deque[asyncio.Future]] = (
+            collections.defaultdict(collections.deque)
+        )
+        self._pass: dict[str, float] = collections.defaultdict(float)
+        self._virtual_time = 0.0
+
+    def waiting(self, name: str) -> int:
+        return len(self._waiters[name])
+
+    def _has_room(self, name: str) -> bool:
+        return self._active < self.concurrency and self.in_flight[
+            name
+        ] < self.limits.get(name, self.concurrency)
+
+    def _take(self, name: str) -> None:
+        self._active += 1
+        self.in_flight[name] += 1
+        start = max(self._pass[name], self._virtual_time)
+        self._virtual_time = start
+        self._pass[name] = start + 1 / self.weights[name]
+
+    def _wake(self) -> None:
+        while True:
+            ready = [
+                name
+                for name, waiters in self._waiters.items()
+                if waiters and self._has_room(name)
+            ]
+            if not ready:
+                return
+            name = min(
+                ready, key=lambda name: max(self._pass[name], self._virtual_time)
+            )
+            future = self._waiters[name].popleft()
+            if not future.done():
+                self._take(name)
+                future.set_result(None)
+
+    async def acquire(self, name: str = DEFAULT) -> None:
+        if name not in self.weights:
+            raise ValueError(
+                f"Unknown lane {name!r}, expected one of {list(self.weights)}"
+            )
+        if self._has_room(name) and not any(self._waiters.values()):
+            self._take(name)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[name].append(future)
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the request was cancelled.
+                self.release(name)
+            elif future in self._waiters[name]:
+                self._waiters[name].remove(future)
+            raise
+
+    def release(self, name: str = DEFAULT) -> None:
+        self._active -= 1
+        self.in_flight[name] -= 1
+        self._wake()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, name: str = DEFAULT) -> t.AsyncIterator[None]:
+        await self.acquire(name)
+        try:
+            yield
+        finally:
+            self.release(name)
@@ -7,14 +7,29 @@ import slugify
 
 from mealieapi.const import YEAR_MONTH_DAY
 from mealieapi.model import InteractiveModel
+from mealieapi.writebehind import ShoppingListWriter
+
+if t.TYPE_CHECKING:
+    from mealieapi.client import MealieClient
+    from mealieapi.recipes import Recipe
 
 
 class Meal(InteractiveModel):
     name: str
     description: str
+    _slug: str | None = None
+
+    def __init__(
+        self, _client: "MealieClient", *args, slug: str | None = None, **kwargs
+    ):
+        super().__init__(_client, *args, **kwargs)
+        self._slug = slug
 
     @property
     def slug(self) -> str:
+        """The slug of the recipe of the meal."""
+        if self._slug is not None:
+            return self._slug
         return slugify.slugify(self.name)
 
     def dict(self, *args, **kwargs) -> dict[str, t.Any]:
@@ -22,8 +37,8 @@ class Meal(InteractiveModel):
         data.update(slug=self.slug)
         return data
 
-    async def get_recipe(self):
-        pass
+    async def get_recipe(self) -> "Recipe":
+        return await self._client.get_recipe(self.slug)
 
 
 class MealPlanDay(InteractiveModel):
@@ -40,18 +55,26 @@ class MealPlan(InteractiveModel):
     group: str
     end_date: datetime
     start_date: datetime
-    meals: list[Meal]
+    plan_days: list[MealPlanDay] = []
+    meals: list[Meal] = []
     id: int | None = None
     shopping_list: int | None = None
 
+    def identity(self) -> t.Hashable:
+        return self.id
+
     def dict(self, *args, **kwargs) -> dict[str, t.Any]:  # type: ignore[override]
         data = super().dict(*args, **kwargs)
         data.pop("id")
         data.pop("shopping_list")
         data["end_date"] = data["end_date"].strftime(YEAR_MONTH_DAY)
         data["start_date"] = data["start_date"].strftime(YEAR_MONTH_DAY)
+        data["plan_days"] = [day.dict() for day in self.plan_days]
         return data
 
+    def all_meals(self) -> list[Meal]:
+        return [meal for day in self.plan_days for meal in day.meals] + self.meals
+
 
 class Ingredient(InteractiveModel):
     title: str
@@ -65,15 +88,65 @@ class ShoppingList(InteractiveModel):
     group: str
     items: list[Ingredient]
     id: int | None = None
+    _writer: ShoppingListWriter | None = None
+
+    def identity(self) -> t.Hashable:
+        return self.id
 
     def dict(self, *args, **kwargs) -> dict[str, t.Any]:  # type: ignore[override]
         data = super().dict(*args, **kwargs)
         data.pop("id")
         return data
 
+    def __getstate__(self) -> t.Dict[str, t.Any]:
+        state = super().__getstate__()
+        state["__private_attribute_values__"].pop("_writer", None)
+        return state
+
+    def __setstate__(self, state: t.Dict[str, t.Any]) -> None:
+        super().__setstate__(state)
+        self._writer = None
+
+    def write_behind(self, delay: float = 0.5) -> ShoppingListWriter:
+        """
+        Makes the item edits only apply locally and write the list once no edit was made
+        for :code:`delay` seconds, see :code:`ShoppingListWriter`.
+        """
+        if self.id is None:
+            raise ValueError("Missing required attribute id")
+        if self._writer is None:
+            self._writer = ShoppingListWriter(self, delay)
+        self._writer.delay = delay
+        return self._writer
+
+    async def flush(self) -> None:
+        """Writes the edits that are waiting to be written behind."""
+        if self._writer is not None:
+            await self._writer.flush()
+
+    async def _edited(self) -> "ShoppingList":
+        if self._writer is not None:
+            self._writer.touch()
+            return self
+        return await self.update()
+
     async def toggle_checked(self, index: int) -> "ShoppingList":
         self.items[index].checked = not self.items[index].checked
-        return await self.update()
+        return await self._edited()
+
+    async def update_item(self, index: int, **changes: t.Any) -> "ShoppingList":
+        item = self.items[index]
+        for name, value in changes.items():
+            setattr(item, name, value)
+        return await self._edited()
+
+    async def add_item(self, item: Ingredient) -> "ShoppingList":
+        self.items.append(item)
+        return await self._edited()
+
+    async def remove_item(self, index: int) -> "ShoppingList":
+        del self.items[index]
+        return await self._edited()
 
     def length(self) -> int:
         return len(self.items)
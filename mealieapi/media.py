@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import pathlib
+import tempfile
+import typing as t
+from collections import Counter, OrderedDict
+
+from mealieapi.jsonl import JSONLinesLog
+
+if t.TYPE_CHECKING:
+    from mealieapi.client import MealieClient
+    from mealieapi.recipes import Recipe
+
+_LOGGER = logging.getLogger(__name__)
+
+IMAGE_VARIANTS = ("original", "min-original", "tiny-original")
+# Smaller variants are fetched first so a page can render before full images arrive.
+VARIANT_PRIORITY = {"tiny-original": 0, "min-original": 1, "original": 2}
+
+
+class MediaCache:
+    """
+    A size bounded, content addressed on-disk cache for recipe images and assets.
+
+    Entries are keyed by recipe slug and variant and point at a blob named after
+    the sha256 of its content, so identical files are only stored once.
+    Each entry also remembers the version of the recipe it was downloaded for
+    (see :code:`Recipe.media_version`) so that changed images are fetched again.
+
+    The index is an append only log of JSON lines, a line per stored, used or dropped entry,
+    which is rewritten with only the current entries, least recently used first, once it has
+    grown enough.
+    """
+
+    INDEX_FILE = "index.jsonl"
+    # The log is compacted when it has this many times more lines than there are entries.
+    COMPACT_RATIO = 4
+
+    def __init__(
+        self, directory: str | os.PathLike, max_bytes: int = 256 * 1024 * 1024
+    ) -> None:
+        self.directory = pathlib.Path(directory)
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, dict[str, t.Any]] = OrderedDict()
+        self._refs: Counter[str] = Counter()
+        self._sizes: dict[str, int] = {}
+        (self.directory / "blobs").mkdir(parents=True, exist_ok=True)
+        self._log = JSONLinesLog(self.directory / self.INDEX_FILE)
+        self._load_index()
+
+    @staticmethod
+    def key(recipe_slug: str, variant: str) -> str:
+        return f"{recipe_slug}/{variant}"
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def _blob_path(self, digest: str) -> pathlib.Path:
+        return self.directory / "blobs" / digest[:2] / digest
+
+    def _load_index(self) -> None:
+        entries: OrderedDict[str, dict[str, t.Any]] = OrderedDict()
+        for key, entry in self._log.load():
+            # Stored and used entries move to the end, they were used most recently.
+            entries.pop(key, None)
+            if entry is not None:
+                entries[key] = entry
+        for key, entry in entries.items():
+            if self._blob_path(entry["digest"]).exists():
+                self._add_entry(key, entry)
+
+    def _record(self, key: str, entry: dict[str, t.Any] | None) -> None:
+        """Appends a stored or used entry, or None for a dropped one, to the index."""
+        self._log.append([key, entry], flush=False)
+        if self._log.lines > self.COMPACT_RATIO * max(len(self._entries), 16):
+            self._compact()
+
+    def _compact(self) -> None:
+        self._log.rewrite([key, entry] for key, entry in self._entries.items())
+
+    def flush(self) -> None:
+        """Writes the buffered changes of the index to disk."""
+        self._log.flush()
+
+    def close(self) -> None:
+        self._log.close()
+
+    def _add_entry(self, key: str, entry: dict[str, t.Any]) -> None:
+        self._entries[key] = entry
+        self._refs[entry["digest"]] += 1
+        self._sizes[entry["digest"]] = entry["size"]
+
+    def _remove_entry(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._record(key, None)
+        digest = entry["digest"]
+        self._refs[digest] -= 1
+        if self._refs[digest] <= 0:
+            del self._refs[digest]
+            del self._sizes[digest]
+            try:
+                self._blob_path(digest).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _lookup(self, key: str, version: str | None) -> dict[str, t.Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if version is not None and entry["version"] != version:
+            return None
+        if next(reversed(self._entries)) != key:
+            self._entries.move_to_end(key)
+            self._record(key, entry)
+        return entry
+
+    def open(
+        self, recipe_slug: str, variant: str, version: str | None = None
+    ) -> mmap.mmap | None:
+        """
+        Memory maps a cached file for serving without copying it into memory.
+        Returns :code:`None` on a miss, or if the cached entry is for another version.
+        The caller is responsible for closing the returned map.
+        """
+        entry = self._lookup(self.key(recipe_slug, variant), version)
+        if entry is None or entry["size"] == 0:
+            return None
+        with open(self._blob_path(entry["digest"]), "rb") as file:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(
+        self, recipe_slug: str, variant: str, version: str | None = None
+    ) -> bytes | None:
+        entry = self._lookup(self.key(recipe_slug, variant), version)
+        if entry is None:
+            return None
+        if entry["size"] == 0:
+            return b""
+        with open(self._blob_path(entry["digest"]), "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped[:]
+
+    def put(
+        self,
+        recipe_slug: str,
+        variant: str,
+        content: bytes,
+        version: str | None = None,
+    ) -> str:
+        """Stores the content for a recipe variant and returns its content hash."""
+        digest = hashlib.sha256(content).hexdigest()
+        key = self.key(recipe_slug, variant)
+        blob = self._blob_path(digest)
+        if key in self._entries:
+            self._remove_entry(key)
+        if digest not in self._refs:
+            blob.parent.mkdir(exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=blob.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+            os.replace(tmp_path, blob)
+        entry = {"digest": digest, "version": version, "size": len(content)}
+        self._add_entry(key, entry)
+        self._record(key, entry)
+        self._evict()
+        self.flush()
+        return digest
+
+    def invalidate(self, recipe_slug: str) -> None:
+        """Drops every cached image and asset of a recipe."""
+        prefix = self.key(recipe_slug, "")
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._remove_entry(key)
+        self.flush()
+
+    def clear(self) -> None:
+        for key in list(self._entries):
+            self._remove_entry(key)
+        self._compact()
+
+    def _evict(self) -> None:
+        while self._entries and self.total_bytes > self.max_bytes:
+            key = next(iter(self._entries))
+            _LOGGER.debug("Evicting %s from the media cache", key)
+            self._remove_entry(key)
+
+
+class ImagePrefetcher:
+    """
+    Downloads recipe images into the media cache of a client with a bounded pool of workers.
+    Queued images are fetched smallest variant first.
+    """
+
+    def __init__(self, client: "MealieClient", concurrency: int = 8) -> None:
+        if client.media_cache is None:
+            raise ValueError(
+                "Prefetching images requires the client to have a media_cache"
+            )
+        self._client = client
+        self.concurrency = concurrency
+        self.failed: list[tuple[str, str]] = []
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._queued: set[tuple[str, str]] = set()
+        self._pending: Counter[str] = Counter()
+        self._idle: dict[str, asyncio.Event] = {}
+        self._workers: list[asyncio.Task] = []
+        self._counter = 0
+
+    async def __aenter__(self) -> "ImagePrefetcher":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    def _event(self, variant: str) -> asyncio.Event:
+        if variant not in self._idle:
+            self._idle[variant] = asyncio.Event()
+            self._idle[variant].set()
+        return self._idle[variant]
+
+    def add(
+        self,
+        recipes: t.Iterable["Recipe"],
+        variants: t.Iterable[str] = ("tiny-original",),
+    ) -> int:
+        """Queues the images of the recipes, returns how many downloads were queued."""
+        variants = sorted(
+            variants, key=lambda variant: VARIANT_PRIORITY.get(variant, 3)
+        )
+        queued = 0
+        for recipe in recipes:
+            if recipe.image is None:
+                continue
+            for variant in variants:
+                if (recipe.slug, variant) in self._queued:
+                    continue
+                self._queued.add((recipe.slug, variant))
+                self._pending[variant] += 1
+                self._event(variant).clear()
+                self._counter += 1
+                self._queue.put_nowait(
+                    (VARIANT_PRIORITY.get(variant, 3), self._counter, recipe, variant)
+                )
+                queued += 1
+        while len(self._workers) < min(self.concurrency, self._queue.qsize()):
+            self._workers.append(asyncio.create_task(self._worker()))
+        return queued
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, recipe, variant = await self._queue.get()
+            try:
+                await self._client.get_image(
+                    recipe.slug, variant, version=recipe.media_version
+                )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Failed to prefetch %s of %r", variant, recipe)
+                self.failed.append((recipe.slug, variant))
+            finally:
+                self._queued.discard((recipe.slug, variant))
+                self._pending[variant] -= 1
+                if self._pending[variant] == 0:
+                    self._event(variant).set()
+                self._queue.task_done()
+
+    async def wait(self, variant: str | None = None) -> None:
+        """Waits until every queued image, or every queued image of one variant, is cached."""
+        if variant is None:
+            await self._queue.join()
+        else:
+            await self._event(variant).wait()
+
+    async def close(self) -> None:
+        """Cancels the workers, dropping any images that were not fetched yet."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
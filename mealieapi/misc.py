@@ -11,6 +11,12 @@ def camel_to_snake_case(obj):
             obj[new_key] = value
             if isinstance(value, dict):
                 obj[new_key] = camel_to_snake_case(value)
+            elif isinstance(value, list):
+                # Only the keys of nested objects are converted, not string values.
+                obj[new_key] = [
+                    camel_to_snake_case(item) if isinstance(item, dict) else item
+                    for item in value
+                ]
         return obj
     if isinstance(obj, list):
         return [camel_to_snake_case(item) for item in obj]
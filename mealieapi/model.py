@@ -1,24 +1,98 @@
+from __future__ import annotations
+
 import logging
 import typing as t
 
 from pydantic import BaseModel as BM
 from pydantic.error_wrappers import ValidationError
+from pydantic.version import VERSION as PYDANTIC_VERSION
+
+from mealieapi.errors import MealieError
 
 _LOGGER = logging.getLogger(__name__)
 
+# copy_on_model_validation is a bool before pydantic 1.10, which takes "none" instead.
+NO_COPY: t.Any = (
+    "none" if tuple(map(int, PYDANTIC_VERSION.split(".")[:2])) >= (1, 10) else False
+)
+
 if t.TYPE_CHECKING:
     from mealieapi.client import MealieClient
 
 
+class _DetachedClient:
+    """The client of detached models, using it raises."""
+
+    def __getattr__(self, name: str) -> t.Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        raise MealieError("model is detached, call attach(client)")
+
+    def __repr__(self) -> str:
+        return "<detached>"
+
+
+DETACHED: "MealieClient" = t.cast("MealieClient", _DetachedClient())
+
+
 class BaseModel(BM):
-    pass
+    class Config:
+        underscore_attrs_are_private = True
 
 
 class InteractiveModel(BaseModel):
-    def __init__(self, *args, _client: "MealieClient", **kwargs):
-        object.__setattr__(self, "_client", _client)
+    _client: "MealieClient"
+
+    class Config:
+        # Nested entities stay the instances they were built as, see IdentityMap.
+        copy_on_model_validation = NO_COPY
+
+    def __init__(self, _client: "MealieClient", *args, **kwargs):
         try:
             super().__init__(*args, **kwargs)
         except ValidationError as err:
             _LOGGER.debug("%r %r", args, kwargs)
             raise err
+        self._client = _client
+
+    def identity(self) -> t.Hashable:
+        """What identifies the entity on the server, :code:`None` if it has no identity yet."""
+        return None
+
+    def _nested(self) -> t.Iterator["InteractiveModel"]:
+        for value in self.__dict__.values():
+            if isinstance(value, dict):
+                value = list(value.values())
+            for item in value if isinstance(value, (list, tuple)) else (value,):
+                if isinstance(item, InteractiveModel):
+                    yield item
+
+    def detach(self) -> "InteractiveModel":
+        """Unlinks the model and the models it contains from their client, returns the model."""
+        self._client = DETACHED
+        for model in self._nested():
+            model.detach()
+        return self
+
+    def attach(self, client: "MealieClient") -> "InteractiveModel":
+        """Links the model and the models it contains to the client, returns the model."""
+        self._client = client
+        for model in self._nested():
+            model.attach(client)
+        return self
+
+    @property
+    def attached(self) -> bool:
+        return not isinstance(self._client, _DetachedClient)
+
+    def __getstate__(self) -> dict[str, t.Any]:
+        # The client holds sessions and callbacks, pickled models are detached.
+        state = super().__getstate__()
+        private = dict(state.get("__private_attribute_values__", {}))
+        private.pop("_client", None)
+        state["__private_attribute_values__"] = private
+        return state
+
+    def __setstate__(self, state: dict[str, t.Any]) -> None:
+        super().__setstate__(state)
+        self._client = DETACHED
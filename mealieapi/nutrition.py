@@ -0,0 +1,182 @@
+"""
+Nutrition totals of meal plans per day, per plan and per group, computed with NumPy
+(:code:`pip install mealieapi[numpy]`).
+
+    rollup = await NutritionRollup.load(client)
+    for summary in rollup.per_group():
+        print(summary.key, summary.daily_average["calories"])
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+from datetime import date
+
+from mealieapi.model import BaseModel
+
+np: t.Any
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if t.TYPE_CHECKING:
+    from mealieapi.client import MealieClient
+    from mealieapi.meals import Meal, MealPlan
+    from mealieapi.recipes import RecipeNutrition
+
+_LOGGER = logging.getLogger(__name__)
+
+NUTRIENTS = (
+    "calories",
+    "fat_content",
+    "protein_content",
+    "carbohydrate_content",
+    "fiber_content",
+    "sodium_content",
+    "sugar_content",
+)
+
+
+class NutritionSummary(BaseModel):
+    key: str
+    meals: int
+    days: int
+    totals: dict[str, float]
+    # How many meals didn't have a value for each nutrient, they count as 0 in the totals.
+    missing: dict[str, int]
+
+    @property
+    def daily_average(self) -> dict[str, float]:
+        days = max(self.days, 1)
+        return {nutrient: total / days for nutrient, total in self.totals.items()}
+
+
+class NutritionRollup:
+    """
+    Holds the nutrition of every recipe of the meal plans in a matrix with a row per recipe
+    and a column per nutrient, missing values are NaN. Each meal is a row index into it,
+    so aggregating is a few vectorized sums however many plans there are.
+    """
+
+    def __init__(
+        self,
+        mealplans: t.Sequence["MealPlan"],
+        nutrition: t.Mapping[str, "RecipeNutrition | None"],
+    ) -> None:
+        if np is None:
+            raise ImportError(
+                "NutritionRollup requires numpy, install it with pip install mealieapi[numpy]"
+            )
+        slugs = list(nutrition)
+        rows = {slug: row for row, slug in enumerate(slugs)}
+        self.matrix = np.full((len(slugs) + 1, len(NUTRIENTS)), np.nan)
+        for slug, values in nutrition.items():
+            if values is not None:
+                self.matrix[rows[slug]] = [
+                    np.nan if getattr(values, name) is None else getattr(values, name)
+                    for name in NUTRIENTS
+                ]
+        # The last row is all NaN, for meals without a known recipe.
+        unknown = len(slugs)
+        self.mealplans = list(mealplans)
+        self.groups = sorted({plan.group for plan in self.mealplans})
+        group_numbers = {group: number for number, group in enumerate(self.groups)}
+
+        recipes, days, plans, groups = [], [], [], []
+        for plan_number, plan in enumerate(self.mealplans):
+            meals: list[tuple[date | None, "Meal"]] = [
+                (day.date.date(), meal) for day in plan.plan_days for meal in day.meals
+            ]
+            meals += [(None, meal) for meal in plan.meals]
+            for day, meal in meals:
+                recipes.append(rows.get(meal.slug, unknown))
+                days.append(day.toordinal() if day is not None else -1)
+                plans.append(plan_number)
+                groups.append(group_numbers[plan.group])
+        self.meal_recipes = np.array(recipes, dtype=np.intp)
+        self.meal_days = np.array(days, dtype=np.int64)
+        self.meal_plans = np.array(plans, dtype=np.intp)
+        self.meal_groups = np.array(groups, dtype=np.intp)
+
+    @classmethod
+    async def load(
+        cls,
+        client: "MealieClient",
+        mealplans: t.Iterable["MealPlan"] | None = None,
+        concurrency: int = 16,
+    ) -> "NutritionRollup":
+        """Fetches the recipe of every meal once, concurrently, defaulting to all meal plans."""
+        if mealplans is None:
+            mealplans = await client.get_mealplans_all()
+        mealplans = list(mealplans)
+        slugs = list(
+            dict.fromkeys(meal.slug for plan in mealplans for meal in plan.all_meals())
+        )
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(slug: str) -> "RecipeNutrition | None":
+            async with semaphore:
+                try:
+                    return (await client.get_recipe(slug)).nutrition
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.warning("Failed to get %r", slug, exc_info=True)
+                    return None
+
+        values = await asyncio.gather(*(fetch(slug) for slug in slugs))
+        return cls(mealplans, dict(zip(slugs, values)))
+
+    def _summaries(
+        self, keys: np.ndarray, labels: list[str], selected: np.ndarray | None = None
+    ) -> list[NutritionSummary]:
+        """Sums the meals by key, :code:`keys` has a key for every selected meal."""
+        size = len(labels)
+        recipes, days = self.meal_recipes, self.meal_days
+        if selected is not None:
+            recipes, days = recipes[selected], days[selected]
+        values = self.matrix[recipes]
+        known = ~np.isnan(values)
+        values = np.where(known, values, 0.0)
+        totals = np.zeros((size, len(NUTRIENTS)))
+        missing = np.zeros((size, len(NUTRIENTS)), dtype=int)
+        for column in range(len(NUTRIENTS)):
+            totals[:, column] = np.bincount(
+                keys, weights=values[:, column], minlength=size
+            )
+            missing[:, column] = np.bincount(keys[~known[:, column]], minlength=size)
+        meals = np.bincount(keys, minlength=size)
+        # Count the distinct days of each key, meals without a day don't count.
+        dated = days >= 0
+        pairs = np.unique(np.stack([keys[dated], days[dated]], axis=1), axis=0)
+        day_counts = np.bincount(pairs[:, 0], minlength=size)
+        return [
+            NutritionSummary(
+                key=label,
+                meals=int(meals[number]),
+                days=int(day_counts[number]),
+                totals=dict(zip(NUTRIENTS, totals[number].tolist())),
+                missing=dict(zip(NUTRIENTS, missing[number].tolist())),
+            )
+            for number, label in enumerate(labels)
+        ]
+
+    def per_day(self, group: str | None = None) -> list[NutritionSummary]:
+        """The totals of every day across all plans, of one group or all of them, sorted by date."""
+        dated = self.meal_days >= 0
+        if group is not None:
+            dated &= self.meal_groups == self.groups.index(group)
+        ordinals, keys = np.unique(self.meal_days[dated], return_inverse=True)
+        labels = [date.fromordinal(int(ordinal)).isoformat() for ordinal in ordinals]
+        return self._summaries(keys.reshape(-1), labels, dated)
+
+    def per_plan(self) -> list[NutritionSummary]:
+        labels = [
+            str(plan.id) if plan.id is not None else plan.start_date.date().isoformat()
+            for plan in self.mealplans
+        ]
+        return self._summaries(self.meal_plans, labels)
+
+    def per_group(self) -> list[NutritionSummary]:
+        return self._summaries(self.meal_groups, self.groups)
@@ -1,61 +1,500 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
 import logging
+import os
 import posixpath
+import time
 import typing as t
+from json import dumps as json_dumps
+from json import loads as json_loads
 
-import aiohttp
-
+from mealieapi import lanes, timeouts
 from mealieapi.auth import Auth
+from mealieapi.compression import (
+    REJECTED_STATUSES,
+    TransferStatistics,
+    accept_encoding,
+    encode_json,
+    gzip_body,
+    wire_size,
+)
+from mealieapi.const import (
+    ACCEPT,
+    ACCEPT_ENCODING,
+    AUTHORIZATION,
+    CONTENT_ENCODING,
+    CONTENT_RANGE,
+    CONTENT_TYPE,
+    ETAG,
+    IF_RANGE,
+    LAST_MODIFIED,
+    RANGE,
+    USER_AGENT,
+)
 from mealieapi.errors import (
     BadRequestError,
+    DeadlineExceeded,
     InternalServerError,
     MealieError,
     ParameterMissingError,
     UnauthenticatedError,
 )
+from mealieapi.hedging import IDEMPOTENT_METHODS, HedgePolicy
+from mealieapi.limits import RateLimiter
 from mealieapi.misc import camel_to_snake_case
+from mealieapi.stream import JSONArrayParser
+
+if t.TYPE_CHECKING:
+    import aiohttp
 
 _LOGGER = logging.getLogger(__name__)
 
+# The status of a response to a Range request that starts past the end of the resource.
+RANGE_NOT_SATISFIABLE = 416
+# Where the version of a downloaded file is kept, so a later run can resume it safely.
+PART_META_SUFFIX = ".part-meta"
+# Seconds before resuming an interrupted download, doubling with every retry.
+RETRY_DELAY = 0.5
+MAX_RETRY_DELAY = 8.0
+
 
 class _RawClient:
     auth: Auth | None = None
     response_processors: dict[str, t.Callable] = {}
+    # Shared with other clients by a MealieCluster to pool connections and limit concurrency.
+    session: aiohttp.ClientSession | None = None
+    semaphore: asyncio.Semaphore | None = None
+    rate_limiter: RateLimiter | None = None
+    # Shares the request slots of the client between priority lanes, see LaneScheduler.
+    scheduler: lanes.LaneScheduler | None = None
+    # Resends slow GET requests to race the original, see HedgePolicy.
+    hedge_policy: HedgePolicy | None = None
+    # Request bodies of at least this many bytes are gzipped, None to never compress them.
+    compress_threshold: int | None = None
+    # Seconds a call may take in total, and to connect and between reads, None for aiohttp's defaults.
+    timeout: float | None = None
+    connect_timeout: float | None = None
+    read_timeout: float | None = None
 
-    def __init__(self, url: str) -> None:
+    def __init__(self, url: str, session: aiohttp.ClientSession | None = None) -> None:
         self.url = url
+        self.session = session
+        self.compress_requests = True
+        self.transfer_statistics = TransferStatistics()
 
     def endpoint(self, path: str) -> str:
         return posixpath.join(self.url, "api", path)
 
     def _headers(self) -> dict[str, str]:
         return {
-            aiohttp.hdrs.ACCEPT: "application/json",
-            aiohttp.hdrs.USER_AGENT: "MealieAPI-Python 0.0.0",
+            ACCEPT: "application/json",
+            ACCEPT_ENCODING: accept_encoding(),
+            USER_AGENT: "MealieAPI-Python 0.0.0",
         }
 
+    def deadline(self, timeout: float | None = None) -> t.ContextManager[float | None]:
+        """
+        Makes every request in the block share one budget of :code:`timeout` seconds,
+        defaulting to the :code:`timeout` of the client.
+        """
+        return timeouts.deadline(self.timeout if timeout is None else timeout)
+
+    def lane(self, name: str) -> t.ContextManager[str]:
+        """Sends every request in the block in the priority lane, see :code:`LaneScheduler`."""
+        return lanes.lane(name)
+
+    def _client_timeout(self, expires: float | None) -> aiohttp.ClientTimeout | None:
+        import aiohttp  # pylint: disable=import-outside-toplevel
+
+        total = timeouts.remaining(expires)
+        if total is None and self.connect_timeout is None and self.read_timeout is None:
+            return None
+        return aiohttp.ClientTimeout(
+            total=total, connect=self.connect_timeout, sock_read=self.read_timeout
+        )
+
+    @contextlib.asynccontextmanager
+    async def _slot(
+        self, expires: float | None = None, lane: str | None = None
+    ) -> t.AsyncIterator[None]:
+        if self.rate_limiter is not None:
+            await timeouts.wait(self.rate_limiter.acquire(), expires)
+        async with contextlib.AsyncExitStack() as stack:
+            if self.scheduler is not None:
+                lane = lane or lanes.current_lane()
+                await timeouts.wait(self.scheduler.acquire(lane), expires)
+                stack.callback(self.scheduler.release, lane)
+            if self.semaphore is not None:
+                await timeouts.wait(self.semaphore.acquire(), expires)
+                stack.callback(self.semaphore.release)
+            yield
+
+    @contextlib.asynccontextmanager
+    async def _open(
+        self,
+        path: str,
+        method: str = "GET",
+        use_auth: bool = True,
+        headers: dict[str, str] | None = None,
+        timeout: float | None = None,
+        lane: str | None = None,
+        **kwargs,
+    ) -> t.AsyncIterator[aiohttp.ClientResponse]:
+        import aiohttp  # pylint: disable=import-outside-toplevel
+
+        headers = {**self._headers(), **(headers or {})}
+        if use_auth is False and self.auth is not None:
+            del headers[AUTHORIZATION]
+        expires = timeouts.expiry(self.timeout if timeout is None else timeout)
+        try:
+            async with self._slot(expires, lane):
+                if (client_timeout := self._client_timeout(expires)) is not None:
+                    kwargs["timeout"] = client_timeout
+                if self.session is not None:
+                    async with self.session.request(
+                        method=method,
+                        url=self.endpoint(path),
+                        headers=headers,
+                        **kwargs,
+                    ) as response:
+                        yield response
+                else:
+                    async with aiohttp.ClientSession(headers=headers) as session:
+                        async with session.request(
+                            method=method, url=self.endpoint(path), **kwargs
+                        ) as response:
+                            yield response
+        except DeadlineExceeded:
+            raise
+        except asyncio.TimeoutError as err:
+            if expires is not None and time.monotonic() >= expires:
+                raise DeadlineExceeded(
+                    "The deadline passed before the request finished"
+                ) from err
+            raise
+
     async def request(
         self,
         path: str,
         method: str = "GET",
-        data: str | None = None,
+        data: t.Any = None,
         json: dict[str, t.Any] | None = None,
         params: dict[str, t.Any] | None = None,
         use_auth: bool = True,
+        timeout: float | None = None,
+        lane: str | None = None,
+        decode: bool = True,
         **kwargs,
     ) -> t.Any:
-        headers = self._headers()
-        if use_auth is False and self.auth is not None:
-            del headers[aiohttp.hdrs.AUTHORIZATION]
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.request(
+        """
+        Sends a request to the Mealie API and returns the processed response,
+        or the body of a successful response as is if not :code:`decode`.
+        JSON bodies of at least :code:`compress_threshold` bytes are sent gzipped,
+        if the server rejects a compressed body it is resent as is, and compression is turned off
+        once the uncompressed body is accepted.
+        """
+        with self.deadline(timeout), lanes.lane(lane):
+            return await self._request(
+                path, method, data, json, params, use_auth, decode, **kwargs
+            )
+
+    async def _request(
+        self,
+        path: str,
+        method: str,
+        data: t.Any,
+        json: dict[str, t.Any] | None,
+        params: dict[str, t.Any] | None,
+        use_auth: bool,
+        decode: bool,
+        **kwargs,
+    ) -> t.Any:
+        headers: dict[str, str] = {}
+        body: t.Any = data
+        if json is not None and data is None:
+            body = encode_json(json)
+            headers[CONTENT_TYPE] = "application/json"
+        compressed = None
+        if isinstance(body, bytes) and self.compress_requests:
+            compressed = gzip_body(body, self.compress_threshold)
+        if compressed is not None:
+            async with self._open(
+                path,
                 method=method,
-                url=self.endpoint(path),
-                data=data,
-                json=json,
+                use_auth=use_auth,
+                headers={**headers, CONTENT_ENCODING: "gzip"},
+                data=compressed,
                 params=params,
                 **kwargs,
             ) as response:
-                return await self.process_response(response)
+                if response.status not in REJECTED_STATUSES:
+                    self.transfer_statistics.record_sent(len(body), len(compressed))
+                    return await self._process(response, decode)
+        send = functools.partial(
+            self._send, path, method, use_auth, headers, body, params, decode, **kwargs
+        )
+        if method in IDEMPOTENT_METHODS and self.hedge_policy is not None:
+            result = await self.hedge_policy.run(send)
+        else:
+            result = await send()
+        if compressed is not None:
+            _LOGGER.warning(
+                "%s rejected a gzipped request body, no longer compressing requests",
+                self.url,
+            )
+            self.compress_requests = False
+        return result
+
+    async def _send(
+        self,
+        path: str,
+        method: str,
+        use_auth: bool,
+        headers: dict[str, str],
+        body: t.Any,
+        params: dict[str, t.Any] | None,
+        decode: bool,
+        **kwargs,
+    ) -> t.Any:
+        async with self._open(
+            path,
+            method=method,
+            use_auth=use_auth,
+            headers=headers,
+            data=body,
+            params=params,
+            **kwargs,
+        ) as response:
+            size = len(body) if isinstance(body, (bytes, str)) else 0
+            self.transfer_statistics.record_sent(size, size)
+            return await self._process(response, decode)
+
+    async def _process(
+        self, response: aiohttp.ClientResponse, decode: bool = True
+    ) -> t.Any:
+        content = await response.read()
+        self.transfer_statistics.record_received(
+            len(content), wire_size(response, len(content))
+        )
+        if not decode and 200 <= response.status < 300:
+            return content
+        return await self.process_response(response)
+
+    async def download(
+        self,
+        path: str,
+        destination: str | os.PathLike,
+        params: dict[str, t.Any] | None = None,
+        use_auth: bool = True,
+        chunk_size: int = 64 * 1024,
+        timeout: float | None = None,
+        lane: str | None = None,
+        resume: bool = False,
+        retries: int = 0,
+    ) -> int:
+        """
+        Streams a response body to a file instead of reading it into memory, returns its size.
+        With :code:`resume` an existing file is continued with a Range request instead of being
+        downloaded again. A connection dropped mid-download is resumed up to :code:`retries` times,
+        waiting longer before every retry.
+
+        While a resumable download is incomplete, the ETag or Last-Modified of the file is kept
+        next to it in :code:`<destination>.part-meta` and sent with the Range request, so a file
+        that changed on the server is downloaded again instead of being continued. A file
+        without it is downloaded from the start. The destination isn't touched by a response
+        with an error status.
+        """
+        import aiohttp  # pylint: disable=import-outside-toplevel
+
+        meta_path = os.fspath(destination) + PART_META_SUFFIX
+        version: dict[str, t.Any] = {}
+        if resume and os.path.exists(destination) and os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as file:
+                version = json_loads(file.read() or "{}")
+        attempts = 0
+        with self.deadline(timeout):
+            while True:
+                try:
+                    size = await self._download_rest(
+                        path,
+                        destination,
+                        params,
+                        use_auth,
+                        chunk_size,
+                        lane,
+                        version,
+                        meta_path if resume else None,
+                    )
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(meta_path)
+                    return size
+                except (aiohttp.ClientPayloadError, aiohttp.ClientConnectionError):
+                    attempts += 1
+                    if attempts > retries:
+                        raise
+                    delay = min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+                    _LOGGER.warning(
+                        "Download of %s was interrupted, resuming in %.1fs", path, delay
+                    )
+                    await asyncio.sleep(delay)
+
+    async def _download_rest(
+        self,
+        path: str,
+        destination: str | os.PathLike,
+        params: dict[str, t.Any] | None,
+        use_auth: bool,
+        chunk_size: int,
+        lane: str | None,
+        version: dict[str, t.Any],
+        meta_path: str | None,
+    ) -> int:
+        """
+        Appends what the file is missing, :code:`version` has the validator and the length
+        of the first full response, it is written to :code:`meta_path` too if given.
+        """
+        validator, length = version.get("validator"), version.get("length")
+        start = 0
+        if (validator is not None or length is not None) and os.path.exists(
+            destination
+        ):
+            start = os.path.getsize(destination)
+        # Otherwise nothing tells whether the file is still the same, so it is downloaded again.
+        # Ranges are of the body as sent, so it mustn't be compressed.
+        headers = {ACCEPT_ENCODING: "identity"}
+        if start:
+            headers[RANGE] = f"bytes={start}-"
+            if validator is not None:
+                # Only continue the file if it is still the same version, otherwise get all of it.
+                headers[IF_RANGE] = validator
+        async with self._open(
+            path, use_auth=use_auth, headers=headers, params=params, lane=lane
+        ) as response:
+            first, total = content_range(response.headers.get(CONTENT_RANGE))
+            ranged = response.status == 206
+            # Without a validator a different length is all that shows the file changed.
+            changed = validator is None and total != length
+            unsatisfiable = response.status == RANGE_NOT_SATISFIABLE
+            if unsatisfiable and total == start and not changed:
+                return start
+            if unsatisfiable or (ranged and changed):
+                # The file changed, download it again.
+                version.clear()
+                return await self._download_rest(
+                    path,
+                    destination,
+                    params,
+                    use_auth,
+                    chunk_size,
+                    lane,
+                    version,
+                    meta_path,
+                )
+            if not 200 <= response.status < 300:
+                await self.process_response(response)
+            if ranged and first != start:
+                raise MealieError(f"Got an unexpected range of {path}")
+            if not ranged:
+                version.clear()
+                etag = response.headers.get(ETAG)
+                version.update(
+                    validator=etag or response.headers.get(LAST_MODIFIED),
+                    length=response.content_length,
+                )
+                if meta_path is not None:
+                    with open(meta_path, "w", encoding="utf-8") as file:
+                        file.write(json_dumps(version))
+            size = 0
+            with open(destination, "ab" if ranged else "wb") as file:
+                try:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        file.write(chunk)
+                        size += len(chunk)
+                finally:
+                    self.transfer_statistics.record_received(
+                        size, wire_size(response, size)
+                    )
+            return (start if ranged else 0) + size
+
+    async def read_range(
+        self,
+        path: str,
+        start: int,
+        params: dict[str, t.Any] | None = None,
+        use_auth: bool = True,
+        timeout: float | None = None,
+        lane: str | None = None,
+    ) -> tuple[int, bytes]:
+        """
+        Reads a response body from byte :code:`start` on with a Range request, returns
+        the offset the bytes start at, 0 when the resource became shorter than :code:`start`,
+        and the bytes. Works with servers that ignore ranges too, only less efficiently.
+        """
+        headers = {ACCEPT_ENCODING: "identity"}
+        if start:
+            headers[RANGE] = f"bytes={start}-"
+        async with self._open(
+            path,
+            use_auth=use_auth,
+            headers=headers,
+            params=params,
+            timeout=timeout,
+            lane=lane,
+        ) as response:
+            if response.status == RANGE_NOT_SATISFIABLE:
+                _, total = content_range(response.headers.get(CONTENT_RANGE))
+                if total is not None and total < start:
+                    return await self.read_range(
+                        path, 0, params, use_auth, timeout, lane
+                    )
+                return start, b""
+            if not 200 <= response.status < 300:
+                await self.process_response(response)
+            content = await response.read()
+            self.transfer_statistics.record_received(
+                len(content), wire_size(response, len(content))
+            )
+        if response.status == 206:
+            return start, content
+        # The server sent the whole body.
+        if len(content) < start:
+            return 0, content
+        return start, content[start:]
+
+    async def stream_json(
+        self,
+        path: str,
+        params: dict[str, t.Any] | None = None,
+        use_auth: bool = True,
+        timeout: float | None = None,
+        lane: str | None = None,
+    ) -> t.AsyncIterator[t.Any]:
+        """
+        Yields the elements of a JSON array response as they arrive,
+        instead of waiting for and decoding the whole body at once.
+        """
+        async with self._open(
+            path, use_auth=use_auth, params=params, timeout=timeout, lane=lane
+        ) as response:
+            if not 200 <= response.status < 300:
+                await self.process_response(response)
+            if response.content_type != "application/json":
+                raise MealieError(f"Expected JSON but got {response.content_type}")
+            parser = JSONArrayParser()
+            size = 0
+            try:
+                async for chunk in response.content.iter_any():
+                    size += len(chunk)
+                    for item in parser.feed(chunk):
+                        yield camel_to_snake_case(item)
+                for item in parser.close():
+                    yield camel_to_snake_case(item)
+            except ValueError as err:
+                raise MealieError(f"Invalid JSON array from Mealie: {err}") from err
+            self.transfer_statistics.record_received(size, wire_size(response, size))
 
     @staticmethod
     def response_processor(mimetype: str) -> t.Callable:
@@ -77,10 +516,11 @@ class _RawClient:
             async def default_handler(response: aiohttp.ClientResponse) -> bytes:
                 return await response.read()
 
-            content_type = response.headers.get(aiohttp.hdrs.CONTENT_TYPE)
-            if content_type is None:
+            if CONTENT_TYPE not in response.headers:
                 raise MealieError("Mealie did not return a content-type header.")
-            processor = self.response_processors.get(content_type, default_handler)
+            processor = self.response_processors.get(
+                response.content_type, default_handler
+            )
             return await processor(response)
         if 400 <= response.status < 500:
             await self.handle_error_json(await response.json())
@@ -88,7 +528,7 @@ class _RawClient:
             raise InternalServerError("Mealie had a problem with your request.")
 
     async def handle_error_json(self, data: dict) -> None:
-        if detail := data.get("detail", "Bad Request") == "Not authenticated":
+        if (detail := data.get("detail", "Bad Request")) == "Not authenticated":
             raise UnauthenticatedError("Not authenticated with Mealie")
         if detail == "Bad Request":
             raise BadRequestError("Error with your request.")
@@ -102,6 +542,27 @@ class _RawClient:
                     raise ParameterMissingError(
                         f"Missing the parameters {params!r}, {msg}"
                     )
+        raise BadRequestError(f"Error with your request: {detail!r}")
+
+
+def content_range(value: str | None) -> tuple[int | None, int | None]:
+    """The first byte and the total size of a Content-Range header, None where unknown."""
+    unit, _, ranges = (value or "").partition(" ")
+    if unit != "bytes":
+        return None, None
+    span, _, total = ranges.partition("/")
+    first = span.partition("-")[0]
+    return (
+        int(first) if first.isdigit() else None,
+        int(total) if total.isdigit() else None,
+    )
+
+
+def decode_json(body: bytes) -> t.Any:
+    data = json_loads(body)
+    if isinstance(data, (dict, list)):
+        data = camel_to_snake_case(data)
+    return data
 
 
 @_RawClient.response_processor("application/json")
@@ -142,4 +603,4 @@ class RawClient(_RawClient):
 
     def authorize(self, token: str) -> None:
         """Makes the Client authorize with an API token."""
-        self.auth = Auth(_client=self, token=token)  # type: ignore[arg-type]
+        self.auth = Auth(_client=self, access_token=token)  # type: ignore[arg-type]
@@ -1,3 +1,4 @@
+import functools
 import typing as t
 from datetime import date, datetime
 from zipfile import ZipFile
@@ -5,12 +6,20 @@ from zipfile import ZipFile
 import slugify
 
 from mealieapi.const import YEAR_MONTH_DAY, YEAR_MONTH_DAY_HOUR_MINUTE_SECOND
+from mealieapi.identity import merge_model
 from mealieapi.model import BaseModel, InteractiveModel
 
 if t.TYPE_CHECKING:
+    from mealieapi.client import MealieClient
     from mealieapi.users import User
 
 
+@functools.lru_cache(maxsize=4096)
+def to_slug(name: str) -> str:
+    """The slug Mealie makes of a name, of a recipe, tag or category."""
+    return slugify.slugify(name)
+
+
 class RecipeImage(InteractiveModel):
     recipe_slug: str
     image: int
@@ -27,13 +36,14 @@ class RecipeAsset(InteractiveModel):
 
 
 class RecipeNutrition(BaseModel):
+    # Snake case like the other fields, the client converts Mealie's camelCase keys.
     calories: float | None = None
-    fatContent: float | None = None
-    proteinContent: float | None = None
-    carbohydrateContent: float | None = None
-    fiberContent: float | None = None
-    sodiumContent: float | None = None
-    sugarContent: float | None = None
+    fat_content: float | None = None
+    protein_content: float | None = None
+    carbohydrate_content: float | None = None
+    fiber_content: float | None = None
+    sodium_content: float | None = None
+    sugar_content: float | None = None
 
 
 class RecipeComment(InteractiveModel):
@@ -85,10 +95,28 @@ class Recipe(InteractiveModel):
     tools: list | None = None
     assets: list[RecipeAsset] | None = None
     comments: list[RecipeComment] | None = None
+    _slug: str | None = None
+
+    def __init__(
+        self, _client: "MealieClient", *args, slug: str | None = None, **kwargs
+    ):
+        super().__init__(_client, *args, **kwargs)
+        self._slug = slug
 
     @property
     def slug(self) -> str:
-        return slugify.slugify(self.name)
+        """The slug Mealie gave the recipe, or one derived from its name for new recipes."""
+        if self._slug is not None:
+            return self._slug
+        return to_slug(self.name)
+
+    def identity(self) -> t.Hashable:
+        return self.slug
+
+    @property
+    def media_version(self) -> str:
+        """Changes whenever the image of the recipe may have changed."""
+        return f"{self.image}@{self.date_updated}"
 
     def dict(self, *args, **kwargs) -> dict[str, t.Any]:  # type: ignore[override]
         data = super().dict(*args, **kwargs)
@@ -108,7 +136,9 @@ class Recipe(InteractiveModel):
         return await self._client.delete_recipe(self.slug)
 
     async def get_asset(self, file_name: str):
-        return await self._client.get_asset(self.slug, file_name)
+        return await self._client.get_asset(
+            self.slug, file_name, version=self.media_version
+        )
 
     async def get_image(self, _type="original") -> bytes | None:
         """
@@ -116,7 +146,9 @@ class Recipe(InteractiveModel):
         Valid types are :code:`original`, :code:`min-original`, and :code:`tiny-original`
         """
         if self.image is not None:
-            return await self._client.get_image(self.slug, _type)
+            return await self._client.get_image(
+                self.slug, _type, version=self.media_version
+            )
         return None
 
     async def push_changes(self) -> "Recipe":
@@ -127,9 +159,8 @@ class Recipe(InteractiveModel):
 
     async def refresh(self) -> None:
         recipe = await self._client.get_recipe(self.slug)
-        for attr in dir(recipe):
-            if not attr.startswith("_"):
-                setattr(self, attr, getattr(recipe, attr))
+        if recipe is not self:
+            merge_model(self, recipe)
 
     def __repr__(self):
         return f"<Recipe {self.slug!r}>"
@@ -140,6 +171,9 @@ class RecipeTag(InteractiveModel):
     name: str
     recipes: list[Recipe] | None = None
 
+    def identity(self) -> t.Hashable:
+        return self.id
+
     @property
     def slug(self) -> str:
         return slugify.slugify(self.name)
@@ -161,6 +195,9 @@ class RecipeCategory(InteractiveModel):
     name: str
     recipes: list[Recipe] | None = None
 
+    def identity(self) -> t.Hashable:
+        return self.id
+
     @property
     def slug(self):
         return slugify.slugify(self.name)
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+import typing as t
+from fractions import Fraction
+
+from mealieapi.meals import Ingredient, ShoppingList
+from mealieapi.model import BaseModel
+
+if t.TYPE_CHECKING:
+    from mealieapi.client import MealieClient
+    from mealieapi.meals import Meal, MealPlan
+    from mealieapi.recipes import Recipe
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maps unit spellings to a base unit and the size of the unit in that base unit.
+VOLUME_UNITS = {
+    ("ml", "milliliter", "millilitre"): 1.0,
+    ("cl", "centiliter", "centilitre"): 10.0,
+    ("dl", "deciliter", "decilitre"): 100.0,
+    ("l", "liter", "litre"): 1000.0,
+    ("tsp", "teaspoon", "t"): 4.92892,
+    ("tbsp", "tablespoon", "tbs", "tbl", "T"): 14.7868,
+    ("fl oz", "fluid ounce"): 29.5735,
+    ("cup", "c"): 236.588,
+    ("pint", "pt"): 473.176,
+    ("quart", "qt"): 946.353,
+    ("gallon", "gal"): 3785.41,
+}
+MASS_UNITS = {
+    ("mg", "milligram"): 0.001,
+    ("g", "gram", "gr"): 1.0,
+    ("kg", "kilogram"): 1000.0,
+    ("oz", "ounce"): 28.3495,
+    ("lb", "pound", "lbs"): 453.592,
+}
+COUNT_UNITS = (
+    "bunch",
+    "can",
+    "clove",
+    "dash",
+    "head",
+    "jar",
+    "package",
+    "pinch",
+    "pkg",
+    "slice",
+    "sprig",
+    "stalk",
+    "stick",
+)
+
+UNITS: dict[str, tuple[str, float]] = {}
+for _units, _base in ((VOLUME_UNITS, "ml"), (MASS_UNITS, "g")):
+    for _names, _factor in _units.items():
+        for _name in _names:
+            UNITS[_name] = (_base, _factor)
+for _name in COUNT_UNITS:
+    UNITS[_name] = (_name, 1.0)
+
+UNICODE_FRACTIONS = {
+    "¼": "1/4",
+    "½": "1/2",
+    "¾": "3/4",
+    "⅓": "1/3",
+    "⅔": "2/3",
+    "⅛": "1/8",
+    "⅜": "3/8",
+    "⅝": "5/8",
+    "⅞": "7/8",
+}
+
+_NUMBER = r"\d+\s+\d+/\d+|\d+/\d+|\d+(?:[.,]\d+)?"
+_QUANTITY = re.compile(rf"^\s*({_NUMBER})(?:\s*(?:-|to)\s*({_NUMBER}))?\s*")
+_UNIT_NAMES = "|".join(re.escape(name) for name in sorted(UNITS, key=len, reverse=True))
+_UNIT = re.compile(rf"^({_UNIT_NAMES})(?:e?s)?\.?(?=\s|$)\s*")
+_NOTES = re.compile(r"\([^)]*\)|,.*$")
+
+
+class ParsedIngredient(BaseModel):
+    text: str
+    item: str
+    quantity: float | None = None
+    unit: str | None = None
+
+
+def _singular(item: str) -> str:
+    head, _, word = item.rpartition(" ")
+    if len(word) > 3 and word.endswith("ies"):
+        word = word[:-3] + "y"
+    elif len(word) > 3 and word.endswith("oes"):
+        word = word[:-2]
+    elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return f"{head} {word}" if head else word
+
+
+def _parse_number(text: str) -> float:
+    return float(sum(Fraction(part.replace(",", ".")) for part in text.split()))
+
+
+def parse_ingredient(text: str) -> ParsedIngredient:
+    """
+    Splits a recipe ingredient line like :code:`1 1/2 cups flour, sifted`
+    into its quantity, unit and item. Quantities are converted to the base unit
+    (ml for volumes and g for weights) so that they can be added up.
+    """
+    rest = text
+    for char, fraction in UNICODE_FRACTIONS.items():
+        rest = rest.replace(char, f" {fraction}")
+    quantity = unit = None
+    if match := _QUANTITY.match(rest):
+        quantity = _parse_number(match.group(2) or match.group(1))
+        end = match.end()
+        rest = rest[end:]
+    if match := _UNIT.match(rest) or _UNIT.match(rest.lower()):
+        unit, factor = UNITS[match.group(1)]
+        quantity = None if quantity is None else quantity * factor
+        end = match.end()
+        rest = rest[end:]
+        if rest.lower().startswith("of "):
+            rest = rest[3:]
+    item = _singular(" ".join(_NOTES.sub("", rest).split()).lower())
+    return ParsedIngredient(
+        text=text, item=item or text.strip().lower(), quantity=quantity, unit=unit
+    )
+
+
+def _format_amount(quantity: float, unit: str | None) -> str:
+    if unit == "ml" and quantity >= 1000:
+        quantity, unit = quantity / 1000, "l"
+    elif unit == "g" and quantity >= 1000:
+        quantity, unit = quantity / 1000, "kg"
+    amount = f"{round(quantity, 2):g}"
+    return amount if unit is None else f"{amount} {unit}"
+
+
+def merge_ingredients(
+    client: "MealieClient", ingredients: t.Iterable[ParsedIngredient]
+) -> list[Ingredient]:
+    """Adds up ingredients with the same item and unit into shopping list items."""
+    totals: dict[tuple[str, str | None], float | None] = {}
+    for ingredient in ingredients:
+        key = (ingredient.item, ingredient.unit)
+        if key not in totals:
+            totals[key] = ingredient.quantity
+        elif ingredient.quantity is not None:
+            totals[key] = (totals[key] or 0) + ingredient.quantity
+    items = []
+    for (item, unit), quantity in totals.items():
+        if quantity is None:
+            items.append(
+                Ingredient(client, title=item, text=item, quantity=1, checked=False)
+            )
+        elif unit is None:
+            items.append(
+                Ingredient(
+                    client,
+                    title=item,
+                    text=f"{_format_amount(quantity, None)} {item}",
+                    quantity=math.ceil(quantity),
+                    checked=False,
+                )
+            )
+        else:
+            items.append(
+                Ingredient(
+                    client,
+                    title=item,
+                    text=f"{_format_amount(quantity, unit)} {item}",
+                    quantity=1,
+                    checked=False,
+                )
+            )
+    return items
+
+
+class ShoppingListBuilder:
+    """
+    Builds a shopping list from meal plans.
+    Recipes are fetched concurrently and cached, so a builder can be reused across many plans.
+    """
+
+    def __init__(self, client: "MealieClient", concurrency: int = 16) -> None:
+        self._client = client
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._recipes: dict[str, asyncio.Task] = {}
+        self.missing: set[str] = set()
+
+    async def _fetch(self, slug: str) -> "Recipe | None":
+        async with self._semaphore:
+            try:
+                return await self._client.get_recipe(slug)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.warning("Could not get the recipe %r", slug, exc_info=True)
+                self.missing.add(slug)
+                return None
+
+    def get_recipe(self, meal: "Meal") -> asyncio.Task:
+        if meal.slug not in self._recipes:
+            self._recipes[meal.slug] = asyncio.create_task(self._fetch(meal.slug))
+        return self._recipes[meal.slug]
+
+    async def ingredients(
+        self, mealplans: t.Iterable["MealPlan"]
+    ) -> list[ParsedIngredient]:
+        meals = [meal for mealplan in mealplans for meal in mealplan.all_meals()]
+        recipes = await asyncio.gather(*(self.get_recipe(meal) for meal in meals))
+        return [
+            parse_ingredient(line)
+            for recipe in recipes
+            if recipe is not None
+            for line in recipe.recipe_ingredient or []
+            if line.strip()
+        ]
+
+    async def build(
+        self, mealplans: t.Iterable["MealPlan"], name: str, group: str | None = None
+    ) -> ShoppingList:
+        mealplans = list(mealplans)
+        if group is None:
+            if not mealplans:
+                raise ValueError(
+                    "A group is required to build a shopping list without meal plans"
+                )
+            group = mealplans[0].group
+        items = merge_ingredients(self._client, await self.ingredients(mealplans))
+        return ShoppingList(self._client, name=name, group=group, items=items)
@@ -0,0 +1,85 @@
+"""
+Everything about the current user's group, loaded with concurrent requests into one
+linked object graph, so that a recipe or user appearing in several places is one instance.
+
+    snapshot = await client.get_group_snapshot()
+    for user in snapshot.users:
+        print(user.username, [recipe.name for recipe in user.favorite_recipes or []])
+"""
+
+from __future__ import annotations
+
+import asyncio
+import typing as t
+
+from mealieapi.identity import IdentityMap
+from mealieapi.meals import MealPlan, ShoppingList
+from mealieapi.model import BaseModel
+from mealieapi.recipes import Recipe
+from mealieapi.users import Group, User
+
+if t.TYPE_CHECKING:
+    from mealieapi.client import MealieClient
+
+
+class GroupSnapshot(BaseModel):
+    group: Group
+    users: list[User]
+    mealplans: list[MealPlan]
+    shopping_lists: list[ShoppingList]
+
+    @property
+    def recipes(self) -> dict[str, Recipe]:
+        """Every recipe in the snapshot by slug."""
+        recipes: dict[str, Recipe] = {}
+        for user in self.users:
+            for recipe in user.favorite_recipes or []:
+                recipes.setdefault(recipe.slug, recipe)
+        return recipes
+
+    def user(self, user_id: str) -> User | None:
+        return next((user for user in self.users if user.id == user_id), None)
+
+
+async def load_group_snapshot(
+    client: "MealieClient", favorites: bool = True, shopping_lists: bool = True
+) -> GroupSnapshot:
+    """
+    Requests the group, which embeds its users, and the meal plans at once, then the favorites
+    of the group's users and its shopping lists at once, as those need the ids from the first
+    round. Listing all users is for admins only, so the users come from the group.
+    """
+    group_data, all_mealplans = await asyncio.gather(
+        client.request("groups/self"),
+        client.get_mealplans_all(),
+    )
+    list_ids = [item["id"] for item in group_data.get("shopping_lists") or []]
+    # The embedded meal plans and shopping lists are replaced by the fully loaded ones.
+    group_data.update(mealplans=None, shopping_lists=None)
+    group = client.process_group_json(group_data)
+    users = list(group.users or [])
+
+    user_favorites, lists = await asyncio.gather(
+        asyncio.gather(
+            *(client.get_favorites(user.id) for user in users if favorites)  # type: ignore[arg-type]
+        ),
+        asyncio.gather(
+            *(client.get_shopping_list(id) for id in list_ids if shopping_lists)
+        ),
+    )
+    for user, recipes in zip(users, user_favorites):
+        user.favorite_recipes = recipes
+
+    group.users = users
+    group.mealplans = [plan for plan in all_mealplans if plan.group == group.name]
+    group.shopping_lists = list(lists)
+    identity_map = (
+        client.identity_map if client.identity_map is not None else IdentityMap()
+    )
+    group = identity_map.link(group)
+    return GroupSnapshot(
+        group=group,
+        users=group.users or [],
+        mealplans=group.mealplans or [],
+        shopping_lists=group.shopping_lists or [],
+    )
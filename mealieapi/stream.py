@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import codecs
+import json
+import typing as t
+
+_WHITESPACE = " \t\n\r"
+# A value ending in one of these can't continue in the next chunk.
+_CLOSED = '}]"'
+_NUMBER = "0123456789.eE+-"
+
+
+class JSONArrayParser:
+    """
+    Incrementally parses a top level JSON array, yielding each element as soon as it is complete.
+
+        parser = JSONArrayParser()
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                ...
+        parser.close()
+    """
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._expect_value = True
+        self._finished = False
+
+    def _skip_whitespace(self) -> None:
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+
+    def feed(self, chunk: bytes) -> list[t.Any]:
+        consumed, self._pos = self._pos, 0
+        self._buffer = self._buffer[consumed:] + self._text.decode(chunk)
+        items = []
+        while not self._finished:
+            self._skip_whitespace()
+            if self._pos >= len(self._buffer):
+                break
+            char = self._buffer[self._pos]
+            if not self._started:
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array, got {char!r}")
+                self._started = True
+                self._pos += 1
+            elif char == "]":
+                self._finished = True
+                self._pos += 1
+            elif not self._expect_value:
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']', got {char!r}")
+                self._expect_value = True
+                self._pos += 1
+            else:
+                try:
+                    item, end = self._decoder.raw_decode(self._buffer, self._pos)
+                except json.JSONDecodeError:
+                    break  # The element is not complete yet.
+                if self._buffer[end - 1] not in _CLOSED and (
+                    end == len(self._buffer) or self._buffer[end] in _NUMBER
+                ):
+                    break  # A number or literal that may continue in the next chunk.
+                items.append(item)
+                self._pos = end
+                self._expect_value = False
+        return items
+
+    def close(self) -> list[t.Any]:
+        """Signals the end of the input, raising if the array was not complete."""
+        items = self.feed(self._text.decode(b"", final=True).encode())
+        if not self._finished:
+            raise ValueError("Incomplete JSON array")
+        self._skip_whitespace()
+        if self._pos < len(self._buffer):
+            raise ValueError("Extra data after JSON array")
+        return items
@@ -0,0 +1,73 @@
+"""
+Deadlines shared by every request made within a block, including requests of composite calls
+and of tasks the block starts, since they inherit the context.
+
+    with client.deadline(5):
+        recipe = await client.create_recipe(recipe)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import time
+import typing as t
+
+from mealieapi.errors import DeadlineExceeded
+
+T = t.TypeVar("T")
+
+_EXPIRES: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "mealieapi_deadline", default=None
+)
+
+
+def expiry(timeout: float | None = None) -> float | None:
+    """
+    The monotonic time by which the current block has to finish,
+    or by which :code:`timeout` seconds have passed if that is sooner.
+    """
+    expires = _EXPIRES.get()
+    if timeout is not None:
+        own = time.monotonic() + timeout
+        expires = own if expires is None else min(expires, own)
+    return expires
+
+
+def remaining(expires: float | None) -> float | None:
+    """The seconds left until :code:`expires`, raises :code:`DeadlineExceeded` if there are none."""
+    if expires is None:
+        return None
+    left = expires - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("The deadline passed before the request finished")
+    return left
+
+
+@contextlib.contextmanager
+def deadline(timeout: float | None) -> t.Iterator[float | None]:
+    """Gives the block at most :code:`timeout` seconds, an inner deadline can only shorten an outer one."""
+    token = _EXPIRES.set(expiry(timeout))
+    try:
+        yield _EXPIRES.get()
+    finally:
+        _EXPIRES.reset(token)
+
+
+async def wait(awaitable: t.Awaitable[T], expires: float | None) -> T:
+    """Awaits the awaitable, cancelling it and raising :code:`DeadlineExceeded` once it expires."""
+    if expires is None:
+        return await awaitable
+    try:
+        left = remaining(expires)
+    except DeadlineExceeded:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError as err:
+        raise DeadlineExceeded(
+            "The deadline passed before the request finished"
+        ) from err
@@ -0,0 +1,118 @@
+"""
+Multipart upload bodies, and an index of what was last uploaded so that unchanged
+images and assets aren't uploaded again.
+
+    client.upload_index = UploadIndex("mealie-uploads.jsonl")
+    await client.update_recipe_image("pasta-bake", image, "jpg")  # Uploads
+    await client.update_recipe_image("pasta-bake", image, "jpg")  # Skipped, returns None
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import typing as t
+
+from mealieapi.jsonl import JSONLinesLog
+
+if t.TYPE_CHECKING:
+    import aiohttp
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(file: t.BinaryIO, chunk_size: int = CHUNK_SIZE) -> str:
+    """The SHA-256 of the rest of the file, read in chunks, the position is restored afterwards."""
+    start = file.tell()
+    digest = hashlib.sha256()
+    try:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    finally:
+        file.seek(start)
+    return digest.hexdigest()
+
+
+async def hash_file(
+    file: t.BinaryIO, offload_size: int = CHUNK_SIZE, chunk_size: int = CHUNK_SIZE
+) -> str:
+    """:code:`file_digest` of the file, files of at least :code:`offload_size` bytes are hashed in a thread."""
+    start = file.tell()
+    size = file.seek(0, os.SEEK_END) - start
+    file.seek(start)
+    if size < offload_size:
+        return file_digest(file, chunk_size)
+    return await asyncio.get_running_loop().run_in_executor(
+        None, file_digest, file, chunk_size
+    )
+
+
+def multipart(
+    fields: dict[str, t.Any], files: dict[str, tuple[str, t.BinaryIO]]
+) -> aiohttp.FormData:
+    """A multipart form of the fields and the files, which are given by name as (filename, file)."""
+    import aiohttp  # pylint: disable=import-outside-toplevel
+
+    form = aiohttp.FormData()
+    for name, value in fields.items():
+        if value is not None:
+            form.add_field(name, str(value))
+    for name, (filename, file) in files.items():
+        form.add_field(name, file, filename=filename)
+    return form
+
+
+class UploadIndex:
+    """
+    Remembers the hash of the last image and of every asset uploaded for each recipe, in an append
+    only file of JSON lines if a path is given, the last line of a key wins.
+    For images set from a URL the URL is what is compared, the image isn't downloaded.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None) -> None:
+        self._log = JSONLinesLog(path) if path is not None else None
+        self.path = self._log.path if self._log is not None else None
+        self._digests: dict[tuple[str, ...], str] = {}
+        for record in self._log.load() if self._log is not None else ():
+            self._set(tuple(record["key"]), record["digest"])
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def __enter__(self) -> "UploadIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _set(self, key: tuple[str, ...], digest: str | None) -> None:
+        if digest is None:
+            self._digests.pop(key, None)
+        else:
+            self._digests[key] = digest
+
+    def _write(self, key: tuple[str, ...], digest: str | None) -> None:
+        self._set(key, digest)
+        if self._log is not None:
+            self._log.append({"key": list(key), "digest": digest})
+
+    def get(self, *key: str) -> str | None:
+        return self._digests.get(key)
+
+    def unchanged(self, digest: str, *key: str) -> bool:
+        """Whether :code:`digest` is what was last uploaded for the key."""
+        return self._digests.get(key) == digest
+
+    def record(self, digest: str, *key: str) -> None:
+        if self._digests.get(key) != digest:
+            self._write(key, digest)
+
+    def forget(self, recipe_slug: str) -> None:
+        """Forgets the uploads of a recipe, for when it is deleted or created again."""
+        for key in [key for key in self._digests if key[1] == recipe_slug]:
+            self._write(key, None)
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
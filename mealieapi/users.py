@@ -21,6 +21,9 @@ class User(InteractiveModel):
     tokens: list[Token] | None = None
     password: str | None = None
 
+    def identity(self) -> t.Hashable:
+        return self.id
+
     def dict(self, *args, **kwargs) -> dict[str, t.Any]:  # type: ignore[override]
         data = super().dict(*args, **kwargs)
         data.pop("tokens")
@@ -72,6 +75,9 @@ class Group(InteractiveModel):
     shopping_lists: list[ShoppingList] | None = None
     webhook_enable: bool | None = None
 
+    def identity(self) -> t.Hashable:
+        return self.id if self.id is not None else self.name
+
     def dict(self, *args, **kwargs) -> dict[str, t.Any]:  # type: ignore[override]
         data = super().dict(*args, **kwargs)
         data.pop("id")
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import typing as t
+
+from mealieapi.identity import merge_model
+
+if t.TYPE_CHECKING:
+    from mealieapi.meals import ShoppingList
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ShoppingListWriter:
+    """
+    Write-behind for a shopping list, edits are applied locally right away and written
+    with one :code:`update_shopping_list` call once no edit was made for :code:`delay` seconds.
+    Writes never overlap and go out in the order they were scheduled, each one sending the
+    list as it is when it is sent, so the server always ends up with the latest edits.
+
+        async with shopping_list.write_behind(delay=0.5):
+            for index in range(shopping_list.length()):
+                await shopping_list.toggle_checked(index)
+    """
+
+    def __init__(self, shopping_list: "ShoppingList", delay: float = 0.5) -> None:
+        self.shopping_list = shopping_list
+        self.delay = delay
+        self.edits = 0
+        self.writes = 0
+        # The error of the last background write, it is retried by the next write.
+        self.error: BaseException | None = None
+        self._dirty = False
+        self._timer: asyncio.TimerHandle | None = None
+        self._lock: asyncio.Lock | None = None
+        self._tasks: set[asyncio.Future] = set()
+
+    @property
+    def pending(self) -> bool:
+        """Whether there are edits that weren't written yet."""
+        return self._dirty
+
+    def touch(self) -> None:
+        """Records an edit, (re)starting the debounce timer."""
+        self.edits += 1
+        self._dirty = True
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(self.delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        task = asyncio.ensure_future(self._write())
+        self._tasks.add(task)
+        task.add_done_callback(self._on_written)
+
+    def _on_written(self, task: asyncio.Future) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.error = task.exception()
+            _LOGGER.warning(
+                "Failed to write %r", self.shopping_list.name, exc_info=self.error
+            )
+
+    async def _write(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            edits, items = self.edits, self.shopping_list.items
+            try:
+                updated = await self.shopping_list.update()
+            except BaseException:
+                self._dirty = True
+                raise
+            # Keep what the server answered, e.g. assigned ids, it is merged already with an
+            # identity map. Edits only change the items, those edited during the write are
+            # kept rather than replaced by the items as they were sent, the next write sends them.
+            if updated is not self.shopping_list:
+                merge_model(self.shopping_list, updated)
+            if self.edits != edits:
+                self.shopping_list.items = items
+            self.writes += 1
+            self.error = None
+
+    async def flush(self) -> None:
+        """Writes the pending edits now, returning once the server has all of them."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._write()
+
+    def cancel(self) -> None:
+        """Drops the scheduled write, the pending edits stay local."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def close(self) -> None:
+        """Flushes and switches the shopping list back to writing every edit right away."""
+        try:
+            await self.flush()
+        finally:
+            if self.shopping_list._writer is self:
+                self.shopping_list._writer = None
+
+    async def __aenter__(self) -> "ShoppingListWriter":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"<ShoppingListWriter edits={self.edits} writes={self.writes}"
+            f" pending={self.pending}>"
+        )
@@ -0,0 +1,86 @@
+import asyncio
+import io
+import json
+from zipfile import ZipFile
+
+import pytest
+
+from mealieapi import MealieClient
+from mealieapi.backup import BackupArchive, diff_backups
+from mealieapi.errors import MealieError
+
+
+def make_backup(recipes: dict, users: list, root: str = "") -> bytes:
+    buffer = io.BytesIO()
+    with ZipFile(buffer, "w") as archive:
+        for slug, recipe in recipes.items():
+            archive.writestr(f"{root}recipes/{slug}.json", json.dumps(recipe))
+            archive.writestr(f"{root}images/{slug}/original.webp", slug.encode())
+        archive.writestr(f"{root}users/users.json", json.dumps(users))
+    return buffer.getvalue()
+
+
+class TestBackupArchive:
+    def test_index(self):
+        archive = BackupArchive(
+            make_backup({"pasta": {"name": "Pasta"}}, [{"username": "changeme"}])
+        )
+        assert archive.recipe_slugs() == ["pasta"]
+        assert "pasta" in archive
+        assert archive.recipe_json("pasta") == {"name": "Pasta"}
+        assert archive.image_names("pasta") == ["original.webp"]
+        assert archive.image("pasta") == b"pasta"
+        assert archive.users_json() == [{"username": "changeme"}]
+        assert archive.groups_json() == []
+
+    def test_root_folder(self, tmp_path):
+        path = tmp_path / "backup.zip"
+        path.write_bytes(make_backup({"soup": {"name": "Soup"}}, [], root="backup/"))
+        with BackupArchive(path) as archive:
+            assert dict(archive.iter_recipes_json()) == {"soup": {"name": "Soup"}}
+            assert archive.sections() == ["users"]
+
+
+class TestDiffBackups:
+    def test_diff(self):
+        old = make_backup(
+            {
+                "pasta": {"name": "Pasta"},
+                "soup": {"name": "Soup"},
+                "pie": {"a": 1, "b": 2},
+            },
+            [{"id": 1, "username": "a"}, {"id": 2, "username": "b"}],
+        )
+        new = make_backup(
+            {
+                "pasta": {"name": "Pasta!"},
+                "pizza": {"name": "Pizza"},
+                "pie": {"b": 2, "a": 1},
+            },
+            [{"id": 1, "username": "a"}, {"id": 2, "username": "c"}, {"id": 3}],
+        )
+        diff = diff_backups(BackupArchive(old), BackupArchive(new))
+        assert diff.recipes.added == ["pizza"]
+        assert diff.recipes.removed == ["soup"]
+        assert diff.recipes.modified == ["pasta"]
+        assert diff.users.added == ["3"]
+        assert diff.users.modified == ["2"]
+        assert not diff.groups.changed
+        assert diff.changed
+
+    def test_client_closes_archive_when_other_download_fails(self, tmp_path):
+        client = MealieClient("http://mealie.local")
+        opened = []
+
+        async def download_backup_to(file_name, destination, *args, **kwargs):
+            if file_name == "new.zip":
+                await asyncio.sleep(0.01)
+                raise MealieError("Download failed")
+            archive = BackupArchive(make_backup({}, []))
+            opened.append(archive)
+            return archive
+
+        client.download_backup_to = download_backup_to  # type: ignore[assignment]
+        with pytest.raises(MealieError):
+            asyncio.run(client.diff_backups("old.zip", "new.zip"))
+        assert opened[0]._zip.fp is None
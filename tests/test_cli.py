@@ -0,0 +1,100 @@
+import asyncio
+import io
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi import MealieClient
+from mealieapi.checkpoint import Checkpoint
+from mealieapi.cli import Progress, export, import_
+
+RECIPES = {
+    slug: {
+        "name": slug.title(),
+        "slug": slug,
+        "comments": [],
+        "dateAdded": "2022-01-01",
+        "dateUpdated": None,
+        "recipeIngredient": ["1 cup flour"],
+    }
+    for slug in ("pasta", "pizza", "soup")
+}
+
+
+def make_app(created: list) -> web.Application:
+    async def summary(request):
+        return web.json_response(
+            [{"name": recipe["name"]} for recipe in RECIPES.values()]
+        )
+
+    async def recipe(request):
+        return web.json_response(RECIPES[request.match_info["slug"]])
+
+    async def create(request):
+        data = await request.json()
+        if data["name"] == "Soup" and "Soup" not in created:
+            created.append("Soup")
+            return web.json_response({"detail": "Bad Request"}, status=400)
+        created.append(data["name"])
+        return web.json_response(data["slug"])
+
+    app = web.Application()
+    app.router.add_get("/api/recipes/summary", summary)
+    app.router.add_post("/api/recipes/create", create)
+    app.router.add_get("/api/recipes/{slug}", recipe)
+    return app
+
+
+class TestExportImport:
+    def test_round_trip_with_checkpoint(self, tmp_path):
+        created: list = []
+        output = io.StringIO()
+        quiet = io.StringIO()
+
+        async def main():
+            async with TestServer(make_app(created)) as server:
+                client = MealieClient(str(server.make_url("")))
+                client.authorize("token")
+                exported = await export(
+                    client, output, 2, progress=Progress("Exported", stream=quiet)
+                )
+                lines = io.StringIO(output.getvalue())
+                with Checkpoint(tmp_path / "checkpoint") as checkpoint:
+                    first = await import_(
+                        client, lines, checkpoint, 2, Progress("Imported", stream=quiet)
+                    )
+                lines.seek(0)
+                with Checkpoint(tmp_path / "checkpoint") as checkpoint:
+                    second = await import_(
+                        client, lines, checkpoint, 2, Progress("Imported", stream=quiet)
+                    )
+                return exported, first, second
+
+        exported, first, second = asyncio.run(main())
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert sorted(record["data"]["slug"] for record in records) == [
+            "pasta",
+            "pizza",
+            "soup",
+        ]
+        assert exported.done == 3
+        assert (first.done, first.failed) == (2, 1)
+        assert (second.done, second.skipped) == (1, 2)
+        assert sorted(created) == ["Pasta", "Pizza", "Soup", "Soup"]
+
+
+class TestCheckpoint:
+    def test_recovers_from_a_partial_last_line(self, tmp_path):
+        path = tmp_path / "checkpoint"
+        with Checkpoint(path) as checkpoint:
+            checkpoint.mark("pasta", "pasta-bake")
+        with open(path, "a", encoding="utf-8") as file:
+            file.write('["sou')
+        with Checkpoint(path) as checkpoint:
+            checkpoint.mark("soup\tpot", "soup")
+        with Checkpoint(path) as checkpoint:
+            assert dict(checkpoint.items()) == {
+                "pasta": "pasta-bake",
+                "soup\tpot": "soup",
+            }
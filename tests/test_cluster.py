@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi.cluster import MealieCluster
+from mealieapi.errors import MealieError
+from mealieapi.misc import DebugStatistics
+
+
+async def statistics(request: web.Request) -> web.Response:
+    if request.headers["Authorization"] == "Bearer slow":
+        await asyncio.sleep(1)
+    return web.json_response({"totalRecipes": 3})
+
+
+class TestMealieCluster:
+    def test_scatter_gather(self):
+        async def main():
+            app = web.Application()
+            app.router.add_get("/api/debug/statistics", statistics)
+            async with TestServer(app) as server:
+                url = str(server.make_url(""))
+                async with MealieCluster(concurrency=4) as cluster:
+                    cluster.add_instance("a", url, token="a")
+                    cluster.add_instance("b", url, token="b")
+                    cluster.add_instance("slow", url, token="slow")
+                    assert cluster["a"].session is cluster.session
+                    return await cluster.get_debug_statistics(timeout=0.2)
+
+        results = asyncio.run(main())
+        assert results["a"].value == DebugStatistics(total_recipes=3)
+        assert results["b"].ok
+        assert isinstance(results["slow"].error, asyncio.TimeoutError)
+
+    def test_timeout_none_waits_and_failed_login_is_removed(self):
+        async def token(request: web.Request) -> web.Response:
+            return web.json_response({"detail": "Unauthorized"}, status=401)
+
+        async def main():
+            app = web.Application()
+            app.router.add_get("/api/debug/statistics", statistics)
+            app.router.add_post("/api/auth/token", token)
+            async with TestServer(app) as server:
+                url = str(server.make_url(""))
+                async with MealieCluster(timeout=0.1) as cluster:
+                    cluster.add_instance("slow", url, token="slow")
+                    with pytest.raises(MealieError):
+                        await cluster.login("a", url, "user", "wrong")
+                    assert "a" not in cluster.clients
+                    return await cluster.get_debug_statistics(timeout=None)
+
+        assert asyncio.run(main())["slow"].ok
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi.errors import MealieError
+from mealieapi.hedging import HedgePolicy
+from mealieapi.raw import RawClient
+
+RECIPES = [
+    {"name": f"Recipe {number}", "slug": f"recipe-{number}"} for number in range(500)
+]
+
+
+class TestCompression:
+    def run(self, accept_gzip: bool, threshold: int | None = 1024):
+        received = []
+
+        async def recipes(request: web.Request) -> web.Response:
+            assert "gzip" in request.headers["Accept-Encoding"]
+            response = web.json_response(RECIPES)
+            response.enable_compression()
+            return response
+
+        async def update(request: web.Request) -> web.Response:
+            encoding = request.headers.get("Content-Encoding")
+            if encoding == "gzip" and not accept_gzip:
+                return web.Response(status=415)
+            received.append(encoding)
+            return web.json_response(await request.json())
+
+        async def main():
+            app = web.Application()
+            app.router.add_get("/api/recipes", recipes)
+            app.router.add_put("/api/recipes", update)
+            async with TestServer(app) as server:
+                client = RawClient(str(server.make_url("")))
+                client.compress_threshold = threshold
+                listed = await client.request("recipes")
+                first = await client.request("recipes", method="PUT", json=RECIPES)
+                second = await client.request("recipes", method="PUT", json=RECIPES)
+                return client, listed, first, second
+
+        client, listed, first, second = asyncio.run(main())
+        assert listed == first == second == RECIPES
+        return client, received
+
+    def test_compressed_both_ways(self):
+        client, received = self.run(accept_gzip=True)
+        stats = client.transfer_statistics
+        assert received == ["gzip", "gzip"]
+        assert (stats.requests, stats.compressed_requests) == (3, 2)
+        assert stats.bytes_sent_on_wire < stats.bytes_sent / 4
+        assert stats.bytes_received_on_wire < stats.bytes_received
+        assert stats.bytes_saved > 0
+
+    def test_falls_back_when_rejected(self):
+        client, received = self.run(accept_gzip=False)
+        assert received == [None, None]
+        assert client.compress_requests is False
+        assert client.transfer_statistics.compressed_requests == 0
+
+    def test_disabled_by_default(self):
+        client, received = self.run(accept_gzip=True, threshold=None)
+        assert received == [None, None]
+        stats = client.transfer_statistics
+        assert stats.bytes_sent == stats.bytes_sent_on_wire
+
+    def post(self, status: int, method: str = "POST", hedge_policy=None):
+        received = []
+
+        async def create(request: web.Request) -> web.Response:
+            encoding = request.headers.get("Content-Encoding")
+            received.append(encoding)
+            if encoding == "gzip":
+                # What FastAPI answers a body it can't decode as JSON.
+                return web.json_response({"detail": "JSON decode error"}, status=422)
+            if status != 200:
+                return web.json_response({"detail": "Invalid recipe"}, status=status)
+            return web.json_response(await request.json())
+
+        async def main():
+            app = web.Application()
+            app.router.add_route(method, "/api/recipes", create)
+            async with TestServer(app) as server:
+                client = RawClient(str(server.make_url("")))
+                client.compress_threshold = 1024
+                client.hedge_policy = hedge_policy
+                try:
+                    return client, await client.request(
+                        "recipes", method=method, json=RECIPES
+                    )
+                except MealieError as err:
+                    return client, err
+
+        client, result = asyncio.run(main())
+        return client, result, received
+
+    @pytest.mark.parametrize(
+        "method, hedge_policy", [("POST", None), ("GET", HedgePolicy())]
+    )
+    def test_falls_back_on_unprocessable_entity(self, method, hedge_policy):
+        client, result, received = self.post(200, method, hedge_policy)
+        assert result == RECIPES
+        assert received == ["gzip", None]
+        assert client.compress_requests is False
+
+    def test_keeps_compressing_when_the_request_is_invalid(self):
+        client, result, received = self.post(422)
+        assert isinstance(result, MealieError)
+        assert received == ["gzip", None]
+        assert client.compress_requests
@@ -0,0 +1,68 @@
+import pytest
+
+from mealieapi import MealieClient
+from mealieapi.dedup import MinHasher, find_duplicates, lsh_bands, shingles
+from mealieapi.recipes import Recipe
+
+LASAGNA = [
+    "12 lasagna noodles",
+    "1 pound ground beef",
+    "2 cups ricotta cheese",
+    "3 cups marinara sauce",
+    "2 cups shredded mozzarella",
+]
+STEPS = [
+    {"text": "Brown the beef and stir in the marinara sauce."},
+    {"text": "Layer noodles, ricotta, sauce and mozzarella in a baking dish."},
+    {"text": "Bake covered at 375 degrees for 45 minutes, then uncovered for 10."},
+]
+
+
+def recipe(slug, ingredients, steps=STEPS):
+    return Recipe(
+        MealieClient("http://mealie.local"),
+        name=slug,
+        slug=slug,
+        recipe_ingredient=ingredients,
+        recipe_instructions=steps,
+    )
+
+
+class TestDedup:
+    def test_finds_near_duplicates(self):
+        recipes = [
+            recipe("lasagna", LASAGNA),
+            recipe("pancakes", ["2 cups flour", "2 eggs", "1 cup milk"], []),
+            recipe("lasagna-2", LASAGNA[:-1] + ["2 cups Shredded Mozzarella!"]),
+            recipe("lasagna-3", LASAGNA + ["1 teaspoon basil"]),
+            recipe("empty", []),
+        ]
+        clusters = find_duplicates(recipes, threshold=0.7)
+        assert [cluster.slugs for cluster in clusters] == [
+            ["lasagna", "lasagna-2", "lasagna-3"]
+        ]
+        assert clusters[0].keep == "lasagna"
+        assert 0.7 <= clusters[0].similarity <= 1
+
+    def test_signature_estimates_jaccard(self):
+        first = shingles(" ".join(f"word{n}" for n in range(100)))
+        second = shingles(" ".join(f"word{n}" for n in range(50, 150)))
+        jaccard = len(first & second) / len(first | second)
+        hasher = MinHasher(256)
+        a, b = hasher.signature(first), hasher.signature(second)
+        estimate = sum(x == y for x, y in zip(a, b)) / 256
+        assert abs(estimate - jaccard) < 0.1
+
+    def test_lsh_bands(self):
+        bands, rows = lsh_bands(128, 0.8)
+        assert bands * rows == 128
+        assert abs((1 / bands) ** (1 / rows) - 0.8) < 0.1
+
+    def test_numpy_matches_pure_python(self, monkeypatch):
+        pytest.importorskip("numpy")
+        from mealieapi import dedup
+
+        hashes = shingles(" ".join(LASAGNA))
+        vectorized = MinHasher().signature(hashes)
+        monkeypatch.setattr(dedup, "np", None)
+        assert MinHasher().signature(hashes) == vectorized
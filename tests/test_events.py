@@ -0,0 +1,46 @@
+import asyncio
+import json
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from mealieapi import MealieClient
+from mealieapi.events import EventBus, RecipeEvent, WebhookEvent, WebhookReceiver
+
+
+class TestEventBus:
+    def test_subscribe_by_type(self):
+        bus = EventBus()
+        received = []
+
+        async def on_recipe(event):
+            received.append(event)
+
+        unsubscribe = bus.subscribe(on_recipe, RecipeEvent)
+        asyncio.run(bus.publish(WebhookEvent(payload=1)))
+        asyncio.run(bus.publish(RecipeEvent(action="updated", slug="pasta")))
+        unsubscribe()
+        asyncio.run(bus.publish(RecipeEvent(action="updated", slug="pizza")))
+        assert [event.slug for event in received] == ["pasta"]
+
+
+class TestWebhookReceiver:
+    def test_publishes_webhooks(self):
+        client = MealieClient("http://mealie.local")
+        received = []
+        client.events.subscribe(received.append)
+        receiver = WebhookReceiver(client, secret="secret")
+
+        async def main():
+            async with TestClient(TestServer(receiver.make_app())) as http:
+                denied = await http.post("/mealie/webhook", json={})
+                body = json.dumps({"slug": "pasta", "name": "Pasta"})
+                accepted = await http.post(
+                    "/mealie/webhook?token=secret&group=Home", json=body
+                )
+                return denied.status, accepted.status
+
+        assert asyncio.run(main()) == (401, 204)
+        webhook, recipe = received
+        assert webhook.group == "Home"
+        assert webhook.payload["name"] == "Pasta"
+        assert recipe.slug == "pasta"
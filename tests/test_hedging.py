@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi.hedging import HedgePolicy
+from mealieapi.raw import RawClient
+
+
+def run(policy, method="GET"):
+    calls = []
+
+    async def slow_once(request: web.Request) -> web.Response:
+        calls.append(request.method)
+        if len(calls) == 1:
+            await asyncio.sleep(0.5)
+        return web.json_response(len(calls))
+
+    async def main():
+        app = web.Application()
+        app.router.add_route("*", "/api/recipes", slow_once)
+        async with TestServer(app) as server:
+            client = RawClient(str(server.make_url("")))
+            client.hedge_policy = policy
+            started = time.monotonic()
+            result = await client.request("recipes", method=method)
+            return result, time.monotonic() - started
+
+    result, elapsed = asyncio.run(main())
+    return result, elapsed, calls
+
+
+def primed(**kwargs):
+    policy = HedgePolicy(**kwargs)
+    policy.latencies.extend([0.01] * policy.min_samples)
+    return policy
+
+
+class TestHedging:
+    def test_hedge_wins(self):
+        policy = primed(max_rate=1.0)
+        result, elapsed, calls = run(policy)
+        assert result == 2
+        assert elapsed < 0.4
+        assert (policy.hedged, policy.hedge_wins) == (1, 1)
+        # The cancelled primary is recorded too, at least as long as the hedge it lost to.
+        assert len(policy.latencies) == policy.min_samples + 2
+        assert policy.latencies[-1] >= policy.latencies[-2]
+
+    def test_rate_cap(self):
+        policy = primed(max_rate=0.05)
+        result, elapsed, calls = run(policy)
+        assert result == 1
+        assert calls == ["GET"]
+        assert policy.hedged == 0
+
+    def test_only_idempotent_requests(self):
+        policy = primed(max_rate=1.0)
+        result, elapsed, calls = run(policy, method="POST")
+        assert calls == ["POST"]
+        assert policy.requests == 0
+
+    def test_no_hedging_without_samples(self):
+        policy = HedgePolicy(max_rate=1.0)
+        assert policy.delay() is None
+        result, elapsed, calls = run(policy)
+        assert calls == ["GET"]
+        assert len(policy.latencies) == 1
@@ -0,0 +1,56 @@
+from mealieapi import MealieClient
+from mealieapi.identity import IdentityMap
+from mealieapi.recipes import Recipe
+
+
+def recipe_json(**data):
+    return {"name": "Pasta Bake", "slug": "pasta-bake-2", **data}
+
+
+class TestIdentityMap:
+    def test_one_instance_per_recipe(self):
+        client = MealieClient("http://mealie.local")
+        client.identity_map = IdentityMap()
+        full = client.process_recipe_json(
+            recipe_json(description="Cheesy", recipe_yield="4", comments=[])
+        )
+        tag = client.process_tag_json(
+            {"id": 1, "name": "Dinner", "slug": "dinner", "recipes": [recipe_json()]}
+        )
+        category = client.process_category_json(
+            {"id": 2, "name": "Oven", "recipes": [recipe_json(rating=5)]}
+        )
+        user = client.process_user_json(
+            {
+                "id": 3,
+                "username": "cook",
+                "full_name": "Cook",
+                "email": "cook@example.com",
+                "admin": False,
+                "group": "Home",
+                "favorite_recipes": [recipe_json()],
+            }
+        )
+
+        assert tag.recipes[0] is full
+        assert category.recipes[0] is full
+        assert user.favorite_recipes[0] is full
+        assert full.slug == "pasta-bake-2"
+        assert full.description == "Cheesy"
+        assert full.rating == 5
+        assert client.identity_map.get(Recipe, "pasta-bake-2") is full
+
+    def test_disabled_by_default(self):
+        client = MealieClient("http://mealie.local")
+        first = client.process_recipe_json(recipe_json())
+        second = client.process_recipe_json(recipe_json())
+        assert first is not second
+        assert first.slug == "pasta-bake-2"
+
+    def test_max_size(self):
+        client = MealieClient("http://mealie.local")
+        client.identity_map = IdentityMap(max_size=1)
+        client.process_recipe_json(recipe_json(slug="one"))
+        client.process_recipe_json(recipe_json(slug="two"))
+        assert len(client.identity_map) == 1
+        assert client.identity_map.get(Recipe, "one") is None
@@ -0,0 +1,57 @@
+import json
+import subprocess
+import sys
+
+# Generous enough for slow CI machines, importing aiohttp eagerly alone costs more.
+PACKAGE_BUDGET_US = 50_000
+CLIENT_BUDGET_US = 500_000
+
+
+def run(statement: str, *options: str) -> str:
+    result = subprocess.run(
+        [sys.executable, *options, "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout + result.stderr
+
+
+def import_times(statement: str) -> dict[str, int]:
+    times = {}
+    for line in run(statement, "-X", "importtime").splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def loaded_modules(statement: str, *modules: str) -> list[str]:
+    output = run(
+        f"import json, sys; {statement}; "
+        f"print(json.dumps([m for m in {modules!r} if m in sys.modules]))"
+    )
+    return json.loads(output)
+
+
+class TestImport:
+    def test_package_import_is_lazy(self):
+        times = import_times("import mealieapi")
+        assert times["mealieapi"] < PACKAGE_BUDGET_US
+        assert "mealieapi.client" not in times
+        assert "aiohttp" not in times
+
+    def test_client_import_does_not_load_aiohttp(self):
+        assert loaded_modules(
+            "from mealieapi import MealieClient",
+            "mealieapi.client",
+            "aiohttp",
+            "aiohttp.web",
+        ) == ["mealieapi.client"]
+
+    def test_client_import_budget(self):
+        times = import_times("import mealieapi.client")
+        assert "aiohttp" not in times
+        assert times["mealieapi.client"] < CLIENT_BUDGET_US
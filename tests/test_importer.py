@@ -0,0 +1,85 @@
+import asyncio
+
+from mealieapi import MealieClient
+from mealieapi.importer import BulkURLImporter, _HostLimiter, normalize_url
+
+
+class TestBulkURLImporter:
+    def test_normalize_url(self):
+        url = normalize_url(" HTTPS://Example.com/pasta/#top")
+        assert url == "https://example.com/pasta"
+
+    def test_resumes_from_checkpoint(self, tmp_path):
+        client = MealieClient("http://mealie.local")
+        scraped = []
+
+        async def scrape(url):
+            scraped.append(url)
+            if url.endswith("broken"):
+                raise ValueError("Could not scrape")
+            return url.rsplit("/", 1)[1]
+
+        async def get_recipe(slug):
+            return slug
+
+        client.create_recipe_slug_from_url = scrape  # type: ignore[assignment]
+        client.get_recipe = get_recipe  # type: ignore[assignment]
+        urls = [
+            "https://a.example/pasta",
+            "https://a.example/pasta/",
+            "https://b.example/soup",
+            "https://a.example/broken",
+        ]
+
+        async def main():
+            first = await client.import_recipe_urls(
+                urls, tmp_path / "checkpoint", host_delay=0
+            )
+            importer = BulkURLImporter(client, tmp_path / "checkpoint", host_delay=0)
+            second = await importer.run(urls + ["https://b.example/pie"])
+            recipes = await importer.fetch(importer.imported_slugs())
+            importer.close()
+            return first, second, recipes
+
+        first, second, recipes = asyncio.run(main())
+        assert sorted(first.created.values()) == ["pasta", "soup"]
+        assert list(first.failed) == ["https://a.example/broken"]
+        assert sorted(second.skipped) == [
+            "https://a.example/pasta",
+            "https://b.example/soup",
+        ]
+        assert list(second.created.values()) == ["pie"]
+        assert sorted(recipes) == ["pasta", "pie", "soup"]
+        assert scraped.count("https://a.example/broken") == 2
+
+    def test_submits_urls_as_given(self):
+        client = MealieClient("http://mealie.local")
+        scraped = []
+
+        async def scrape(url):
+            scraped.append(url)
+            return "pasta"
+
+        client.create_recipe_slug_from_url = scrape  # type: ignore[assignment]
+        urls = ["https://A.example/Pasta/#recipe", "https://a.example/Pasta"]
+        report = asyncio.run(client.import_recipe_urls(urls, host_delay=0))
+        assert scraped == ["https://A.example/Pasta/#recipe"]
+        assert report.created == {"https://A.example/Pasta/#recipe": "pasta"}
+
+    def test_host_slot_released_when_cancelled_while_waiting(self):
+        limiter = _HostLimiter(1, delay=60)
+
+        async def enter():
+            async with limiter:
+                pass
+
+        async def main():
+            await enter()
+            # The second request waits for the host delay and is cancelled meanwhile.
+            waiting = asyncio.ensure_future(enter())
+            await asyncio.sleep(0)
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+            return limiter.semaphore.locked()
+
+        assert not asyncio.run(main())
@@ -0,0 +1,133 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi import MealieClient
+from mealieapi.events import RECIPE_UPDATED, RecipeEvent
+from mealieapi.index import RecipeIndex
+from mealieapi.recipes import Recipe
+
+SUMMARIES = [
+    {
+        "name": "Pasta Bake",
+        "slug": "pasta-bake",
+        "tags": ["Dinner"],
+        "recipeCategory": ["Pasta"],
+        "rating": 5,
+    },
+    {
+        "name": "Chili Pasta",
+        "slug": "chili-pasta",
+        "tags": ["Dinner", "Spicy"],
+        "recipeCategory": ["Pasta"],
+        "rating": 4,
+    },
+    {
+        "name": "Pancakes",
+        "slug": "pancakes",
+        "tags": ["Breakfast"],
+        "recipeCategory": [],
+        "rating": 3,
+    },
+    {
+        "name": "Toast",
+        "slug": "toast",
+        "tags": [],
+        "recipeCategory": [],
+        "rating": None,
+    },
+]
+
+
+def build():
+    async def summaries(request: web.Request) -> web.Response:
+        return web.json_response(SUMMARIES)
+
+    async def delete(request: web.Request) -> web.Response:
+        return web.json_response(SUMMARIES[0])
+
+    async def favorite(request: web.Request) -> web.Response:
+        return web.json_response(None)
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/api/recipes/summary", summaries)
+        app.router.add_delete("/api/recipes/pasta-bake", delete)
+        app.router.add_post("/api/users/1/favorites/pancakes", favorite)
+        async with TestServer(app) as server:
+            client = MealieClient(str(server.make_url("")))
+            index = await RecipeIndex.build(client)
+            before = index.query(tags=["dinner"], categories=["pasta"])
+            await client.add_favorite(1, "pancakes")
+            await client.delete_recipe("pasta-bake")
+            await client.events.publish(
+                RecipeEvent(
+                    action=RECIPE_UPDATED,
+                    slug="toast",
+                    recipe=Recipe(
+                        client, name="Toast", slug="toast", tags=["Breakfast"]
+                    ),
+                )
+            )
+            return index, before
+
+    return asyncio.run(main())
+
+
+class TestRecipeIndex:
+    def test_queries(self):
+        index, before = build()
+        assert before == {"pasta-bake", "chili-pasta"}
+        assert index.query(tags=["Dinner"], exclude_tags=["spicy"]) == set()
+        assert index.query(tags=["breakfast"]) == {"pancakes", "toast"}
+        assert index.query(min_rating=4) == {"chili-pasta"}
+        assert index.query(favorite_of=1) == {"pancakes"}
+        assert index.uncategorized() == {"pancakes", "toast"}
+        assert index.untagged() == set()
+        assert [recipe.name for recipe in index.recipes({"toast", "gone"})] == ["Toast"]
+        assert "pasta-bake" not in index
+
+    def test_follows_renames_and_created_slugs(self):
+        async def summaries(request: web.Request) -> web.Response:
+            return web.json_response(SUMMARIES[2:3])
+
+        async def update(request: web.Request) -> web.Response:
+            return web.json_response(
+                {**await request.json(), "slug": "fluffy-pancakes"}
+            )
+
+        async def create(request: web.Request) -> web.Response:
+            return web.json_response("toast")
+
+        fetched = []
+
+        async def get(request: web.Request) -> web.Response:
+            fetched.append(request.path)
+            return web.json_response(SUMMARIES[3])
+
+        async def main():
+            app = web.Application()
+            app.router.add_get("/api/recipes/summary", summaries)
+            app.router.add_put("/api/recipes/pancakes", update)
+            app.router.add_post("/api/recipes/create", create)
+            app.router.add_get("/api/recipes/toast", get)
+            async with TestServer(app) as server:
+                client = MealieClient(str(server.make_url("")))
+                index = await RecipeIndex.build(client)
+                index.set_favorites(1, ["pancakes"])
+                recipe = index.summaries["pancakes"]
+                recipe.name = "Fluffy Pancakes"
+                await client.update_recipe(recipe)
+                await client.create_recipe_slug(Recipe(client, name="Toast"))
+                # Creating by slug doesn't fetch the recipe, refresh does that in one pass.
+                assert not fetched
+                assert index.stale == {"toast"}
+                await index.refresh(client)
+                return index
+
+        index = asyncio.run(main())
+        assert not index.stale
+        assert sorted(index.summaries) == ["fluffy-pancakes", "toast"]
+        assert index.query(tags=["breakfast"]) == {"fluffy-pancakes"}
+        assert index.query(favorite_of=1) == {"fluffy-pancakes"}
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi import MealieClient
+from mealieapi.errors import DeadlineExceeded, MutationQueued
+from mealieapi.journal import MutationJournal
+
+BASE = "2022-01-01T10:00:00.000000"
+
+
+def recipe_json(slug: str, date_updated: str = BASE) -> dict:
+    return {"name": slug.title(), "slug": slug, "dateUpdated": date_updated}
+
+
+class TestMutationJournal:
+    def test_queue_coalesce_and_replay(self, tmp_path):
+        path = tmp_path / "journal.jsonl"
+        sent = []
+
+        async def queue():
+            client = MealieClient("http://127.0.0.1:1")
+            client.journal = MutationJournal(path)
+            soup = client.process_recipe_json(
+                {"name": "Soup", "slug": "soup", "date_updated": BASE}
+            )
+            stew = client.process_recipe_json(
+                {"name": "Stew", "slug": "stew", "date_updated": BASE}
+            )
+            with pytest.raises(MutationQueued):
+                await client.update_recipe(soup)
+            soup.description = "Hot"
+            with pytest.raises(MutationQueued):
+                await client.update_recipe(soup)
+            with pytest.raises(MutationQueued):
+                await client.add_favorite(1, "soup")
+            with pytest.raises(MutationQueued):
+                await client.update_recipe(stew)
+            client.journal.close()
+
+        async def handle(request: web.Request) -> web.Response:
+            if request.method != "GET":
+                sent.append((request.method, request.path, await request.text()))
+            slug = request.match_info["slug"]
+            # The stew was changed on the server while the client was offline.
+            updated = "2022-02-01T10:00:00.000000" if slug == "stew" else BASE
+            return web.json_response(recipe_json(slug, updated))
+
+        async def favorite(request: web.Request) -> web.Response:
+            sent.append((request.method, request.path, ""))
+            return web.json_response(None)
+
+        async def replay():
+            app = web.Application()
+            app.router.add_route("*", "/api/recipes/{slug}", handle)
+            app.router.add_post("/api/users/1/favorites/soup", favorite)
+            async with TestServer(app) as server:
+                client = MealieClient(str(server.make_url("")))
+                journal = MutationJournal(path)
+                assert [entry.label for entry in journal.pending] == [
+                    "update_recipe",
+                    "add_favorite",
+                    "update_recipe",
+                ]
+                report = await journal.replay(client)
+                journal.close()
+                return report, journal
+
+        asyncio.run(queue())
+        report, journal = asyncio.run(replay())
+        assert [entry.path for entry in report.applied] == [
+            "recipes/soup",
+            "users/1/favorites/soup",
+        ]
+        assert [entry.path for entry in report.conflicts] == ["recipes/stew"]
+        assert not report.ok
+        assert len(sent) == 2
+        (body,) = [body for method, _, body in sent if method == "PUT"]
+        assert '"description": "Hot"' in body
+        assert len(journal) == 0
+        assert path.read_text() == ""
+
+    def test_writes_are_sent_without_journal_entries_online(self, tmp_path):
+        async def handle(request: web.Request) -> web.Response:
+            return web.json_response(None)
+
+        async def main():
+            app = web.Application()
+            app.router.add_post("/api/users/1/favorites/soup", handle)
+            async with TestServer(app) as server:
+                client = MealieClient(str(server.make_url("")))
+                client.journal = MutationJournal(tmp_path / "journal.jsonl")
+                await client.add_favorite(1, "soup")
+                return client.journal
+
+        assert len(asyncio.run(main())) == 0
+
+    def test_timed_out_writes_are_not_queued(self, tmp_path):
+        async def handle(request: web.Request) -> web.Response:
+            await asyncio.sleep(1)
+            return web.json_response(None)
+
+        async def main():
+            app = web.Application()
+            app.router.add_post("/api/users/1/favorites/soup", handle)
+            async with TestServer(app) as server:
+                client = MealieClient(str(server.make_url("")))
+                client.timeout = 0.05
+                client.journal = MutationJournal(tmp_path / "journal.jsonl")
+                # The server may have added the favorite, replaying it could add it twice.
+                with pytest.raises(DeadlineExceeded):
+                    await client.add_favorite(1, "soup")
+                return client.journal
+
+        assert len(asyncio.run(main())) == 0
+
+    def test_recovers_from_a_partial_last_line(self, tmp_path):
+        path = tmp_path / "journal.jsonl"
+        with MutationJournal(path, fsync=False) as journal:
+            journal.append("add_favorite", "POST", "users/1/favorites/soup", "users/1")
+        with open(path, "a", encoding="utf-8") as file:
+            file.write('{"seq": 2, "lab')
+        with MutationJournal(path, fsync=False) as journal:
+            entry = journal.append(
+                "add_favorite", "POST", "users/1/favorites/stew", "users/1"
+            )
+            assert entry.seq == 2
+        with MutationJournal(path, fsync=False) as journal:
+            paths = [entry.path for entry in journal.pending]
+        assert paths == ["users/1/favorites/soup", "users/1/favorites/stew"]
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi.lanes import BULK, INTERACTIVE, LaneScheduler
+from mealieapi.raw import RawClient
+
+
+class TestLaneScheduler:
+    def test_weighted_order(self):
+        async def main():
+            scheduler = LaneScheduler(concurrency=1, limits={})
+            order = []
+
+            async def job(name):
+                async with scheduler.slot(name):
+                    order.append(name)
+                    await asyncio.sleep(0)
+
+            await scheduler.acquire(BULK)
+            tasks = [asyncio.create_task(job(BULK)) for _ in range(4)]
+            tasks += [asyncio.create_task(job(INTERACTIVE)) for _ in range(4)]
+            await asyncio.sleep(0)
+            scheduler.release(BULK)
+            await asyncio.gather(*tasks)
+            return order
+
+        order = asyncio.run(main())
+        assert order[:4] == [INTERACTIVE] * 4
+
+    def test_bulk_leaves_a_slot(self):
+        async def main():
+            scheduler = LaneScheduler(concurrency=2)
+            await scheduler.acquire(BULK)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(scheduler.acquire(BULK), 0.05)
+            await asyncio.wait_for(scheduler.acquire(INTERACTIVE), 0.05)
+            assert scheduler.waiting(BULK) == 0
+            return dict(scheduler.in_flight)
+
+        assert asyncio.run(main()) == {BULK: 1, INTERACTIVE: 1}
+
+    def test_unknown_lane(self):
+        with pytest.raises(ValueError):
+            asyncio.run(LaneScheduler().acquire("urgent"))
+
+    def test_interactive_overtakes_bulk_requests(self):
+        finished = []
+
+        async def recipe(request: web.Request) -> web.Response:
+            await asyncio.sleep(0.05)
+            return web.json_response(request.match_info["slug"])
+
+        async def main():
+            app = web.Application()
+            app.router.add_get("/api/recipes/{slug}", recipe)
+            async with TestServer(app) as server:
+                client = RawClient(str(server.make_url("")))
+                client.scheduler = LaneScheduler(concurrency=2)
+
+                async def get(slug, lane=None):
+                    finished.append(await client.request(f"recipes/{slug}", lane=lane))
+
+                with client.lane(BULK):
+                    bulk = [asyncio.create_task(get(f"bulk-{n}")) for n in range(10)]
+                await asyncio.sleep(0.01)
+                await get("interactive", lane=INTERACTIVE)
+                await asyncio.gather(*bulk)
+
+        asyncio.run(main())
+        assert finished.index("interactive") <= 2
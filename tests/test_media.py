@@ -0,0 +1,114 @@
+import asyncio
+
+from mealieapi import MealieClient
+from mealieapi.media import MediaCache
+from mealieapi.recipes import Recipe
+
+
+class TestMediaCache:
+    def test_put_and_get(self, tmp_path):
+        cache = MediaCache(tmp_path)
+        cache.put("pasta", "original", b"image", version="1")
+        assert cache.get("pasta", "original") == b"image"
+        assert cache.get("pasta", "original", version="1") == b"image"
+        assert cache.get("pasta", "original", version="2") is None
+        with cache.open("pasta", "original") as mapped:
+            assert mapped[:] == b"image"
+
+    def test_identical_content_is_stored_once(self, tmp_path):
+        cache = MediaCache(tmp_path)
+        cache.put("pasta", "original", b"image")
+        cache.put("pizza", "original", b"image")
+        assert len(cache) == 2
+        assert cache.total_bytes == len(b"image")
+
+    def test_lru_eviction(self, tmp_path):
+        cache = MediaCache(tmp_path, max_bytes=10)
+        cache.put("a", "original", b"aaaa")
+        cache.put("b", "original", b"bbbb")
+        cache.get("a", "original")
+        cache.put("c", "original", b"cccc")
+        assert cache.get("b", "original") is None
+        assert cache.get("a", "original") == b"aaaa"
+        assert cache.total_bytes <= 10
+
+    def test_index_persists(self, tmp_path):
+        MediaCache(tmp_path).put("pasta", "tiny-original", b"tiny", version="1")
+        cache = MediaCache(tmp_path)
+        assert cache.get("pasta", "tiny-original", version="1") == b"tiny"
+        cache.invalidate("pasta")
+        assert MediaCache(tmp_path).get("pasta", "tiny-original") is None
+
+    def test_index_is_appended_and_compacted(self, tmp_path):
+        cache = MediaCache(tmp_path)
+        for number in range(200):
+            cache.put("pasta", "original", str(number).encode())
+        lines = (tmp_path / MediaCache.INDEX_FILE).read_text().splitlines()
+        assert len(lines) <= MediaCache.COMPACT_RATIO * 16 + 1
+        assert MediaCache(tmp_path).get("pasta", "original") == b"199"
+
+    def test_index_survives_a_partial_last_line(self, tmp_path):
+        MediaCache(tmp_path).put("pasta", "original", b"image")
+        with open(tmp_path / MediaCache.INDEX_FILE, "a", encoding="utf-8") as file:
+            file.write('["soup/orig')
+        MediaCache(tmp_path).put("soup", "original", b"soup")
+        cache = MediaCache(tmp_path)
+        assert cache.get("pasta", "original") == b"image"
+        assert cache.get("soup", "original") == b"soup"
+
+    def test_recently_used_order_persists(self, tmp_path):
+        cache = MediaCache(tmp_path, max_bytes=10)
+        cache.put("pasta", "original", b"aaaa")
+        cache.put("soup", "original", b"bbbb")
+        cache.get("pasta", "original")
+        cache.close()
+        cache = MediaCache(tmp_path, max_bytes=10)
+        cache.put("stew", "original", b"cccc")
+        assert "soup/original" not in cache
+        assert cache.get("pasta", "original") == b"aaaa"
+
+    def test_client_serves_cached_images(self, tmp_path):
+        client = MealieClient("http://mealie.local")
+        client.media_cache = MediaCache(tmp_path)
+        calls = []
+
+        async def request(path, **kwargs):
+            calls.append(path)
+            return b"webp"
+
+        client.request = request  # type: ignore[assignment]
+        for _ in range(3):
+            assert asyncio.run(client.get_image("pasta", version="1")) == b"webp"
+        assert calls == ["media/recipes/pasta/images/original.webp"]
+
+
+class TestImagePrefetcher:
+    def test_prefetch_fills_cache_smallest_first(self, tmp_path):
+        client = MealieClient("http://mealie.local")
+        client.media_cache = MediaCache(tmp_path)
+        calls = []
+
+        async def request(path, **kwargs):
+            calls.append(path)
+            return path.encode()
+
+        client.request = request  # type: ignore[assignment]
+        recipes = [
+            Recipe(_client=client, name="Pasta", image="pasta.webp"),
+            Recipe(_client=client, name="Pizza", image="pizza.webp"),
+            Recipe(_client=client, name="Soup"),
+        ]
+        failed = asyncio.run(
+            client.prefetch_images(
+                recipes, ("original", "tiny-original"), concurrency=1
+            )
+        )
+        assert failed == []
+        assert [path.rsplit("/", 1)[1] for path in calls] == [
+            "tiny-original.webp",
+            "tiny-original.webp",
+            "original.webp",
+            "original.webp",
+        ]
+        assert asyncio.run(recipes[1].get_image("tiny-original")) == calls[1].encode()
+        assert len(calls) == 4
@@ -0,0 +1,116 @@
+import asyncio
+import math
+from datetime import datetime
+
+import pytest
+
+from mealieapi import MealieClient
+from mealieapi.meals import Meal, MealPlan, MealPlanDay
+from mealieapi.misc import camel_to_snake_case
+from mealieapi.nutrition import NutritionRollup
+from mealieapi.recipes import Recipe, RecipeNutrition
+
+pytest.importorskip("numpy")
+
+CLIENT = MealieClient("http://mealie.local")
+NUTRITION = {
+    "oats": RecipeNutrition(calories=300, protein_content=10),
+    "salad": RecipeNutrition(calories=150),
+    "soup": None,
+}
+
+
+def plan(group, id, days):
+    return MealPlan(
+        CLIENT,
+        group=group,
+        id=id,
+        start_date=datetime(2022, 1, days[0][0]),
+        end_date=datetime(2022, 1, days[-1][0]),
+        plan_days=[
+            MealPlanDay(
+                CLIENT,
+                date=datetime(2022, 1, day),
+                meals=[
+                    Meal(CLIENT, name=slug.title(), description="") for slug in slugs
+                ],
+            )
+            for day, slugs in days
+        ],
+    )
+
+
+MEALPLANS = [
+    plan("Home", 1, [(1, ["oats", "salad"]), (2, ["oats", "soup"])]),
+    plan("Work", 2, [(1, ["salad", "pasta"])]),
+]
+
+
+class TestNutritionRollup:
+    def test_per_day(self):
+        days = NutritionRollup(MEALPLANS, NUTRITION).per_day()
+        assert [day.key for day in days] == ["2022-01-01", "2022-01-02"]
+        assert days[0].meals == 4
+        assert days[0].totals["calories"] == 600
+        assert days[0].missing["calories"] == 1
+        assert days[1].missing["protein_content"] == 1
+        home = NutritionRollup(MEALPLANS, NUTRITION).per_day(group="Home")
+        assert home[0].totals["calories"] == 450
+
+    def test_per_plan_and_group(self):
+        rollup = NutritionRollup(MEALPLANS, NUTRITION)
+        plans = rollup.per_plan()
+        assert [summary.key for summary in plans] == ["1", "2"]
+        assert plans[0].totals["calories"] == 750
+        assert plans[0].days == 2
+        assert plans[0].daily_average["calories"] == 375
+        groups = rollup.per_group()
+        assert [summary.key for summary in groups] == ["Home", "Work"]
+        assert groups[1].totals["protein_content"] == 0
+        assert groups[1].missing["protein_content"] == 2
+
+    def test_load_fetches_each_recipe_once(self):
+        fetched = []
+
+        async def get_recipe(slug):
+            fetched.append(slug)
+            if slug == "pasta":
+                raise ValueError("Not found")
+            return Recipe(CLIENT, name=slug, slug=slug, nutrition=NUTRITION[slug])
+
+        client = MealieClient("http://mealie.local")
+        client.get_recipe = get_recipe  # type: ignore[assignment]
+        rollup = asyncio.run(NutritionRollup.load(client, MEALPLANS))
+        assert sorted(fetched) == ["oats", "pasta", "salad", "soup"]
+        assert math.isnan(rollup.matrix[-1][0])
+        assert rollup.per_group()[0].totals["calories"] == 750
+
+    def test_nutrition_of_a_mealie_response(self):
+        recipe = CLIENT.process_recipe_json(
+            camel_to_snake_case(
+                {
+                    "name": "Oats",
+                    "slug": "oats",
+                    "nutrition": {
+                        "calories": 300,
+                        "fatContent": 5,
+                        "proteinContent": 10,
+                        "carbohydrateContent": 50,
+                        "fiberContent": 8,
+                        "sodiumContent": 0.1,
+                        "sugarContent": 1,
+                    },
+                }
+            )
+        )
+        rollup = NutritionRollup(MEALPLANS[:1], {"oats": recipe.nutrition})
+        totals = rollup.per_plan()[0].totals
+        assert totals == {
+            "calories": 600,
+            "fat_content": 10,
+            "protein_content": 20,
+            "carbohydrate_content": 100,
+            "fiber_content": 16,
+            "sodium_content": 0.2,
+            "sugar_content": 2,
+        }
@@ -0,0 +1,60 @@
+import asyncio
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi import MealieClient
+from mealieapi.errors import MealieError
+from mealieapi.identity import IdentityMap
+
+
+def recipe_json(slug: str) -> dict:
+    return {"name": slug.title(), "slug": slug, "description": "x" * 100}
+
+
+class TestPickling:
+    def test_round_trip_detaches(self):
+        client = MealieClient("http://mealie.local")
+        tag = client.process_tag_json(
+            {"id": 1, "name": "Dinner", "recipes": [recipe_json("pasta-bake")]}
+        )
+        copy = pickle.loads(pickle.dumps(tag))
+        assert copy.name == "Dinner"
+        assert copy.recipes[0].slug == "pasta-bake"
+        assert not copy.attached
+        assert not copy.recipes[0].attached
+
+        with pytest.raises(MealieError, match="detached"):
+            asyncio.run(copy.recipes[0].get_zip())
+
+        copy.attach(client)
+        assert copy.recipes[0]._client is client
+
+
+class TestParseExecutor:
+    def test_large_responses_are_parsed_in_executor(self):
+        summaries = [recipe_json(f"recipe-{number}") for number in range(200)]
+
+        async def handler(request: web.Request) -> web.Response:
+            return web.json_response(summaries)
+
+        async def main():
+            app = web.Application()
+            app.router.add_get("/api/recipes/summary", handler)
+            async with TestServer(app) as server:
+                client = MealieClient(str(server.make_url("")))
+                client.identity_map = IdentityMap()
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    client.parse_executor = executor
+                    client.parse_threshold = 1024
+                    recipes = await client.get_recipes()
+                    again = await client.get_recipes()
+                return client, recipes, again
+
+        client, recipes, again = asyncio.run(main())
+        assert [recipe.slug for recipe in recipes] == [s["slug"] for s in summaries]
+        assert all(recipe._client is client for recipe in recipes)
+        assert again[0] is recipes[0]
@@ -0,0 +1,234 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi import MealieClient
+from mealieapi.errors import MealieError
+from mealieapi.raw import content_range
+
+CONTENT = bytes(range(256)) * 64
+
+
+def serve(handler, run):
+    async def main():
+        app = web.Application()
+        app.router.add_get("/api/utils/download", handler)
+        app.router.add_get("/api/debug/log", log_token)
+        async with TestServer(app) as server:
+            return await run(MealieClient(str(server.make_url(""))))
+
+    return asyncio.run(main())
+
+
+async def log_token(request: web.Request) -> web.Response:
+    return web.json_response({"fileToken": "token"})
+
+
+async def interrupt(
+    request: web.Request, body: bytes, headers: dict[str, str] | None = None
+) -> web.StreamResponse:
+    """Drops the connection after the first 4096 bytes of the body."""
+    response = web.StreamResponse(
+        headers={"Content-Length": str(len(body)), **(headers or {})}
+    )
+    await response.prepare(request)
+    await response.write(body[:4096])
+    await asyncio.sleep(0.05)
+    request.transport.close()
+    return response
+
+
+class TestContentRange:
+    def test_parse(self):
+        assert content_range("bytes 100-199/1000") == (100, 1000)
+        assert content_range("bytes */1000") == (None, 1000)
+        assert content_range("bytes 0-9/*") == (0, None)
+        assert content_range(None) == (None, None)
+
+
+class TestDownload:
+    def test_resume(self, tmp_path):
+        source = tmp_path / "backup.zip"
+        source.write_bytes(CONTENT)
+        destination = tmp_path / "download.zip"
+        meta = tmp_path / "download.zip.part-meta"
+        requests = []
+
+        async def handler(request: web.Request) -> web.StreamResponse:
+            requests.append(
+                (request.headers.get("Range"), "If-Range" in request.headers)
+            )
+            if len(requests) == 1:
+                return await interrupt(
+                    request, CONTENT, {"Last-Modified": "Mon, 19 Oct 2026 00:00:00 GMT"}
+                )
+            return web.FileResponse(source)
+
+        async def run(client):
+            with pytest.raises(aiohttp.ClientError):
+                await client.download_file_to("token", destination, resume=True)
+            assert destination.stat().st_size == 4096
+            assert meta.exists()
+            await client.download_file_to("token", destination, resume=True)
+
+        serve(handler, run)
+        assert destination.read_bytes() == CONTENT
+        assert not meta.exists()
+        assert requests == [(None, False), ("bytes=4096-", True)]
+
+    def test_partial_file_without_version_is_downloaded_again(self, tmp_path):
+        source = tmp_path / "backup.zip"
+        source.write_bytes(CONTENT)
+        destination = tmp_path / "download.zip"
+        destination.write_bytes(b"x" * 1000)
+        ranges = []
+
+        async def handler(request: web.Request) -> web.StreamResponse:
+            ranges.append(request.headers.get("Range"))
+            return web.FileResponse(source)
+
+        async def run(client):
+            return await client.download_file_to("token", destination, resume=True)
+
+        serve(handler, run)
+        assert destination.read_bytes() == CONTENT
+        assert ranges == [None]
+
+    def test_changed_file_is_downloaded_again(self, tmp_path):
+        destination = tmp_path / "download.zip"
+        versions = [CONTENT]
+        requests = []
+
+        async def handler(request: web.Request) -> web.StreamResponse:
+            etag = f'"v{len(versions)}"'
+            start = int(request.headers.get("Range", "bytes=0-")[6:-1])
+            requests.append((start, request.headers.get("If-Range")))
+            body = versions[-1]
+            if len(requests) == 1:
+                return await interrupt(request, body, {"ETag": etag})
+            if start and request.headers.get("If-Range") in (None, etag):
+                content_range = f"bytes {start}-{len(body) - 1}/{len(body)}"
+                return web.Response(
+                    status=206,
+                    body=body[start:],
+                    headers={"ETag": etag, "Content-Range": content_range},
+                )
+            return web.Response(body=body, headers={"ETag": etag})
+
+        async def run(client):
+            with pytest.raises(aiohttp.ClientError):
+                await client.download_file_to("token", destination, resume=True)
+            versions.append(bytes(reversed(CONTENT)))
+            await client.download_file_to("token", destination, resume=True)
+
+        serve(handler, run)
+        assert destination.read_bytes() == versions[-1]
+        assert requests == [(0, None), (4096, '"v1"')]
+
+    def test_meta_is_only_kept_for_resumable_downloads(self, tmp_path):
+        source = tmp_path / "backup.zip"
+        source.write_bytes(CONTENT)
+        destination = tmp_path / "download.zip"
+        meta = tmp_path / "download.zip.part-meta"
+
+        async def handler(request: web.Request) -> web.StreamResponse:
+            if request.query.get("drop"):
+                return await interrupt(request, CONTENT)
+            return web.FileResponse(source)
+
+        async def run(client):
+            with pytest.raises(aiohttp.ClientError):
+                await client.download(
+                    "utils/download",
+                    destination,
+                    params=dict(token="token", drop="1"),
+                    use_auth=False,
+                )
+            assert not meta.exists()
+            await client.download_file_to("token", destination, resume=True)
+
+        serve(handler, run)
+        assert destination.read_bytes() == CONTENT
+        assert not meta.exists()
+
+    def test_error_status_leaves_no_file(self, tmp_path):
+        destination = tmp_path / "download.zip"
+
+        async def handler(request: web.Request) -> web.Response:
+            return web.json_response({"detail": "Not Found"}, status=404)
+
+        async def run(client):
+            with pytest.raises(MealieError):
+                await client.download_file_to("token", destination, resume=True)
+
+        serve(handler, run)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_dropped_connection_is_resumed(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("mealieapi.raw.RETRY_DELAY", 0.01)
+        source = tmp_path / "backup.zip"
+        source.write_bytes(CONTENT)
+        destination = tmp_path / "download.zip"
+        ranges = []
+
+        async def handler(request: web.Request) -> web.StreamResponse:
+            ranges.append(request.headers.get("Range"))
+            if len(ranges) > 1:
+                return web.FileResponse(source)
+            return await interrupt(request, CONTENT)
+
+        async def run(client):
+            return await client.download(
+                "utils/download",
+                destination,
+                params=dict(token="token"),
+                use_auth=False,
+                retries=1,
+            )
+
+        size = serve(handler, run)
+        assert size == len(CONTENT)
+        assert destination.read_bytes() == CONTENT
+        assert ranges == [None, "bytes=4096-"]
+
+
+class TestTailLog:
+    def test_tail_only_reads_new_bytes(self, tmp_path):
+        log = tmp_path / "mealie.log"
+        log.write_bytes(b"first\nsecond\npar")
+        ranges = []
+
+        async def handler(request: web.Request) -> web.StreamResponse:
+            ranges.append(request.headers.get("Range"))
+            return web.FileResponse(log)
+
+        async def run(client):
+            lines = []
+            tail = client.tail_log(interval=0.01)
+            lines.append(await tail.__anext__())
+            lines.append(await tail.__anext__())
+            with open(log, "ab") as file:
+                file.write(b"tial\nthird\n")
+            lines.append(await tail.__anext__())
+            lines.append(await tail.__anext__())
+            await tail.aclose()
+            return lines
+
+        lines = serve(handler, run)
+        assert lines == ["first", "second", "partial", "third"]
+        assert ranges[0] is None
+        assert ranges[-1] == "bytes=16-"
+
+    def test_server_without_range_support(self, tmp_path):
+        async def handler(request: web.Request) -> web.Response:
+            return web.Response(body=b"one\ntwo\n")
+
+        async def run(client):
+            return await client.read_range(
+                "utils/download", 4, params=dict(token="token"), use_auth=False
+            )
+
+        assert serve(handler, run) == (4, b"two\n")
@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime
+
+from mealieapi import MealieClient
+from mealieapi.meals import Meal, MealPlan, MealPlanDay
+from mealieapi.recipes import Recipe
+from mealieapi.shopping import parse_ingredient
+
+CLIENT = MealieClient("http://mealie.local")
+
+
+class TestParseIngredient:
+    def test_units_are_normalized(self):
+        assert parse_ingredient("1 1/2 cups flour, sifted").item == "flour"
+        assert parse_ingredient("1 l water").quantity == 1000
+        assert parse_ingredient("2 Tbsp. olive oil").unit == "ml"
+        assert parse_ingredient("1 lb ground beef").unit == "g"
+
+    def test_unparsed(self):
+        ingredient = parse_ingredient("Salt and pepper")
+        assert ingredient.quantity is None
+        assert ingredient.unit is None
+        assert ingredient.item == "salt and pepper"
+
+
+class TestShoppingListBuilder:
+    def test_build(self):
+        recipes = {
+            "pancakes": ["1 cup flour", "2 eggs", "Salt"],
+            "bread": ["500 g flour", "2 cups flour", "1 egg", "salt"],
+        }
+        calls = []
+
+        async def get_recipe(slug):
+            calls.append(slug)
+            return Recipe(_client=CLIENT, name=slug, recipe_ingredient=recipes[slug])
+
+        client = MealieClient("http://mealie.local")
+        client.get_recipe = get_recipe  # type: ignore[assignment]
+        day = MealPlanDay(
+            client,
+            date=datetime(2022, 1, 1),
+            meals=[
+                Meal(client, name="Pancakes", description=""),
+                Meal(client, name="Bread", description=""),
+            ],
+        )
+        plans = [
+            MealPlan(
+                client,
+                group="Home",
+                start_date=datetime(2022, 1, 1),
+                end_date=datetime(2022, 1, 1),
+                plan_days=[day, day],
+            )
+        ]
+        shopping_list = asyncio.run(client.build_shopping_list(plans, "Groceries"))
+        assert sorted(calls) == ["bread", "pancakes"]
+        assert shopping_list.group == "Home"
+        items = {item.text for item in shopping_list.items}
+        assert "1.42 l flour" in items
+        assert "1 kg flour" in items
+        assert "6 egg" in items
+        assert "salt" in items
@@ -0,0 +1,119 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi import MealieClient
+
+
+def user_json(id: str, group: str, favorites=None) -> dict:
+    return {
+        "id": id,
+        "username": f"user{id}",
+        "fullName": f"User {id}",
+        "email": f"user{id}@example.com",
+        "admin": False,
+        "group": group,
+        "favoriteRecipes": favorites,
+    }
+
+
+def mealplan_json(id: int, group: str) -> dict:
+    return {
+        "id": id,
+        "group": group,
+        "startDate": "2022-01-03",
+        "endDate": "2022-01-09",
+        "planDays": [
+            {
+                "date": "2022-01-03",
+                "meals": [
+                    {"name": "Pasta Bake", "description": "", "slug": "pasta-bake"}
+                ],
+            }
+        ],
+    }
+
+
+PASTA = {"name": "Pasta Bake", "slug": "pasta-bake"}
+SOUP = {"name": "Soup", "slug": "soup"}
+
+
+def build():
+    in_flight = 0
+    most_in_flight = 0
+
+    def handler(data):
+        async def handle(request: web.Request) -> web.Response:
+            nonlocal in_flight, most_in_flight
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return web.json_response(data)
+
+        return handle
+
+    async def main():
+        app = web.Application()
+        app.router.add_get(
+            "/api/groups/self",
+            handler(
+                {
+                    "id": 1,
+                    "name": "Home",
+                    "users": [user_json("1", "Home"), user_json("2", "Home")],
+                    "mealplans": [mealplan_json(1, "Home")],
+                    "shoppingLists": [{"id": 5, "name": "Weekly"}],
+                }
+            ),
+        )
+        app.router.add_get(
+            "/api/meal-plans/all",
+            handler([mealplan_json(1, "Home"), mealplan_json(2, "Other")]),
+        )
+        app.router.add_get(
+            "/api/users/1/favorites",
+            handler(user_json("1", "Home", [PASTA, SOUP])),
+        )
+        app.router.add_get(
+            "/api/users/2/favorites", handler(user_json("2", "Home", [PASTA]))
+        )
+        app.router.add_get(
+            "/api/shopping-lists/5",
+            handler(
+                {
+                    "id": 5,
+                    "name": "Weekly",
+                    "group": "Home",
+                    "items": [
+                        {
+                            "title": "Flour",
+                            "text": "1 kg",
+                            "quantity": 1,
+                            "checked": False,
+                        }
+                    ],
+                }
+            ),
+        )
+        async with TestServer(app) as server:
+            client = MealieClient(str(server.make_url("")))
+            return await client.get_group_snapshot()
+
+    snapshot = asyncio.run(main())
+    return snapshot, most_in_flight
+
+
+class TestGroupSnapshot:
+    def test_snapshot(self):
+        snapshot, most_in_flight = build()
+        assert most_in_flight >= 3
+        assert snapshot.group.name == "Home"
+        assert [user.id for user in snapshot.users] == ["1", "2"]
+        assert [plan.id for plan in snapshot.mealplans] == [1]
+        assert snapshot.shopping_lists[0].items[0].title == "Flour"
+        assert snapshot.group.users[0] is snapshot.users[0]
+        assert sorted(snapshot.recipes) == ["pasta-bake", "soup"]
+        assert snapshot.user("2").favorite_recipes[0] is snapshot.recipes["pasta-bake"]
+        assert snapshot.users[0].favorite_recipes[0] is snapshot.recipes["pasta-bake"]
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from mealieapi.stream import JSONArrayParser
+
+
+def parse_in_chunks(data: bytes, size: int) -> list:
+    parser = JSONArrayParser()
+    items = []
+    for i in range(0, len(data), size):
+        items.extend(parser.feed(data[i : i + size]))
+    items.extend(parser.close())
+    return items
+
+
+class TestJSONArrayParser:
+    @pytest.mark.parametrize("size", [1, 2, 7, 1024])
+    def test_chunked(self, size):
+        value = [{"name": "Crème brûlée", "tags": ["a", "b"]}, 12, "x", None, [], 3.5]
+        assert (
+            parse_in_chunks(json.dumps(value, ensure_ascii=False).encode(), size)
+            == value
+        )
+
+    def test_yields_before_end(self):
+        parser = JSONArrayParser()
+        assert parser.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+        assert parser.feed(b": 2}]") == [{"b": 2}]
+        assert parser.close() == []
+
+    def test_empty(self):
+        assert parse_in_chunks(b" [ ] ", 1) == []
+
+    @pytest.mark.parametrize("data", [b'{"a": 1}', b"[1, 2", b"[1 2]", b"[1] 2"])
+    def test_invalid(self, data):
+        with pytest.raises(ValueError):
+            parse_in_chunks(data, 3)
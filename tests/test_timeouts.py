@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi import MealieClient, deadline
+from mealieapi.errors import DeadlineExceeded
+
+
+async def create(request: web.Request) -> web.Response:
+    await asyncio.sleep(0.15)
+    return web.json_response("pasta")
+
+
+async def recipe(request: web.Request) -> web.Response:
+    await asyncio.sleep(0.15)
+    return web.json_response({"name": "Pasta", "slug": "pasta"})
+
+
+async def hang(request: web.Request) -> web.Response:
+    await asyncio.sleep(10)
+    return web.json_response({})
+
+
+def serve(call):
+    async def main():
+        app = web.Application()
+        app.router.add_post("/api/recipes/create", create)
+        app.router.add_get("/api/recipes/pasta", recipe)
+        app.router.add_get("/api/hang", hang)
+        async with TestServer(app) as server:
+            client = MealieClient(str(server.make_url("")))
+            return await call(client)
+
+    return asyncio.run(main())
+
+
+class TestDeadlines:
+    def test_composite_call_shares_budget(self):
+        async def call(client):
+            recipe = await client.get_recipe("pasta")
+            with pytest.raises(DeadlineExceeded):
+                await client.create_recipe(recipe, timeout=0.25)
+            client.timeout = 0.25
+            with pytest.raises(DeadlineExceeded):
+                await client.create_recipe(recipe)
+            return await client.get_recipe("pasta")
+
+        assert serve(call).slug == "pasta"
+
+    def test_nested_deadline_only_shortens(self):
+        async def call(client):
+            with deadline(0.05):
+                with client.deadline(5):
+                    with pytest.raises(asyncio.TimeoutError):
+                        await client.request("hang")
+
+        serve(call)
+
+    def test_timeout_releases_slot(self):
+        async def call(client):
+            client.semaphore = asyncio.Semaphore(1)
+            with pytest.raises(DeadlineExceeded):
+                await client.request("hang", timeout=0.05)
+            return await client.get_recipe("pasta")
+
+        assert serve(call).name == "Pasta"
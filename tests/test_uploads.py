@@ -0,0 +1,108 @@
+import asyncio
+import hashlib
+import io
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi import MealieClient
+from mealieapi.uploads import UploadIndex, file_digest, hash_file
+
+
+class TestHashing:
+    def test_digest_restores_position(self):
+        file = io.BytesIO(b"header" + b"x" * 10000)
+        file.seek(6)
+        assert (
+            file_digest(file, chunk_size=64) == hashlib.sha256(b"x" * 10000).hexdigest()
+        )
+        assert file.tell() == 6
+
+    def test_large_files_are_hashed_in_a_thread(self):
+        file = io.BytesIO(b"x" * 10000)
+        digest = asyncio.run(hash_file(file, offload_size=100, chunk_size=64))
+        assert digest == hashlib.sha256(b"x" * 10000).hexdigest()
+
+
+class TestUploadIndex:
+    def test_skips_unchanged_uploads(self, tmp_path):
+        received = []
+
+        async def image(request: web.Request) -> web.Response:
+            form = await request.post()
+            received.append(("image", form["image"].file.read(), form["extension"]))
+            return web.json_response({"image": 1})
+
+        async def asset(request: web.Request) -> web.Response:
+            form = await request.post()
+            received.append(("asset", form["file"].file.read(), form["name"]))
+            return web.json_response(
+                {"fileName": "notes.txt", "name": form["name"], "icon": form["icon"]}
+            )
+
+        async def main():
+            app = web.Application()
+            app.router.add_put("/api/recipes/soup/image", image)
+            app.router.add_post("/api/recipes/soup/assets", asset)
+            async with TestServer(app) as server:
+                client = MealieClient(str(server.make_url("")))
+                client.upload_index = UploadIndex(tmp_path / "uploads.jsonl")
+                first = await client.update_recipe_image(
+                    "soup", io.BytesIO(b"jpeg"), "jpg"
+                )
+                again = await client.update_recipe_image(
+                    "soup", io.BytesIO(b"jpeg"), "jpg"
+                )
+                asset_result = await client.upload_recipe_asset(
+                    "soup", "notes", "mdi-file", "txt", io.BytesIO(b"notes")
+                )
+                client.upload_index.close()
+
+                # A new index reads what was uploaded from the file.
+                client.upload_index = UploadIndex(tmp_path / "uploads.jsonl")
+                assert (
+                    await client.upload_recipe_asset(
+                        "soup", "notes", "mdi-file", "txt", io.BytesIO(b"notes")
+                    )
+                    is None
+                )
+                changed = await client.update_recipe_image(
+                    "soup", io.BytesIO(b"png"), "png"
+                )
+                client.upload_index.close()
+                return first, again, asset_result, changed
+
+        first, again, asset_result, changed = asyncio.run(main())
+        assert first.image == 1
+        assert first.recipe_slug == "soup"
+        assert again is None
+        assert asset_result.file_name == "notes.txt"
+        assert changed is not None
+        assert received == [
+            ("image", b"jpeg", "jpg"),
+            ("asset", b"notes", "notes"),
+            ("image", b"png", "png"),
+        ]
+
+    def test_forget(self):
+        index = UploadIndex()
+        index.record("a", "image", "soup")
+        index.record("b", "asset", "soup", "notes")
+        index.record("c", "image", "stew")
+        index.forget("soup")
+        assert len(index) == 1
+        assert index.unchanged("c", "image", "stew")
+
+    def test_recovers_from_a_partial_last_line(self, tmp_path):
+        path = tmp_path / "uploads.jsonl"
+        index = UploadIndex(path)
+        index.record("a", "image", "soup")
+        index.close()
+        with open(path, "a", encoding="utf-8") as file:
+            file.write('{"key": ["image", "st')
+        index = UploadIndex(path)
+        index.record("b", "image", "stew")
+        index.close()
+        index = UploadIndex(path)
+        assert index.unchanged("a", "image", "soup")
+        assert index.unchanged("b", "image", "stew")
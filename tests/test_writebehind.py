@@ -0,0 +1,104 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from mealieapi import MealieClient
+from mealieapi.identity import IdentityMap
+from mealieapi.meals import Ingredient
+
+LIST = {
+    "id": 5,
+    "name": "Weekly",
+    "group": "Home",
+    "items": [
+        {"title": f"Item {number}", "text": "", "quantity": 1, "checked": False}
+        for number in range(30)
+    ],
+}
+
+
+def run(edit, put_delay=0.0, identity_map=False, saved=None):
+    bodies = []
+
+    async def get(request: web.Request) -> web.Response:
+        return web.json_response(LIST)
+
+    async def put(request: web.Request) -> web.Response:
+        body = await request.json()
+        bodies.append(body)
+        await asyncio.sleep(put_delay)
+        return web.json_response({**body, "id": 5, **(saved or {})})
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/api/shopping-lists/5", get)
+        app.router.add_put("/api/shopping-lists/5", put)
+        async with TestServer(app) as server:
+            client = MealieClient(str(server.make_url("")))
+            if identity_map:
+                client.identity_map = IdentityMap()
+            shopping_list = await client.get_shopping_list(5)
+            await edit(shopping_list)
+            return shopping_list
+
+    return asyncio.run(main()), bodies
+
+
+class TestWriteBehind:
+    def test_edits_are_coalesced(self):
+        async def edit(shopping_list):
+            async with shopping_list.write_behind(delay=0.05) as writer:
+                for index in range(shopping_list.length()):
+                    await shopping_list.toggle_checked(index)
+                assert writer.pending
+            assert writer.edits == 30
+            assert writer.writes == 1
+
+        shopping_list, bodies = run(edit)
+        assert len(bodies) == 1
+        assert all(item["checked"] for item in bodies[0]["items"])
+        assert shopping_list._writer is None
+
+    def test_debounce_writes_latest_state(self):
+        async def edit(shopping_list):
+            writer = shopping_list.write_behind(delay=0.01)
+            await shopping_list.toggle_checked(0)
+            await asyncio.sleep(0.05)
+            # The first write is in flight, these edits are written after it.
+            await shopping_list.update_item(1, quantity=3)
+            await shopping_list.add_item(
+                Ingredient(None, title="Milk", text="", quantity=1, checked=False)
+            )
+            await shopping_list.remove_item(2)
+            await shopping_list.flush()
+            assert not writer.pending
+            assert writer.writes == 2
+
+        shopping_list, bodies = run(edit, put_delay=0.1, identity_map=True)
+        assert len(bodies) == 2
+        assert bodies[0]["items"][0]["checked"]
+        assert bodies[0]["items"][1]["quantity"] == 1
+        assert bodies[1]["items"][1]["quantity"] == 3
+        assert bodies[1]["items"][-1]["title"] == "Milk"
+        assert len(bodies[1]["items"]) == 30
+        assert shopping_list.items[-1].title == "Milk"
+
+    def test_without_write_behind_every_edit_is_written(self):
+        async def edit(shopping_list):
+            await shopping_list.toggle_checked(0)
+            await shopping_list.toggle_checked(1)
+
+        _, bodies = run(edit)
+        assert len(bodies) == 2
+
+    def test_keeps_what_the_server_saved(self):
+        async def edit(shopping_list):
+            async with shopping_list.write_behind(delay=0.01):
+                await shopping_list.toggle_checked(0)
+
+        saved = {"name": "Weekly groceries"}
+        for identity_map in (False, True):
+            shopping_list, _ = run(edit, identity_map=identity_map, saved=saved)
+            assert shopping_list.name == "Weekly groceries"
+            assert shopping_list.items[0].checked